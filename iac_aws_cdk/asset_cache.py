@@ -0,0 +1,104 @@
+"""asset fingerprint cache
+cdk는 synth할 때마다 asset 파일 전체를 읽어서 hash를 계산한다. (수백 MB zip이면 synth 시간 대부분)
+(path, size, mtime, inode)가 같으면 이전에 계산한 sha256을 재사용하고,
+그 값을 asset_hash(AssetHashType.CUSTOM)로 넘겨 cdk의 fingerprint 계산을 생략한다.
+
+    s3assets.Asset(self, 'WebAppZip', path=path, **asset_hash_props(path))
+
+cache 위치: CDK_ASSET_CACHE_DIR 또는 .cdk-asset-cache/ (cdk.out 옆)
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+import aws_cdk as cdk
+
+CACHE_DIR_ENV_VAR = 'CDK_ASSET_CACHE_DIR'
+DEFAULT_CACHE_DIR = '.cdk-asset-cache'
+CACHE_FILE = 'fingerprints.json'
+CHUNK_SIZE = 1024 * 1024
+
+
+def cache_dir() -> str:
+    return os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR
+
+
+def file_sha256(path: str) -> str:
+    """파일 전체를 chunk 단위로 읽어서 hash (메모리에 한 번에 올리지 않음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_key(stat: os.stat_result) -> Dict[str, int]:
+    # mtime은 ns 단위 (같은 초 안의 수정도 구분)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino}
+
+
+class FingerprintCache:
+    """realpath -> {size, mtime_ns, inode, sha256}. 하나의 json 파일에 저장"""
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.path = os.path.join(directory or cache_dir(), CACHE_FILE)
+        self._entries: Optional[Dict[str, Dict]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.path) as stream:
+                    self._entries = json.load(stream)
+            except (OSError, ValueError):  # 없거나 깨진 cache는 비어 있는 것으로 본다.
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # 동시에 synth해도 깨진 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.fingerprints-')
+        with os.fdopen(fd, 'w') as stream:
+            json.dump(self._entries, stream, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def fingerprint(self, path: str) -> str:
+        real_path = os.path.realpath(path)
+        stat_key = _stat_key(os.stat(real_path))
+        entries = self._load()
+
+        entry = entries.get(real_path)
+        if entry and {key: entry.get(key) for key in stat_key} == stat_key:
+            self.hits += 1
+            return entry['sha256']
+
+        self.misses += 1
+        sha256 = file_sha256(real_path)
+        # hash 계산 중에 파일이 바뀌었으면 저장하지 않는다. (다음 synth에서 다시 계산)
+        if _stat_key(os.stat(real_path)) == stat_key:
+            entries[real_path] = {**stat_key, 'sha256': sha256}
+            self._save()
+        return sha256
+
+
+_CACHES: Dict[str, FingerprintCache] = {}
+
+
+def fingerprint(path: str, directory: Optional[str] = None) -> str:
+    """cache 디렉토리별로 FingerprintCache를 하나만 만들어서 사용"""
+    directory = directory or cache_dir()
+    if directory not in _CACHES:
+        _CACHES[directory] = FingerprintCache(directory)
+    return _CACHES[directory].fingerprint(path)
+
+
+def asset_hash_props(path: str, directory: Optional[str] = None) -> Dict[str, object]:
+    """s3assets.Asset / AssetStaging에 넘길 kwargs (파일 asset 전용)"""
+    return {
+        'asset_hash': fingerprint(path, directory),
+        'asset_hash_type': cdk.AssetHashType.CUSTOM,
+    }
@@ -1,19 +1,45 @@
-from configparser import ConfigParser
+import os
 from aws_cdk import (
+    CfnTag,
+    Duration,
     Stack,
     aws_s3 as s3,
+    aws_s3_assets as s3assets,
+    aws_s3_notifications as s3n,
+    aws_sqs as sqs,
     aws_iam as iam,
     aws_glue as glue,
     aws_athena as athena
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.glue_table import Column, CsvTableSchema, DateProjection, ParquetTableSchema
+from iac_aws_cdk.settings import settings_for
+
+BOX_OFFICE_MOJO_COLUMNS = (
+    Column('rank', 'int'),
+    Column('release', 'string'),
+    Column('daily_gross', 'bigint'),
+    Column('theaters', 'int'),
+    Column('total_gross', 'bigint'),
+    Column('days', 'int'),
+    Column('distributor', 'string'),
+)
+
+ATHENA_ENGINE_VERSIONS = {
+    'auto': 'AUTO',
+    '2': 'Athena engine version 2',
+    '3': 'Athena engine version 3',
+}
+
+COMPACTION_SCRIPT = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), '..', 'scripts', 'glue', 'mojo_csv_to_parquet.py'
+)
 
 class BoxOfficeMojo(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).box_office_mojo
 
         s3_obj_upload_bucket = s3.Bucket(
             self,
@@ -170,23 +196,98 @@ class BoxOfficeMojo(Stack):
         # 아래 CfnCrawler에서 database는 string으로 넣으라는데 CfnDatabase는 필요x?
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnDatabase.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnDatabase.html#databaseinputproperty
-        glue.CfnDatabase(
+        glue_test_database = glue.CfnDatabase(
             self,
             id='GlueTestDatabase',
             # catalog_id='!Ref AWS::AccountId',
-            catalog_id=config.get('box_office_mojo', 'aws_account'),  # 필수
+            catalog_id=settings.aws_account,  # 필수
             database_input=glue.CfnDatabase.DatabaseInputProperty(
                 name='glue-test-database'  # Database name is required, in lowercase characters (s3 bucket name처럼 '-'사용)
             )  # 필수
         )
 
+        # crawl_mode=event: mojo/ prefix의 ObjectCreated event를 sqs로 받아서, crawler는 event로 들어온 object만 crawl한다.
+        # https://docs.aws.amazon.com/glue/latest/dg/crawler-s3-event-notifications.html
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_s3_notifications/SqsDestination.html
+        crawler_event_queue = None
+        crawler_event_dlq = None
+        if settings.crawl_mode == 'event':
+            crawler_event_dlq = sqs.Queue(
+                self,
+                id='GlueCrawlerEventDlq',
+                queue_name='glue-crawler-event-dlq',
+                retention_period=Duration.days(14)
+            )
+            crawler_event_queue = sqs.Queue(
+                self,
+                id='GlueCrawlerEventQueue',
+                queue_name='glue-crawler-event-queue',
+                retention_period=Duration.days(14),  # crawler 실행 간격보다 길어야 event가 유실되지 않는다.
+                dead_letter_queue=sqs.DeadLetterQueue(
+                    max_receive_count=5,
+                    queue=crawler_event_dlq
+                )
+            )
+            s3_obj_upload_bucket.add_event_notification(
+                s3.EventType.OBJECT_CREATED,
+                s3n.SqsDestination(crawler_event_queue),
+                s3.NotificationKeyFilter(prefix='mojo/')
+            )
+
+            # https://docs.aws.amazon.com/glue/latest/dg/crawler-s3-event-notifications.html#crawler-s3-event-notifications-setup
+            crawler_event_policy = iam.Policy(
+                self,
+                id='AWSGlueServiceRoleDefaultEventPolicy',
+                policy_name='AWSGlueServiceRoleDefaultEventPolicy',
+                statements=[
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=[
+                            'sqs:DeleteMessage',
+                            'sqs:GetQueueUrl',
+                            'sqs:ListDeadLetterSourceQueues',
+                            'sqs:ChangeMessageVisibility',
+                            'sqs:ReceiveMessage',
+                            'sqs:GetQueueAttributes',
+                            'sqs:ListQueueTags',
+                            'sqs:SetQueueAttributes',
+                            'sqs:PurgeQueue'
+                        ],
+                        resources=[
+                            crawler_event_queue.queue_arn,
+                            crawler_event_dlq.queue_arn
+                        ]
+                    )
+                ]
+            )
+            aws_glue_service_role_default.attach_inline_policy(policy=crawler_event_policy)
+
+        # crawler가 partition을 등록하지 않아도 athena에서 바로 조회 가능한 table (mojo/dt=yyyy-MM-dd/*.csv)
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_glue/CfnTable.html
+        if settings.partition_projection:
+            box_office_mojo_table = glue.CfnTable(
+                self,
+                id='BoxOfficeMojoTable',
+                catalog_id=settings.aws_account,
+                database_name='glue-test-database',
+                table_input=CsvTableSchema(
+                    name='box_office_mojo',
+                    location=f'{s3_obj_upload_bucket.s3_url_for_object()}/mojo',
+                    columns=BOX_OFFICE_MOJO_COLUMNS,
+                    partitions=(
+                        DateProjection('dt', range_from=settings.partition_projection_from),
+                    )
+                ).table_input()
+            )
+            box_office_mojo_table.add_depends_on(glue_test_database)
+
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnCrawler.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnCrawler.html#s3targetproperty
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_s3/Bucket.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnCrawler.html#aws_cdk.aws_glue.CfnCrawler.RecrawlPolicyProperty
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_iam/Role.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_glue/CfnCrawler.html#scheduleproperty
-        glue.CfnCrawler(
+        glue_test_crawler = glue.CfnCrawler(
             self,
             id='GlueTestCrawler',
             name='GlueTestCrawler',
@@ -194,16 +295,17 @@ class BoxOfficeMojo(Stack):
                 s3_targets=[
                     glue.CfnCrawler.S3TargetProperty(
                         # connection_name='s333333',  # crawler > data source > network connection인 듯 / option -> 주석처리
-                        path=f'{s3_obj_upload_bucket.s3_url_for_object()}/mojo'
+                        path=f'{s3_obj_upload_bucket.s3_url_for_object()}/mojo',
                         # sample_size=123,
                         # exclusions=['result/**']
+                        event_queue_arn=crawler_event_queue.queue_arn if crawler_event_queue else None,
+                        dlq_event_queue_arn=crawler_event_dlq.queue_arn if crawler_event_dlq else None
                     )
                 ],
             ),
             recrawl_policy=glue.CfnCrawler.RecrawlPolicyProperty(
-                recrawl_behavior='CRAWL_EVERYTHING'
+                recrawl_behavior='CRAWL_EVENT_MODE' if crawler_event_queue else 'CRAWL_EVERYTHING'
                 # recrawl_behavior='CRAWL_NEW_FOLDERS_ONLY'
-                # recrawl_behavior='CRAWL_EVENT_MODE'
             ),
             # classifier 내의 값은 string으로 넣어야 하는데 위에서 설정한 classifier의 id를 넣어도 되는지 모르겠음
             classifiers=[
@@ -212,7 +314,12 @@ class BoxOfficeMojo(Stack):
             role=aws_glue_service_role_default.role_arn,
             database_name='glue-test-database',
             # table_prefix='',
-            # schema_change_policy='',
+            # event mode는 DeleteBehavior=LOG만 허용 (event로 들어온 object만 보므로 table/partition 삭제를 판단할 수 없다)
+            # https://docs.aws.amazon.com/glue/latest/dg/crawler-s3-event-notifications.html
+            schema_change_policy=glue.CfnCrawler.SchemaChangePolicyProperty(
+                delete_behavior='LOG',
+                update_behavior='UPDATE_IN_DATABASE'
+            ) if crawler_event_queue else None,
 
             # schedule frequency를 on demand로 하려면 주석처리
             # schedule=glue.CfnCrawler.ScheduleProperty(
@@ -220,6 +327,128 @@ class BoxOfficeMojo(Stack):
             # )
         )
 
+        if crawler_event_queue:
+            # crawler 생성 시점에 queue 권한이 있어야 한다.
+            glue_test_crawler.node.add_dependency(crawler_event_policy)
+
+        # crawler 성공 -> csv를 snappy parquet로 변환/병합해서 curated/mojo/dt=yyyy-MM-dd/ 에 쓴다.
+        # job bookmark를 사용하므로 crawler가 새로 등록한 파일만 처리한다.
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_glue/CfnJob.html
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_glue/CfnTrigger.html
+        if settings.compaction_job:
+            compaction_script = s3assets.Asset(
+                self,
+                'MojoCsvToParquetScript',
+                path=COMPACTION_SCRIPT
+            )
+            compaction_script.grant_read(aws_glue_service_role_default)
+            aws_glue_service_role_default.attach_inline_policy(
+                policy=iam.Policy(
+                    self,
+                    id='AWSGlueServiceRoleDefaultJobPolicy',
+                    policy_name='AWSGlueServiceRoleDefaultJobPolicy',
+                    statements=[
+                        iam.PolicyStatement(
+                            effect=iam.Effect.ALLOW,
+                            actions=[
+                                'logs:CreateLogGroup',
+                                'logs:CreateLogStream',
+                                'logs:PutLogEvents',
+                            ],
+                            resources=[
+                                'arn:aws:logs:*:*:log-group:/aws-glue/jobs/*',
+                            ]
+                        ),
+                        iam.PolicyStatement(
+                            effect=iam.Effect.ALLOW,
+                            actions=[
+                                's3:PutObject',
+                                's3:DeleteObject'
+                            ],
+                            resources=[
+                                s3_obj_upload_bucket.arn_for_objects('curated/*')
+                            ]
+                        ),
+                        iam.PolicyStatement(
+                            effect=iam.Effect.ALLOW,
+                            actions=[
+                                'glue:GetPartitions'
+                            ],
+                            resources=[
+                                'arn:aws:glue:*:*:catalog',
+                                'arn:aws:glue:*:*:database/*',
+                                'arn:aws:glue:*:*:table/*',
+                            ]
+                        ),
+                    ]
+                )
+            )
+
+            mojo_csv_to_parquet_job = glue.CfnJob(
+                self,
+                id='MojoCsvToParquetJob',
+                name='MojoCsvToParquetJob',
+                role=aws_glue_service_role_default.role_arn,
+                command=glue.CfnJob.JobCommandProperty(
+                    name='glueetl',
+                    python_version='3',
+                    script_location=compaction_script.s3_object_url
+                ),
+                glue_version='3.0',
+                worker_type='G.1X',
+                number_of_workers=2,
+                execution_property=glue.CfnJob.ExecutionPropertyProperty(
+                    max_concurrent_runs=1
+                ),
+                default_arguments={
+                    '--job-bookmark-option': 'job-bookmark-enable',
+                    '--enable-metrics': 'true',
+                    '--source_database': 'glue-test-database',
+                    '--source_table': 'mojo',  # crawler가 mojo/ 폴더명으로 생성하는 table
+                    '--target_path': f'{s3_obj_upload_bucket.s3_url_for_object()}/curated/mojo',
+                    '--partition_keys': 'dt',
+                    '--target_file_size_mb': str(settings.compaction_target_file_size_mb),
+                }
+            )
+
+            mojo_curated_table = glue.CfnTable(
+                self,
+                id='BoxOfficeMojoCuratedTable',
+                catalog_id=settings.aws_account,
+                database_name='glue-test-database',
+                table_input=ParquetTableSchema(
+                    name='box_office_mojo_curated',
+                    location=f'{s3_obj_upload_bucket.s3_url_for_object()}/curated/mojo',
+                    columns=BOX_OFFICE_MOJO_COLUMNS,
+                    partitions=(
+                        DateProjection('dt', range_from=settings.partition_projection_from),
+                    )
+                ).table_input()
+            )
+            mojo_curated_table.add_depends_on(glue_test_database)
+
+            mojo_csv_to_parquet_trigger = glue.CfnTrigger(
+                self,
+                id='MojoCsvToParquetTrigger',
+                name='MojoCsvToParquetTrigger',
+                type='CONDITIONAL',
+                start_on_creation=True,
+                predicate=glue.CfnTrigger.PredicateProperty(
+                    conditions=[
+                        glue.CfnTrigger.ConditionProperty(
+                            crawler_name=glue_test_crawler.ref,
+                            crawl_state='SUCCEEDED',
+                            logical_operator='EQUALS'
+                        )
+                    ]
+                ),
+                actions=[
+                    glue.CfnTrigger.ActionProperty(
+                        job_name=mojo_csv_to_parquet_job.ref
+                    )
+                ]
+            )
+
         # 1. s3 target connection name 역할 -> 없는듯? 주석처리해도 되나? -> network connection 부분 -> 주석처리해도 문제없음
         # 1-2. s3 path는 fstring으로 추가 -> 문제없음
         # 2. classifier 연결이 저렇게 가능? -> 생성됨 / 연결됨 (database연결과 비슷한 형태)
@@ -229,15 +458,40 @@ class BoxOfficeMojo(Stack):
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_athena/CfnWorkGroup.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_athena/CfnWorkGroup.html#aws_cdk.aws_athena.CfnWorkGroup.WorkGroupConfigurationProperty
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_athena/CfnWorkGroup.html#aws_cdk.aws_athena.CfnWorkGroup.ResultConfigurationProperty
-        athena.CfnWorkGroup(
-            self,
-            id='AthenaTestWorkGroup',
-            name='AthenaTestWorkGroup',
-            state='ENABLED',
-            work_group_configuration=athena.CfnWorkGroup.WorkGroupConfigurationProperty(
-                publish_cloud_watch_metrics_enabled=True,
-                result_configuration=athena.CfnWorkGroup.ResultConfigurationProperty(
-                    output_location=mojo_athena_query_result.s3_url_for_object()
+        # 기본값은 기존 AthenaTestWorkGroup과 같다. (scan 제한 / engine 지정 없음, 결과는 bucket root)
+        # result_prefix를 지정한 workgroup은 prefix별 lifecycle로 query 결과를 만료시킨다.
+        # query 결과 재사용(result reuse)은 workgroup 속성이 아니라 StartQueryExecution 옵션이라
+        # client가 읽을 수 있도록 workgroup tag로만 남긴다. (athena가 적용하지 않음)
+        for name, workgroup in settings_for(self).athena_workgroups.items():
+            result_prefix = f'{workgroup.result_prefix.strip("/")}/' if workgroup.result_prefix.strip('/') else None
+            if workgroup.result_expiration_days:
+                mojo_athena_query_result.add_lifecycle_rule(
+                    id=f'{name}ResultExpiration',
+                    prefix=result_prefix,
+                    expiration=Duration.days(workgroup.result_expiration_days),
+                    abort_incomplete_multipart_upload_after=Duration.days(1)
                 )
+
+            athena.CfnWorkGroup(
+                self,
+                id=name,
+                name=name,
+                description=workgroup.description or None,
+                state='ENABLED',
+                work_group_configuration=athena.CfnWorkGroup.WorkGroupConfigurationProperty(
+                    publish_cloud_watch_metrics_enabled=True,
+                    enforce_work_group_configuration=True if workgroup.enforce_configuration else None,
+                    bytes_scanned_cutoff_per_query=(
+                        workgroup.bytes_scanned_cutoff_mb * 1000 * 1000 if workgroup.bytes_scanned_cutoff_mb else None
+                    ),
+                    engine_version=athena.CfnWorkGroup.EngineVersionProperty(
+                        selected_engine_version=ATHENA_ENGINE_VERSIONS[workgroup.engine_version]
+                    ) if workgroup.engine_version != 'none' else None,
+                    result_configuration=athena.CfnWorkGroup.ResultConfigurationProperty(
+                        output_location=mojo_athena_query_result.s3_url_for_object(result_prefix)
+                    )
+                ),
+                tags=[
+                    CfnTag(key='result-reuse-max-age-minutes', value=str(workgroup.result_reuse_max_age_minutes))
+                ] if workgroup.result_reuse_max_age_minutes else None
             )
-        )
@@ -0,0 +1,76 @@
+"""web tier 앞의 ElastiCache (redis / valkey) replication group
+private subnet에 두고, web tier security group에서만 접속을 허용한다.
+https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-resource-elasticache-replicationgroup.html
+"""
+from typing import Dict, List
+
+from aws_cdk import aws_ec2 as ec2, aws_elasticache as elasticache
+from constructs import Construct
+
+CACHE_PORT = 6379
+
+
+class CacheCluster(Construct):
+    """cluster mode disabled replication group (primary 1 + replica N)
+
+    settings: cache_engine / cache_node_type / cache_replicas를 가진 section settings
+    """
+    def __init__(self, scope: Construct, construct_id: str, *, settings, vpc_id: str,
+                 subnet_ids: List[str], client_security_group_id: str) -> None:
+        super().__init__(scope, construct_id)
+
+        self.security_group = ec2.CfnSecurityGroup(
+            self,
+            'SecurityGroup',
+            group_description=f'{construct_id} security group',
+            vpc_id=vpc_id
+        )
+        ec2.CfnSecurityGroupIngress(
+            self,
+            'WebTierIngress',
+            ip_protocol='tcp',
+            from_port=CACHE_PORT,
+            to_port=CACHE_PORT,
+            group_id=self.security_group.attr_group_id,
+            source_security_group_id=client_security_group_id
+        )
+
+        subnet_group = elasticache.CfnSubnetGroup(
+            self,
+            'SubnetGroup',
+            description=f'{construct_id} subnet group',
+            subnet_ids=subnet_ids
+        )
+
+        replicated = settings.cache_replicas > 0
+        self.replication_group = elasticache.CfnReplicationGroup(
+            self,
+            'ReplicationGroup',
+            replication_group_description=f'{construct_id} ({settings.cache_engine})',
+            engine=settings.cache_engine,
+            cache_node_type=settings.cache_node_type,
+            num_cache_clusters=1 + settings.cache_replicas,
+            # replica가 있어야 failover / multi az 가능
+            automatic_failover_enabled=replicated,
+            multi_az_enabled=replicated,
+            cache_subnet_group_name=subnet_group.ref,
+            security_group_ids=[self.security_group.attr_group_id],
+            port=CACHE_PORT,
+            at_rest_encryption_enabled=True
+        )
+
+    @property
+    def endpoint_address(self) -> str:
+        return self.replication_group.attr_primary_end_point_address
+
+    @property
+    def reader_endpoint_address(self) -> str:
+        return self.replication_group.attr_reader_end_point_address
+
+    def environment(self) -> Dict[str, str]:
+        """app에 전달하는 환경변수"""
+        return {
+            'CACHE_HOST': self.endpoint_address,
+            'CACHE_READER_HOST': self.reader_endpoint_address,
+            'CACHE_PORT': str(CACHE_PORT),
+        }
@@ -0,0 +1,26 @@
+"""synth된 cloud assembly(cdk.out) 읽기
+parallel_deploy(배포 순서)와 deploy_state(fingerprint)가 같은 manifest.json을 읽는다.
+https://docs.aws.amazon.com/cdk/api/v2/docs/cloud-assembly-schema-readme.html
+"""
+import json
+import os
+from typing import Dict
+
+STACK_ARTIFACT_TYPE = 'aws:cloudformation:stack'
+ASSET_MANIFEST_TYPE = 'cdk:asset-manifest'
+
+
+def load_artifacts(assembly_dir: str) -> Dict[str, Dict]:
+    """manifest.json의 artifacts (artifact id -> artifact)"""
+    with open(os.path.join(assembly_dir, 'manifest.json')) as stream:
+        return json.load(stream)['artifacts']
+
+
+def stack_artifacts(artifacts: Dict[str, Dict]) -> Dict[str, Dict]:
+    """stack artifact만 (asset manifest, tree 등 제외)"""
+    return {name: artifact for name, artifact in artifacts.items() if artifact['type'] == STACK_ARTIFACT_TYPE}
+
+
+def load_template(assembly_dir: str, artifact: Dict) -> Dict:
+    with open(os.path.join(assembly_dir, artifact['properties']['templateFile'])) as stream:
+        return json.load(stream)
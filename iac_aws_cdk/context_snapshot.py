@@ -0,0 +1,222 @@
+"""context lookup snapshot (Vpc.from_lookup 등)
+cdk CLI는 synth할 때 빠진 lookup을 AWS에 조회해서 cdk.context.json에 저장한다. (checkout마다 네트워크 필요)
+환경별 lookup 결과를 context/<env>.context.json에 저장해두고 app.py에서 먼저 채우면 네트워크 없이 synth된다.
+
+    $ python -m iac_aws_cdk.context_snapshot record [--env stage]           # cdk CLI로 조회한 값을 snapshot으로 저장
+    $ python -m iac_aws_cdk.context_snapshot replay --fixture <json 경로>    # stand-in provider(fixture) 값으로 저장
+    $ python -m iac_aws_cdk.context_snapshot check [--env stage]            # snapshot에 빠진 lookup이 있으면 exit 1
+
+CDK_CONTEXT_OFFLINE=1 (또는 -c offline=true)이면 snapshot에 없는 lookup이 있을 때 synth를 바로 실패시킨다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import aws_cdk as cdk
+
+from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY, DEFAULT_ENV, ENV_CONTEXT_KEY, ENV_ENV_VAR
+from iac_aws_cdk.stack_registry import build_stacks
+
+CONTEXT_DIR = 'context'
+CLI_CONTEXT_FILE = 'cdk.context.json'
+CLI_CONTEXT_ENV_VAR = 'CDK_CONTEXT_JSON'
+OFFLINE_CONTEXT_KEY = 'offline'
+OFFLINE_ENV_VAR = 'CDK_CONTEXT_OFFLINE'
+# record할 때는 snapshot을 채우지 않는다. (cdk CLI가 값을 다시 조회하도록)
+SNAPSHOT_ENV_VAR = 'CDK_CONTEXT_SNAPSHOT'
+# lookup 결과에 따라 다른 lookup이 생길 수 있으므로 cdk CLI처럼 여러 번 synth
+MAX_ROUNDS = 5
+
+_TRUE = ('1', 'true', 'yes', 'on')
+
+
+class ContextSnapshotError(RuntimeError):
+    """snapshot / provider에서 lookup 값을 찾을 수 없는 경우"""
+
+
+class MissingContext(NamedTuple):
+    key: str
+    provider: str
+    props: Dict
+
+
+def env_name(env: Optional[str] = None) -> str:
+    return env or os.environ.get(ENV_ENV_VAR) or DEFAULT_ENV
+
+
+def snapshot_path(env: Optional[str] = None) -> str:
+    return os.path.join(CONTEXT_DIR, f'{env_name(env)}.context.json')
+
+
+def load_snapshot(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as stream:
+        return json.load(stream)
+
+
+def write_snapshot(path: str, context: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as stream:
+        json.dump(context, stream, indent=2, sort_keys=True)
+        stream.write('\n')
+
+
+def _cli_context() -> Dict:
+    """cdk CLI가 app에 넘기는 context (-c, cdk.json, cdk.context.json)"""
+    return json.loads(os.environ.get(CLI_CONTEXT_ENV_VAR) or '{}')
+
+
+def snapshot_context(env: Optional[str] = None) -> Dict:
+    """cdk.App(context=...)에 넘길 snapshot 값. CLI context가 우선하므로 -c / cdk.context.json 값은 그대로 사용
+    (App은 생성되면서 child를 만들기 때문에 나중에 set_context로 채울 수 없다.)
+    """
+    if os.environ.get(SNAPSHOT_ENV_VAR, '').lower() in ('0', 'false', 'no', 'off'):
+        return {}
+    return load_snapshot(snapshot_path(env or _cli_context().get(ENV_CONTEXT_KEY)))
+
+
+def missing_context(assembly_dir: str) -> List[MissingContext]:
+    """cloud assembly manifest의 missing 항목 (jsii manifest 객체는 missing props를 읽지 못해서 json을 직접 읽는다)"""
+    with open(os.path.join(assembly_dir, 'manifest.json')) as stream:
+        manifest = json.load(stream)
+    return [MissingContext(item['key'], item['provider'], item.get('props', {}))
+            for item in manifest.get('missing', [])]
+
+
+def is_offline(app: cdk.App) -> bool:
+    raw = app.node.try_get_context(OFFLINE_CONTEXT_KEY) or os.environ.get(OFFLINE_ENV_VAR, '')
+    return str(raw).lower() in _TRUE
+
+
+def check_offline(app: cdk.App, assembly: cdk.cx_api.CloudAssembly) -> None:
+    """offline이면 빠진 lookup을 dummy 값으로 넘기지 않고 에러"""
+    if not is_offline(app):
+        return
+    missing = missing_context(assembly.directory)
+    if missing:
+        keys = '\n'.join(f'  {item.key}' for item in missing)
+        raise ContextSnapshotError(
+            f'context lookups missing from {snapshot_path(app.node.try_get_context(ENV_CONTEXT_KEY))} '
+            f'(run python -m iac_aws_cdk.context_snapshot record):\n{keys}'
+        )
+
+
+class ContextFileProvider:
+    """cdk CLI가 조회해서 저장한 cdk.context.json (key가 같아야 한다)"""
+
+    def __init__(self, path: str = CLI_CONTEXT_FILE) -> None:
+        self.context = load_snapshot(path)
+
+    def lookup(self, missing: MissingContext):
+        return self.context.get(missing.key)
+
+
+def _matches(expected, actual) -> bool:
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(
+            key in actual and _matches(value, actual[key]) for key, value in expected.items()
+        )
+    return expected == actual
+
+
+class StandInProvider:
+    """context provider 대신 fixture에서 값을 찾는다. (test / 네트워크 없는 build agent)
+    fixture: [{"provider": "vpc-provider", "props": {"filter": {"vpc-id": "vpc-..."}}, "value": {...}}, ...]
+    props는 일부만 적어도 된다. (account / region / lookupRoleArn 등은 비교하지 않음)
+    """
+
+    def __init__(self, entries: Iterable[Dict]) -> None:
+        self.entries = list(entries)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'StandInProvider':
+        with open(path) as stream:
+            return cls(json.load(stream))
+
+    def lookup(self, missing: MissingContext):
+        for entry in self.entries:
+            if entry['provider'] == missing.provider and _matches(entry.get('props', {}), missing.props):
+                return entry['value']
+        return None
+
+
+def _synth_missing(context: Dict, stacks: Optional[Iterable[str]]) -> List[MissingContext]:
+    with tempfile.TemporaryDirectory() as outdir:
+        app = cdk.App(outdir=outdir, context=context)
+        build_stacks(app, stacks)
+        return missing_context(app.synth().directory)
+
+
+def resolve_context(provider, env: Optional[str] = None, config: Optional[str] = None,
+                    stacks: Optional[Iterable[str]] = None) -> Dict:
+    """synth -> 빠진 lookup을 provider로 채움 -> 다시 synth. 사용된 lookup 값만 반환"""
+    settings_context = {ENV_CONTEXT_KEY: env_name(env)}
+    if config:
+        settings_context[CONFIG_CONTEXT_KEY] = config
+    resolved: Dict = {}
+    for _ in range(MAX_ROUNDS):
+        missing = _synth_missing({**settings_context, **resolved}, stacks)
+        if not missing:
+            return resolved
+        unresolved = []
+        for item in missing:
+            value = provider.lookup(item)
+            if value is None:
+                unresolved.append(item.key)
+            else:
+                resolved[item.key] = value
+        if unresolved:
+            raise ContextSnapshotError('no value for context lookups:\n' + '\n'.join(f'  {key}' for key in unresolved))
+    raise ContextSnapshotError(f'context lookups still missing after {MAX_ROUNDS} synth rounds')
+
+
+def record(env: Optional[str] = None, stacks: Optional[Iterable[str]] = None,
+           profile: Optional[str] = None) -> Dict:
+    """cdk CLI로 lookup (AWS credential 필요) -> 사용된 값만 context/<env>.context.json에 저장"""
+    command = ['cdk', 'synth', '--quiet', '-c', f'{ENV_CONTEXT_KEY}={env_name(env)}']
+    if profile:
+        command += ['--profile', profile]
+    subprocess.run(command, env={**os.environ, SNAPSHOT_ENV_VAR: 'off'}, check=True)
+    return resolve_context(ContextFileProvider(), env=env, stacks=stacks)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('record', 'replay', 'check'))
+    parser.add_argument('--env', help=f'config/<env>.ini (기본값 {ENV_ENV_VAR} 또는 {DEFAULT_ENV})')
+    parser.add_argument('--config', help='ini 경로 (replay / check)')
+    parser.add_argument('-s', '--stack', action='append', dest='stacks', help='stack명 (기본값 전체)')
+    parser.add_argument('--profile', help='record: aws profile')
+    parser.add_argument('--fixture', help='replay: stand-in provider fixture json')
+    parser.add_argument('-o', '--output', help='snapshot 경로 (기본값 context/<env>.context.json)')
+    args = parser.parse_args(argv)
+    output = args.output or snapshot_path(args.env)
+
+    try:
+        if args.command == 'record':
+            context = record(args.env, args.stacks, args.profile)
+        elif args.command == 'replay':
+            if not args.fixture:
+                parser.error('replay requires --fixture')
+            context = resolve_context(StandInProvider.from_file(args.fixture), args.env, args.config, args.stacks)
+        else:
+            # snapshot 값으로만 synth (네트워크 없음)
+            context = resolve_context(ContextFileProvider(output), args.env, args.config, args.stacks)
+            print(f'{output}: {len(context)} lookups, nothing missing')
+            return 0
+    except ContextSnapshotError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    write_snapshot(output, context)
+    print(f'{output}: {len(context)} lookups')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
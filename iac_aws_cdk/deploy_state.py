@@ -0,0 +1,202 @@
+"""마지막으로 배포한 stack의 template / asset / SSM parameter 값 fingerprint 기록
+synth 결과의 fingerprint가 기록과 같으면 parallel_deploy에서 cdk deploy(changeset 계산)를 하지 않는다.
+
+    $ python -m iac_aws_cdk.parallel_deploy                                    # .cdk-deploy-state.json
+    $ python -m iac_aws_cdk.parallel_deploy --state s3://<bucket>/<key>.json   # 여러 사람 / CI가 같이 사용
+    $ python -m iac_aws_cdk.parallel_deploy --force                            # 기록을 무시하고 모두 배포
+
+template이 읽는 SSM parameter(eg. ami_from_ssm의 AMI id)는 현재 값을 읽어서 비교하므로
+WordPressImage pipeline이 새 AMI를 만들면 PubEc2Test는 다시 배포된다.
+콘솔 등에서 직접 바꾼 리소스(drift)는 알 수 없으므로 그런 경우에는 --force로 배포한다.
+"""
+import abc
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from iac_aws_cdk.cloud_assembly import ASSET_MANIFEST_TYPE, load_artifacts, load_template, stack_artifacts
+
+DEFAULT_STATE_FILE = '.cdk-deploy-state.json'
+SSM_PARAMETER_TYPE = 'AWS::SSM::Parameter::Value<'
+# 모든 stack에 있는 bootstrap version 확인용 parameter (resource와 관계없음)
+BOOTSTRAP_VERSION_PARAMETER = 'BootstrapVersion'
+
+# (environment, parameter 이름) -> 값. environment는 manifest의 aws://<account>/<region>
+ParameterResolver = Callable[[str, str], Optional[str]]
+
+
+def ssm_parameter_names(template: Dict) -> Dict[str, str]:
+    """template parameter 중 배포할 때 SSM에서 값을 읽는 것 (logical id -> parameter 이름)"""
+    return {
+        logical_id: parameter['Default']
+        for logical_id, parameter in template.get('Parameters', {}).items()
+        if parameter.get('Type', '').startswith(SSM_PARAMETER_TYPE) and 'Default' in parameter
+        and logical_id != BOOTSTRAP_VERSION_PARAMETER
+    }
+
+
+def stack_fingerprints(assembly_dir: str, resolve_parameter: Optional[ParameterResolver] = None) -> Dict[str, str]:
+    """stack명 -> sha256(environment + template + asset id + SSM parameter 값). asset id는 asset 내용의 hash이다.
+    SSM parameter(eg. WordPressImage pipeline이 갱신하는 AMI id)는 template이 같아도 값이 바뀌므로
+    resolve_parameter가 있으면 현재 값도 포함한다.
+    """
+    artifacts = load_artifacts(assembly_dir)
+
+    fingerprints = {}
+    for name, artifact in stack_artifacts(artifacts).items():
+        template = load_template(assembly_dir, artifact)
+        asset_ids = []
+        for dependency in artifact.get('dependencies', []):
+            if artifacts.get(dependency, {}).get('type') != ASSET_MANIFEST_TYPE:
+                continue
+            with open(os.path.join(assembly_dir, artifacts[dependency]['properties']['file'])) as stream:
+                assets = json.load(stream)
+            # template 자체도 file asset으로 들어있으므로 제외 (template은 따로 비교)
+            asset_ids.extend(
+                asset_id for asset_id, asset in assets.get('files', {}).items()
+                if asset['source'].get('path') != artifact['properties']['templateFile']
+            )
+            asset_ids.extend(assets.get('dockerImages', {}))
+        content = {
+            'environment': artifact.get('environment'),
+            'template': template,
+            'assets': sorted(asset_ids),
+        }
+        if resolve_parameter:
+            content['parameters'] = {
+                logical_id: resolve_parameter(artifact.get('environment', ''), parameter_name)
+                for logical_id, parameter_name in ssm_parameter_names(template).items()
+            }
+        content = json.dumps(content, sort_keys=True, separators=(',', ':'))
+        fingerprints[name] = hashlib.sha256(content.encode()).hexdigest()
+    return fingerprints
+
+
+class DeployState(abc.ABC):
+    """{stack명: {fingerprint, deployed_at}} 저장소. _read / _write만 구현하면 된다."""
+
+    def __init__(self) -> None:
+        self._records: Optional[Dict[str, Dict]] = None
+
+    @abc.abstractmethod
+    def _read(self) -> Dict[str, Dict]:
+        """저장된 기록 (없으면 빈 dict)"""
+
+    @abc.abstractmethod
+    def _write(self, records: Dict[str, Dict]) -> None:
+        """기록 전체를 저장"""
+
+    @property
+    def records(self) -> Dict[str, Dict]:
+        if self._records is None:
+            self._records = self._read()
+        return self._records
+
+    def unchanged(self, fingerprints: Dict[str, str]) -> Dict[str, str]:
+        """마지막 배포와 fingerprint가 같은 stack"""
+        return {name: fingerprint for name, fingerprint in fingerprints.items()
+                if self.records.get(name, {}).get('fingerprint') == fingerprint}
+
+    def record(self, name: str, fingerprint: str) -> None:
+        """배포가 끝날 때마다 바로 저장 (뒤의 stack이 실패해도 앞의 기록은 남는다)"""
+        self.records[name] = {
+            'fingerprint': fingerprint,
+            'deployed_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        self._write(self.records)
+
+
+class LocalState(DeployState):
+    def __init__(self, path: str = DEFAULT_STATE_FILE) -> None:
+        super().__init__()
+        self.path = path
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as stream:
+                return json.load(stream)
+        except (OSError, ValueError):  # 없거나 깨진 기록은 모두 변경된 것으로 본다.
+            return {}
+
+    def _write(self, records: Dict[str, Dict]) -> None:
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.deploy-state-')
+        with os.fdopen(fd, 'w') as stream:
+            json.dump(records, stream, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class S3State(DeployState):
+    """s3://<bucket>/<key> 객체 하나 (boto3 필요)"""
+
+    def __init__(self, url: str, client=None) -> None:
+        super().__init__()
+        bucket, _, key = url[len('s3://'):].partition('/')
+        if not bucket or not key:
+            raise ValueError(f'invalid state url: {url} (s3://<bucket>/<key>)')
+        self.bucket = bucket
+        self.key = key
+        if client is None:
+            try:
+                import boto3
+            except ImportError as error:
+                raise RuntimeError('S3 deploy state requires boto3 (pip install boto3)') from error
+            client = boto3.client('s3')
+        self.client = client
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self.key)['Body'].read()
+        except self.client.exceptions.NoSuchKey:
+            return {}
+        return json.loads(body)
+
+    def _write(self, records: Dict[str, Dict]) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=self.key, ContentType='application/json',
+            Body=json.dumps(records, indent=1, sort_keys=True).encode()
+        )
+
+
+class SsmParameters:
+    """SSM parameter 현재 값 (boto3 필요, SSM parameter를 쓰는 stack이 있을 때만 import). 없는 parameter는 None"""
+
+    def __init__(self, profile: Optional[str] = None, client_factory: Optional[Callable] = None) -> None:
+        self.profile = profile
+        self._client_factory = client_factory  # region -> ssm client
+        self._clients: Dict[Optional[str], object] = {}
+        self._values: Dict[tuple, Optional[str]] = {}
+
+    def _client(self, region: Optional[str]):
+        if self._client_factory is None:
+            try:
+                import boto3
+            except ImportError as error:
+                raise RuntimeError('SSM parameter lookup requires boto3 (pip install boto3)') from error
+            self._client_factory = functools.partial(boto3.Session(profile_name=self.profile).client, 'ssm')
+        if region not in self._clients:
+            self._clients[region] = self._client_factory(region)
+        return self._clients[region]
+
+    def __call__(self, environment: str, name: str) -> Optional[str]:
+        region = environment.rsplit('/', 1)[-1] if environment.startswith('aws://') else None
+        if region == 'unknown-region':
+            region = None  # env를 지정하지 않은 stack은 profile의 region
+        if (region, name) not in self._values:
+            client = self._client(region)
+            try:
+                self._values[region, name] = client.get_parameter(Name=name)['Parameter']['Value']
+            except client.exceptions.ParameterNotFound:
+                self._values[region, name] = None
+        return self._values[region, name]
+
+
+def open_state(location: Optional[str] = None) -> DeployState:
+    location = location or DEFAULT_STATE_FILE
+    if location.startswith('s3://'):
+        return S3State(location)
+    return LocalState(location)
@@ -0,0 +1,134 @@
+"""elastic beanstalk environment capacity (instance type / auto scaling / 배포 방식)
+ini의 [eb_stack] 값을 EbCapacityProfile로 묶고, 각 namespace의 option setting 목록으로 변환한다.
+https://docs.aws.amazon.com/elasticbeanstalk/latest/dg/command-options-general.html
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from aws_cdk import aws_elasticbeanstalk as eb
+
+# t4g, m6g, c7gn, r6gd ... (세대 숫자 바로 뒤의 g = graviton)
+_GRAVITON_FAMILY = re.compile(r'^[a-z]+\d+g[a-z]*$')
+
+
+def instance_architecture(instance_type: str) -> str:
+    family = instance_type.split('.', 1)[0]
+    return 'arm64' if _GRAVITON_FAMILY.match(family) else 'x86_64'
+
+
+@dataclass(frozen=True)
+class ScalingTrigger:
+    """aws:autoscaling:trigger 의 measure + metric별 기본 threshold"""
+    measure_name: str
+    unit: str
+    statistic: str
+    upper_threshold: float
+    lower_threshold: float
+
+
+# application load balancer 기준 (Latency는 classic load balancer metric이므로 TargetResponseTime 사용)
+SCALING_TRIGGERS: Dict[str, ScalingTrigger] = {
+    'cpu': ScalingTrigger('CPUUtilization', 'Percent', 'Average', 70, 30),
+    'latency': ScalingTrigger('TargetResponseTime', 'Seconds', 'Average', 1, 0.3),
+    'request_count': ScalingTrigger('RequestCount', 'Count', 'Sum', 5000, 1000),
+}
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+@dataclass(frozen=True)
+class EbCapacityProfile:
+    instance_types: Tuple[str, ...]
+    min_size: int = 1
+    max_size: int = 4
+    scaling_metric: str = 'cpu'
+    upper_threshold: float = 0  # 0이면 SCALING_TRIGGERS의 기본값
+    lower_threshold: float = 0
+    breach_duration_minutes: int = 5
+    deployment_batch_size: int = 30
+    deployment_batch_size_type: str = 'Percentage'  # Percentage / Fixed
+    health_reporting: str = 'basic'  # basic / enhanced (service role 필요)
+
+    def validate(self) -> List[str]:
+        """설정 오류 목록 (EbStackSettings.validate에서 설정 파일의 다른 오류와 함께 보고)"""
+        if not self.instance_types:
+            return ['instance_types is empty']
+        errors = []
+        architectures = {instance_architecture(instance_type) for instance_type in self.instance_types}
+        if len(architectures) > 1:
+            # beanstalk은 첫 번째 instance type의 architecture로 AMI를 고른다.
+            errors.append(f'instance_types mixes architectures: {", ".join(self.instance_types)}')
+        if not 0 <= self.min_size <= self.max_size or self.max_size < 1:
+            errors.append(f'invalid min_size/max_size: {self.min_size}/{self.max_size}')
+        if self.deployment_batch_size < 1:
+            errors.append(f'invalid deployment_batch_size: {self.deployment_batch_size}')
+        if self.scaling_metric not in SCALING_TRIGGERS:
+            errors.append(f'unknown scaling_metric {self.scaling_metric!r}')
+        elif self.scaling_thresholds[0] >= self.scaling_thresholds[1]:
+            errors.append(f'lower threshold {self.scaling_thresholds[0]} is not below upper threshold '
+                          f'{self.scaling_thresholds[1]} ({self.scaling_metric})')
+        return errors
+
+    @classmethod
+    def from_settings(cls, settings) -> 'EbCapacityProfile':
+        """EbStackSettings -> profile"""
+        return cls(
+            instance_types=settings.instance_types,
+            min_size=settings.min_size,
+            max_size=settings.max_size,
+            scaling_metric=settings.scaling_metric,
+            upper_threshold=settings.scaling_upper_threshold,
+            lower_threshold=settings.scaling_lower_threshold,
+            breach_duration_minutes=settings.scaling_breach_duration_minutes,
+            deployment_batch_size=settings.deployment_batch_size,
+            deployment_batch_size_type=settings.deployment_batch_size_type,
+            health_reporting=settings.health_reporting,
+        )
+
+    @property
+    def architecture(self) -> str:
+        return instance_architecture(self.instance_types[0])
+
+    @property
+    def trigger(self) -> ScalingTrigger:
+        return SCALING_TRIGGERS[self.scaling_metric]
+
+    @property
+    def scaling_thresholds(self) -> Tuple[float, float]:
+        """(lower, upper)"""
+        trigger = self.trigger
+        return (self.lower_threshold or trigger.lower_threshold, self.upper_threshold or trigger.upper_threshold)
+
+    def options(self) -> List[Tuple[str, str, str]]:
+        """(namespace, option_name, value) 목록"""
+        trigger = self.trigger
+        lower_threshold, upper_threshold = self.scaling_thresholds
+        return [
+            ('aws:ec2:instances', 'InstanceTypes', ','.join(self.instance_types)),
+            ('aws:ec2:instances', 'SupportedArchitectures', self.architecture),
+            ('aws:autoscaling:asg', 'MinSize', str(self.min_size)),
+            ('aws:autoscaling:asg', 'MaxSize', str(self.max_size)),
+            ('aws:autoscaling:trigger', 'MeasureName', trigger.measure_name),
+            ('aws:autoscaling:trigger', 'Statistic', trigger.statistic),
+            ('aws:autoscaling:trigger', 'Unit', trigger.unit),
+            ('aws:autoscaling:trigger', 'UpperThreshold', _format_number(upper_threshold)),
+            ('aws:autoscaling:trigger', 'LowerThreshold', _format_number(lower_threshold)),
+            ('aws:autoscaling:trigger', 'BreachDuration', str(self.breach_duration_minutes)),
+            # 한 번에 (min ~ max 범위 안에서) 1개씩 늘리고 줄인다.
+            ('aws:autoscaling:trigger', 'UpperBreachScaleIncrement', '1'),
+            ('aws:autoscaling:trigger', 'LowerBreachScaleIncrement', '-1'),
+            ('aws:elasticbeanstalk:command', 'DeploymentPolicy', 'Rolling'),
+            ('aws:elasticbeanstalk:command', 'BatchSizeType', self.deployment_batch_size_type),
+            ('aws:elasticbeanstalk:command', 'BatchSize', str(self.deployment_batch_size)),
+            # enhanced는 service role이 있어야 한다. (EbStack이 만들어서 ServiceRole로 전달)
+            ('aws:elasticbeanstalk:healthreporting:system', 'SystemType', self.health_reporting),
+        ]
+
+    def option_settings(self) -> List[eb.CfnEnvironment.OptionSettingProperty]:
+        return [
+            eb.CfnEnvironment.OptionSettingProperty(namespace=namespace, option_name=option_name, value=value)
+            for namespace, option_name, value in self.options()
+        ]
@@ -1,4 +1,3 @@
-from configparser import ConfigParser
 from aws_cdk import (
     aws_ec2 as ec2,
     aws_rds as rds,
@@ -6,13 +5,13 @@ from aws_cdk import (
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.settings import settings_for
 
 
 class EbNetworkStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, props, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).eb_network_stack
         ####################################################################################
         ####################################################################################
         # Create VPC
@@ -44,7 +43,7 @@ class EbNetworkStack(Stack):
             cidr_block="10.0.1.0/24",
             vpc_id=vpc.ref,
             # availability_zone=f"{props['region']}b"
-            availability_zone=f"{config.get('eb_network_stack', 'aws_region')}b"
+            availability_zone=f"{settings.aws_region}b"
         )
         private_subnet_1.tags.set_tag(key="Name",value="subnet-eb-private-1")
 
@@ -55,7 +54,7 @@ class EbNetworkStack(Stack):
             cidr_block="10.0.2.0/24",
             vpc_id=vpc.ref,
             # availability_zone=f"{props['region']}c"
-            availability_zone=f"{config.get('eb_network_stack', 'aws_region')}c"
+            availability_zone=f"{settings.aws_region}c"
         )
         private_subnet_2.tags.set_tag(key="Name",value="subnet-eb-private-2")
 
@@ -102,7 +101,7 @@ class EbNetworkStack(Stack):
             vpc_id=vpc.ref,
             map_public_ip_on_launch=True,
             # availability_zone=f"{props['region']}a" # us-east-1a
-            availability_zone=f"{config.get('eb_network_stack', 'aws_region')}a"
+            availability_zone=f"{settings.aws_region}a"
         )
         public_subnet_1.tags.set_tag(key="Name",value="subnet-eb-public-1")
 
@@ -113,7 +112,7 @@ class EbNetworkStack(Stack):
             vpc_id=vpc.ref,
             map_public_ip_on_launch=True,
             # availability_zone=f"{props['region']}b"
-            availability_zone=f"{config.get('eb_network_stack', 'aws_region')}b"
+            availability_zone=f"{settings.aws_region}b"
         )
         public_subnet_2.tags.set_tag(key="Name", value="subnet-eb-public-2")
 
@@ -227,12 +226,28 @@ class EbNetworkStack(Stack):
             source_security_group_id=webserver_sec_group.ref
         )
 
+        # RDS Proxy를 사용하면 proxy(sg-eb-db) -> db(sg-eb-db) 접속도 허용
+        if settings_for(self).eb_stack.db_proxy:
+            ec2.CfnSecurityGroupIngress(
+                self,
+                "sec-group-db-proxy-ingress",
+                ip_protocol="tcp",
+                from_port=3306,
+                to_port=3306,
+                group_id=db_sec_group.ref,
+                source_security_group_id=db_sec_group.ref
+            )
+
         ####################################################################################
         ####################################################################################
         self.output_props = props.copy()
         self.output_props['webserver_sg_id'] = webserver_sec_group.ref
         self.output_props['public_subnet_id_1'] =  public_subnet_1.ref
         self.output_props['public_subnet_id_2'] =  public_subnet_2.ref
+        self.output_props['private_subnet_id_1'] = private_subnet_1.ref
+        self.output_props['private_subnet_id_2'] = private_subnet_2.ref
+        self.output_props['private_subnet_az_1'] = private_subnet_1.availability_zone
+        self.output_props['private_subnet_az_2'] = private_subnet_2.availability_zone
         self.output_props['private_db_sg_id'] = db_sec_group.ref
         self.output_props['vpc-id'] = vpc.ref
 
@@ -2,6 +2,9 @@ import json
 import os
 from configparser import ConfigParser
 from aws_cdk import (
+    AssetHashType,
+    Fn,
+    SecretValue,
     Stack,
     aws_elasticbeanstalk as eb,
     aws_s3_assets as s3assets,
@@ -11,10 +14,18 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+from iac_aws_cdk.asset_cache import asset_hash_props
+from iac_aws_cdk.cache_cluster import CacheCluster
+from iac_aws_cdk.eb_capacity import EbCapacityProfile
+from iac_aws_cdk.settings import settings_for
+from iac_aws_cdk.source_bundle import build_source_bundle
+
 
 class EbStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, props, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).eb_stack
+        capacity = EbCapacityProfile.from_settings(settings)
 
         # appName = props['eb_name']
         appName = 'myEbApp'
@@ -27,15 +38,25 @@ class EbStack(Stack):
         dir_path = os.path.dirname(os.path.realpath(__file__))
 
         # Move zip file to S3 bucket created by CDK so Beanstalk can pull from.
+        if settings.source_dir:
+            # source_dir을 직접 zip (같은 tree면 같은 zip / hash -> 다시 upload하지 않음)
+            source_bundle = build_source_bundle(settings.source_dir, settings.source_excludes)
+            web_app_zip_path = source_bundle.path
+            web_app_zip_hash = {'asset_hash': source_bundle.digest, 'asset_hash_type': AssetHashType.CUSTOM}
+        else:
+            web_app_zip_path = dir_path+"/../../aws_onboarding.zip"  # NOTE: 코드상을로는 현재디렉토리 위에서 파일을 찾는다. (프로젝트에서 제외하기 위한 목적인듯)
+            # NOTE: 임시로 현재 파일들 압축 (테스트용)
+            # https://docs.aws.amazon.com/elasticbeanstalk/latest/dg/applications-sourcebundle.html
+            # $ zip ../aws_onboarding.zip -r * .[^.]*
+            # NOTE: django 앱이 있어야 실제로 테스트해볼 수 있을 것 같다.
+            # zip이 바뀌지 않았으면 이전 synth에서 계산한 hash 재사용 (iac_aws_cdk/asset_cache.py)
+            web_app_zip_hash = asset_hash_props(web_app_zip_path)
         webAppZipArchive = s3assets.Asset(
             self,
             'WebAppZip',
-            path=dir_path+"/../../aws_onboarding.zip"  # NOTE: 코드상을로는 현재디렉토리 위에서 파일을 찾는다. (프로젝트에서 제외하기 위한 목적인듯)
+            path=web_app_zip_path,
+            **web_app_zip_hash
         )
-        # NOTE: 임시로 현재 파일들 압축 (테스트용)
-        # https://docs.aws.amazon.com/elasticbeanstalk/latest/dg/applications-sourcebundle.html
-        # $ zip ../aws_onboarding.zip -r * .[^.]*
-        # NOTE: django 앱이 있어야 실제로 테스트해볼 수 있을 것 같다.
 
         # Beanstalk application version object. The actual Beanstalk deployment
         appVersionProps = eb.CfnApplicationVersion(
@@ -88,11 +109,6 @@ class EbStack(Stack):
                 option_name='ELBSubnets',
                 value=f"{props['public_subnet_id_1']}, {props['public_subnet_id_2']}"
             ),
-            eb.CfnEnvironment.OptionSettingProperty(
-                namespace='aws:ec2:instances',
-                option_name='InstanceTypes',
-                value='t2.micro'
-            ),
             eb.CfnEnvironment.OptionSettingProperty(
                 namespace='aws:autoscaling:launchconfiguration',
                 option_name='SecurityGroups',
@@ -108,24 +124,27 @@ class EbStack(Stack):
                 option_name='IamInstanceProfile',
                 value=my_profile_name
             ),
-            eb.CfnEnvironment.OptionSettingProperty(
-                namespace='aws:autoscaling:asg',
-                option_name='MinSize',
-                value='1'
-            ),
-            eb.CfnEnvironment.OptionSettingProperty(
-                namespace='aws:autoscaling:asg',
-                option_name='MaxSize',
-                value='1'
-            ),
+            # instance type, aws:autoscaling:asg/trigger, rolling 배포, health reporting
+            *capacity.option_settings(),
         ]
 
-        eb.CfnEnvironment(self, 'Environment',
-            application_name=appName,
-            solution_stack_name=props['beanstalk_stack'],
-            option_settings=eb_option_settings,
-            version_label=appVersionProps.ref
-        )
+        if capacity.health_reporting == 'enhanced':
+            # enhanced health는 beanstalk이 service role로 instance/load balancer 상태를 읽는다.
+            # (기본 aws-elasticbeanstalk-service-role이 account에 없을 수 있으므로 직접 생성)
+            service_role = iam.Role(
+                self, f"{appName}-aws-elasticbeanstalk-service-role",
+                assumed_by=iam.ServicePrincipal('elasticbeanstalk.amazonaws.com'),
+                managed_policies=[
+                    iam.ManagedPolicy.from_aws_managed_policy_name('service-role/AWSElasticBeanstalkEnhancedHealth')
+                ]
+            )
+            eb_option_settings.append(
+                eb.CfnEnvironment.OptionSettingProperty(
+                    namespace='aws:elasticbeanstalk:environment',
+                    option_name='ServiceRole',
+                    value=service_role.role_arn
+                )
+            )
 
         ####################################################################################
         # Database user
@@ -145,20 +164,146 @@ class EbStack(Stack):
                             )
         )
 
+        # storage (replica도 같은 설정)
+        db_storage = dict(
+            storage_type=settings.db_storage_type,
+            allocated_storage=str(settings.db_allocated_storage_gib),
+            iops=settings.db_iops or None
+        )
+
         # create db instance  
         # Retrieve password and pass to the Db Instance (https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk/SecretValue.html#aws_cdk.SecretValue.unsafe_unwrap)
-        rds.CfnDBInstance(
+        db_instance = rds.CfnDBInstance(
             self,
             "rds-instance",
             engine=props['db_instance_engine'],
             db_subnet_group_name=props['db_subnet_group_name'],
             db_instance_identifier=props['db_instance_identifier'],
-            db_instance_class="db.t2.micro",
+            db_instance_class=settings.db_instance_class,
             deletion_protection=False,
             multi_az=False,
             vpc_security_groups=[props['private_db_sg_id']],
-            allocated_storage="20",
+            **db_storage,
             master_username=props['db_master_username'],
             master_user_password=secret.secret_value_from_json("db-master-user-password").unsafe_unwrap(),
             db_name=props['db_name']
         )
+        # CfnDBInstance(2.38)에 StorageThroughput 속성이 없어서 직접 추가
+        if settings.db_storage_throughput:
+            db_instance.add_property_override('StorageThroughput', settings.db_storage_throughput)
+
+        # read replica: private subnet az에 번갈아 생성 (subnet group은 source instance를 따른다)
+        # https://docs.aws.amazon.com/AmazonRDS/latest/UserGuide/USER_ReadRepl.html
+        db_replicas = []
+        replica_azs = [props['private_subnet_az_1'], props['private_subnet_az_2']]
+        for i in range(settings.db_read_replicas):
+            db_replica = rds.CfnDBInstance(
+                self,
+                f"rds-read-replica{i + 1}",
+                source_db_instance_identifier=db_instance.ref,
+                db_instance_identifier=f"{props['db_instance_identifier']}-replica{i + 1}",
+                db_instance_class=settings.db_replica_instance_class,
+                availability_zone=replica_azs[i % len(replica_azs)],
+                vpc_security_groups=[props['private_db_sg_id']],
+                deletion_protection=False,
+                **db_storage
+            )
+            if settings.db_storage_throughput:
+                db_replica.add_property_override('StorageThroughput', settings.db_storage_throughput)
+            db_replicas.append(db_replica)
+
+        ####################################################################################
+        # RDS Proxy: web server마다 db connection을 여는 대신 proxy의 connection pool을 공유한다.
+        # https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-resource-rds-dbproxy.html
+        if settings.db_proxy:
+            # proxy는 secret의 username / password key만 읽으므로 master user secret은 그대로 두고 proxy용 secret을 따로 만든다.
+            # (password는 master user secret 값을 dynamic reference로 복사)
+            # https://docs.aws.amazon.com/AmazonRDS/latest/UserGuide/rds-proxy-setup.html#rds-proxy-secrets-arns
+            db_proxy_secret = sm.Secret(
+                self,
+                "db-proxy-secret",
+                description="rds proxy auth (db master user)",
+                secret_object_value={
+                    "username": SecretValue.unsafe_plain_text(props['db_master_username']),
+                    "password": secret.secret_value_from_json("db-master-user-password")
+                }
+            )
+            db_proxy_role = iam.Role(
+                self,
+                "db-proxy-role",
+                assumed_by=iam.ServicePrincipal('rds.amazonaws.com')
+            )
+            db_proxy_secret.grant_read(db_proxy_role)
+
+            # proxy는 db와 같은 sg-eb-db에 두고, web server -> proxy / proxy -> db 모두 3306
+            db_proxy = rds.CfnDBProxy(
+                self,
+                "rds-proxy",
+                db_proxy_name=f"{props['db_instance_identifier']}-proxy",
+                engine_family='MYSQL',
+                auth=[
+                    rds.CfnDBProxy.AuthFormatProperty(
+                        auth_scheme='SECRETS',
+                        iam_auth='DISABLED',
+                        secret_arn=db_proxy_secret.secret_arn
+                    )
+                ],
+                role_arn=db_proxy_role.role_arn,
+                vpc_subnet_ids=[props['private_subnet_id_1'], props['private_subnet_id_2']],
+                vpc_security_group_ids=[props['private_db_sg_id']],
+                require_tls=settings.db_proxy_require_tls,
+                idle_client_timeout=settings.db_proxy_idle_client_timeout_seconds
+            )
+            rds.CfnDBProxyTargetGroup(
+                self,
+                "rds-proxy-target-group",
+                db_proxy_name=db_proxy.ref,
+                target_group_name='default',
+                db_instance_identifiers=[db_instance.ref],
+                connection_pool_configuration_info=rds.CfnDBProxyTargetGroup.ConnectionPoolConfigurationInfoFormatProperty(
+                    max_connections_percent=settings.db_proxy_max_connections_percent,
+                    max_idle_connections_percent=settings.db_proxy_max_idle_connections_percent
+                )
+            )
+
+        # 쓰기는 writer(proxy가 있으면 proxy), 읽기는 replica에 분산 (replica가 없으면 writer)
+        # rds mysql proxy에는 read only endpoint가 없어서(aurora만 가능) replica는 proxy를 거치지 않고 직접 접속한다.
+        db_writer_host = db_proxy.attr_endpoint if settings.db_proxy else db_instance.attr_endpoint_address
+        db_reader_hosts = [db_replica.attr_endpoint_address for db_replica in db_replicas] or [db_writer_host]
+        eb_option_settings.extend([
+            eb.CfnEnvironment.OptionSettingProperty(
+                namespace='aws:elasticbeanstalk:application:environment',
+                option_name='DB_WRITER_HOST',
+                value=db_writer_host
+            ),
+            eb.CfnEnvironment.OptionSettingProperty(
+                namespace='aws:elasticbeanstalk:application:environment',
+                option_name='DB_READER_HOSTS',
+                value=Fn.join(',', db_reader_hosts)
+            ),
+        ])
+
+        if settings.cache:
+            eb_cache = CacheCluster(
+                self,
+                'EbCache',
+                settings=settings,
+                vpc_id=props['vpc-id'],
+                subnet_ids=[props['private_subnet_id_1'], props['private_subnet_id_2']],
+                client_security_group_id=props['webserver_sg_id']
+            )
+            eb_option_settings.extend(
+                eb.CfnEnvironment.OptionSettingProperty(
+                    namespace='aws:elasticbeanstalk:application:environment',
+                    option_name=name,
+                    value=value
+                )
+                for name, value in eb_cache.environment().items()
+            )
+
+        eb.CfnEnvironment(self, 'Environment',
+            application_name=appName,
+            solution_stack_name=props['beanstalk_stack'],
+            option_settings=eb_option_settings,
+            version_label=appVersionProps.ref
+        )
@@ -1,28 +1,64 @@
-from configparser import ConfigParser
 import json
+from typing import Dict, List
+
 from aws_cdk import (
+    Duration,
     Stack,
+    aws_applicationautoscaling as appscaling,
+    aws_cloudwatch as cloudwatch,
     aws_ec2 as ec2,
     aws_ecr as ecr,
     aws_ecs as ecs,
     aws_iam as iam,
     aws_secretsmanager as secretsmanager,
     aws_events as events,
-    aws_events_targets as event_targets
+    aws_events_targets as event_targets,
+    aws_sqs as sqs
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.settings import settings_for
+
+CRON_MODE = 'cron'
+QUEUE_MODE = 'queue'
+WORKER_COMMAND = ['python', '-m', 'src.run']
+
+
+def backlog_scaling_steps(max_tasks: int, messages_per_task: int) -> List[appscaling.ScalingInterval]:
+    """queue backlog(message 수) -> task 수 (EXACT_CAPACITY)
+    0이면 0개, 1개 이상이면 1개, 이후 message_per_task 단위로 2배씩 늘려 max_tasks까지
+    eg. max 10, 100개 단위: 0 -> 0, 1~ -> 1, 100~ -> 2, 200~ -> 4, 400~ -> 8, 800~ -> 10
+    """
+    steps = [
+        appscaling.ScalingInterval(upper=0, change=0),
+        appscaling.ScalingInterval(lower=1, change=1),
+    ]
+    tasks = 1
+    while tasks < max_tasks:
+        lower = tasks * messages_per_task
+        tasks = min(tasks * 2, max_tasks)
+        steps.append(appscaling.ScalingInterval(lower=lower, change=tasks))
+    return steps
+
+
+def backlog_metric_expression(max_message_age_seconds: int) -> str:
+    """backlog_scaling_steps에 넣는 metric (visible + in_flight)
+    가장 오래된 message가 max_age 이상 기다리면 backlog를 2배, max_age * 2 이상이면 4배로 봐서 task 수를 한두 단계 올린다.
+    backlog와 message 나이를 policy 하나(EXACT_CAPACITY)로 정해야 두 policy가 서로 task 수를 되돌리지 않는다.
+    """
+    return (f'(visible + in_flight) * IF(age >= {max_message_age_seconds * 2}, 4, '
+            f'IF(age >= {max_message_age_seconds}, 2, 1))')
+
 
 class EcsTask(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).ecs_task
 
         default_vpc = ec2.Vpc.from_lookup(
             self,
             id='DefaultVpc',
-            vpc_id=config.get('ecs_task', 'vpc_id')
+            vpc_id=settings.vpc_id
         )
 
         deployment_example_cluster = ecs.Cluster(
@@ -36,12 +72,12 @@ class EcsTask(Stack):
         # my_repo = ecr.Repository.from_repository_name(
         #     self,
         #     id='MyRepo',
-        #     repository_name=config.get('ecs_task', 'ecr_repo')  # repo name은 대문자 사용 불가능
+        #     repository_name=settings.ecr_repo  # repo name은 대문자 사용 불가능
         # )
         my_repo = ecr.Repository(
             self,
             id='MyRepo',
-            repository_name=config.get('ecs_task', 'ecr_repo')  # repo name은 대문자 사용 불가능
+            repository_name=settings.ecr_repo  # repo name은 대문자 사용 불가능
         )
 
         # https://github.com/aws/aws-cdk/issues/18926
@@ -94,31 +130,42 @@ class EcsTask(Stack):
 
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_ecs/ContainerImage.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_ecs/FargateTaskDefinition.html
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ecs/RuntimePlatform.html
         deployment_example_task = ecs.FargateTaskDefinition(
             self,
             id='DeploymentExampleTask',
             family='DeploymentExampleTask',
-            memory_limit_mib=512,
-            cpu=256,
+            memory_limit_mib=settings.task_memory_mib,
+            cpu=settings.task_cpu,
+            ephemeral_storage_gib=settings.task_ephemeral_storage_gib or None,
             runtime_platform=ecs.RuntimePlatform(
-                operating_system_family=ecs.OperatingSystemFamily.LINUX
+                operating_system_family=ecs.OperatingSystemFamily.LINUX,
+                # arm64인 경우 ecr image도 arm64(또는 multi-arch)로 build해야 한다.
+                cpu_architecture=(
+                    ecs.CpuArchitecture.ARM64 if settings.task_cpu_architecture == 'arm64' else ecs.CpuArchitecture.X86_64
+                )
             ),
             # console화면: task definition > builder > task role
             task_role=secrets_access_role,  # secrets manager value에 접근 (console화면: iam > roles > {roles name} > permissions)
         )
-        deployment_example_task.add_container(
-            id='DeploymentExampleContainer',
-            image=ecs.ContainerImage.from_ecr_repository(
-                repository=my_repo,
-                tag='latest'
-            ),
-            logging=ecs.LogDriver.aws_logs(stream_prefix='ecs'),
-            # https://stackoverflow.com/questions/67715261/aws-cdk-possible-to-access-individual-json-value-within-a-secrets-manager-se
-            # task definition이 아니라 container에 직접 추가하는 방법도 있다.
-            # secrets=''
-        )
+        work_queue = None
+        if settings.mode == QUEUE_MODE:
+            # https://docs.aws.amazon.com/AmazonECS/latest/developerguide/service-autoscaling-stepscaling.html
+            work_queue_dlq = sqs.Queue(
+                self,
+                id='WorkQueueDlq',
+                retention_period=Duration.days(14)
+            )
+            work_queue = sqs.Queue(
+                self,
+                id='WorkQueue',
+                # visibility timeout은 message 하나를 처리하는 최대 시간보다 길어야 중복 처리가 없다.
+                visibility_timeout=Duration.minutes(15),
+                dead_letter_queue=sqs.DeadLetterQueue(max_receive_count=3, queue=work_queue_dlq)
+            )
+            work_queue.grant_consume_messages(secrets_access_role)
 
-        secretsmanager.Secret(
+        my_test_secret = secretsmanager.Secret(
             self,
             id='MyTestSecret',
             secret_name='MyTestSecret',
@@ -132,6 +179,28 @@ class EcsTask(Stack):
             )
         )
 
+        stack_secrets: Dict[str, secretsmanager.ISecret] = {'MyTestSecret': my_test_secret}
+        container_secrets = self._container_secrets(settings, stack_secrets)
+        container_environment = {'WORK_QUEUE_URL': work_queue.queue_url} if work_queue else {}
+        if settings.secret_cache_ttl_seconds:
+            # 주입된 값은 task가 시작할 때 값이므로 오래 실행되는 worker는 ttl마다 다시 읽는다. (scripts/ecs/secret_cache.py)
+            container_environment.update(self._secret_cache_environment(settings, stack_secrets, secrets_access_role))
+
+        deployment_example_task.add_container(
+            id='DeploymentExampleContainer',
+            image=ecs.ContainerImage.from_ecr_repository(
+                repository=my_repo,
+                tag='latest'
+            ),
+            logging=ecs.LogDriver.aws_logs(stream_prefix='ecs'),
+            # queue mode에서는 service가 container를 바로 실행하므로 command를 container에 지정
+            command=WORKER_COMMAND if work_queue else None,
+            environment=container_environment or None,
+            # https://stackoverflow.com/questions/67715261/aws-cdk-possible-to-access-individual-json-value-within-a-secrets-manager-se
+            # task가 시작할 때 ecs agent가 읽어서 환경변수로 넣는다. (app에서 GetSecretValue를 호출하지 않음, execution role에 권한 추가)
+            secrets=container_secrets or None
+        )
+
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_events/Rule.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_events/Schedule.html
         # https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.core/Duration.html
@@ -143,10 +212,15 @@ class EcsTask(Stack):
         custom_pub_subnet1 = ec2.Subnet.from_subnet_attributes(
             self,
             id='CustomPubSubnet1',
-            subnet_id=config.get('ecs_task', 'vpc_subnet'),  # EcsLbTest2PrivateStack/CustomVpc1/CustomPubSubnet1
-            availability_zone=config.get('ecs_task', 'aws_region'),
+            subnet_id=settings.vpc_subnet,  # EcsLbTest2PrivateStack/CustomVpc1/CustomPubSubnet1
+            availability_zone=settings.aws_region,
         )
 
+        if work_queue:
+            self._queue_worker(settings, deployment_example_cluster, deployment_example_task,
+                               custom_pub_subnet1, work_queue)
+            return
+
         my_schedule = events.Rule(
             self,
             id='MySchedule',
@@ -168,12 +242,12 @@ class EcsTask(Stack):
                         ec2.SecurityGroup.from_security_group_id(
                             self,
                             id='MySecurityGroup',
-                            security_group_id=config.get('ecs_task', 'sg_id')
+                            security_group_id=settings.sg_id
                         )
                     ],
                     container_overrides=[
                         event_targets.ContainerOverride(
-                            container_name=config.get('ecs_task', 'ecs_container'),
+                            container_name=settings.ecs_container,
                             command=[
                                 "python",
                                 "-m",
@@ -190,4 +264,104 @@ class EcsTask(Stack):
                 #     retry_attempts=''
                 # )
             ]
-        )
\ No newline at end of file
+        )
+
+        # events_targets.EcsTask에는 capacity provider strategy 옵션이 없어서 CfnRule을 직접 수정한다.
+        # (LaunchType과 CapacityProviderStrategy는 같이 쓸 수 없다)
+        # https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-properties-events-rule-ecsparameters.html
+        if settings.capacity_provider_strategy:
+            my_schedule_rule = my_schedule.node.default_child
+            my_schedule_rule.add_property_deletion_override('Targets.0.EcsParameters.LaunchType')
+            my_schedule_rule.add_property_override(
+                'Targets.0.EcsParameters.CapacityProviderStrategy',
+                [
+                    {
+                        'CapacityProvider': item.provider,
+                        'Weight': item.weight,
+                        'Base': item.base
+                    }
+                    for item in settings.capacity_provider_strategy
+                ]
+            )
+
+    def _secret(self, secret_name: str, stack_secrets: Dict[str, secretsmanager.ISecret]) -> secretsmanager.ISecret:
+        if secret_name not in stack_secrets:
+            # 다른 stack(eg. SecretCreation)에서 만든 secret은 이름으로 참조
+            stack_secrets[secret_name] = secretsmanager.Secret.from_secret_name_v2(
+                self, id=f'ImportedSecret-{secret_name}'.replace('/', '-'), secret_name=secret_name
+            )
+        return stack_secrets[secret_name]
+
+    def _container_secrets(self, settings,
+                           stack_secrets: Dict[str, secretsmanager.ISecret]) -> Dict[str, ecs.Secret]:
+        """[ecs_task] secrets -> {환경변수: ecs.Secret} (json key가 있으면 그 값만 주입)"""
+        return {
+            item.env_name: ecs.Secret.from_secrets_manager(
+                self._secret(item.secret_name, stack_secrets), field=item.field or None
+            )
+            for item in settings.secrets
+        }
+
+    def _secret_cache_environment(self, settings, stack_secrets: Dict[str, secretsmanager.ISecret],
+                                  task_role: iam.IRole) -> Dict[str, str]:
+        """SECRET_SOURCES: {환경변수: {secret_id, field}} (json), SECRETS_CACHE_TTL_SECONDS"""
+        sources = {}
+        for item in settings.secrets:
+            self._secret(item.secret_name, stack_secrets).grant_read(task_role)
+            sources[item.env_name] = {'secret_id': item.secret_name, 'field': item.field}
+        return {
+            'SECRET_SOURCES': json.dumps(sources, sort_keys=True),
+            'SECRETS_CACHE_TTL_SECONDS': str(settings.secret_cache_ttl_seconds),
+        }
+
+    def _queue_worker(self, settings, cluster: ecs.Cluster, task_definition: ecs.FargateTaskDefinition,
+                      subnet: ec2.ISubnet, work_queue: sqs.Queue) -> ecs.FargateService:
+        """queue mode: 작업이 없으면 0개, queue 길이/가장 오래된 message 나이에 따라 task를 늘리는 service
+        cron mode와 달리 실행이 겹치지 않고, backlog가 쌓이면 처리량을 늘릴 수 있다.
+        """
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ecs/FargateService.html
+        worker_service = ecs.FargateService(
+            self,
+            id='DeploymentExampleWorker',
+            cluster=cluster,
+            task_definition=task_definition,
+            desired_count=0,  # 실제 task 수는 아래 scaling policy가 정한다.
+            assign_public_ip=True,  # public subnet에서 nat 없이 ecr pull
+            vpc_subnets=ec2.SubnetSelection(subnets=[subnet]),
+            security_groups=[
+                ec2.SecurityGroup.from_security_group_id(
+                    self,
+                    id='MySecurityGroup',
+                    security_group_id=settings.sg_id
+                )
+            ],
+            capacity_provider_strategies=[
+                ecs.CapacityProviderStrategy(capacity_provider=item.provider, weight=item.weight, base=item.base)
+                for item in settings.capacity_provider_strategy
+            ] or None
+        )
+
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ecs/ScalableTaskCount.html
+        worker_count = worker_service.auto_scale_task_count(min_capacity=0, max_capacity=settings.worker_max_tasks)
+
+        # 처리 중인(not visible) message도 포함해야 작업 도중 scale in 되지 않는다.
+        # message가 오래 기다리면 (처리가 backlog를 못 따라가면) backlog를 크게 봐서 task를 더 늘린다.
+        backlog = cloudwatch.MathExpression(
+            expression=backlog_metric_expression(settings.worker_max_message_age_seconds),
+            using_metrics={
+                'visible': work_queue.metric_approximate_number_of_messages_visible(),
+                'in_flight': work_queue.metric_approximate_number_of_messages_not_visible(),
+                'age': work_queue.metric_approximate_age_of_oldest_message(),
+            },
+            label='WorkQueueBacklog',
+            period=Duration.minutes(1)
+        )
+        worker_count.scale_on_metric(
+            'BacklogScaling',
+            metric=backlog,
+            scaling_steps=backlog_scaling_steps(settings.worker_max_tasks, settings.worker_messages_per_task),
+            adjustment_type=appscaling.AdjustmentType.EXACT_CAPACITY,
+            evaluation_periods=1,
+            cooldown=Duration.minutes(1)
+        )
+        return worker_service
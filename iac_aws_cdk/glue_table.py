@@ -0,0 +1,158 @@
+"""glue table 선언 (column / partition projection)
+partition projection을 사용하면 athena가 partition 값을 table property에서 계산하므로
+glue catalog의 GetPartitions 호출 없이 query plan을 만들고, crawler 없이도 새 partition을 조회할 수 있다.
+https://docs.aws.amazon.com/athena/latest/ug/partition-projection.html
+"""
+import abc
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+from aws_cdk import aws_glue as glue
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: str  # hive type (eg. string, int, bigint, date)
+    comment: str = ''
+
+    def to_property(self) -> glue.CfnTable.ColumnProperty:
+        return glue.CfnTable.ColumnProperty(name=self.name, type=self.type, comment=self.comment or None)
+
+
+@dataclass(frozen=True)
+class DateProjection:
+    """date partition. range_to에는 'NOW', 'NOW-3YEARS' 같은 상대값도 사용 가능"""
+    name: str
+    range_from: str
+    range_to: str = 'NOW'
+    format: str = 'yyyy-MM-dd'
+    interval: int = 1
+    interval_unit: str = 'DAYS'
+
+    column_type = 'string'
+
+    def parameters(self) -> Dict[str, str]:
+        prefix = f'projection.{self.name}'
+        return {
+            f'{prefix}.type': 'date',
+            f'{prefix}.range': f'{self.range_from},{self.range_to}',
+            f'{prefix}.format': self.format,
+            f'{prefix}.interval': str(self.interval),
+            f'{prefix}.interval.unit': self.interval_unit,
+        }
+
+
+@dataclass(frozen=True)
+class IntegerProjection:
+    name: str
+    range_from: int
+    range_to: int
+    interval: int = 1
+    digits: Optional[int] = None  # 0으로 채우는 자리수 (eg. month=01)
+
+    column_type = 'int'
+
+    def parameters(self) -> Dict[str, str]:
+        prefix = f'projection.{self.name}'
+        params = {
+            f'{prefix}.type': 'integer',
+            f'{prefix}.range': f'{self.range_from},{self.range_to}',
+            f'{prefix}.interval': str(self.interval),
+        }
+        if self.digits:
+            params[f'{prefix}.digits'] = str(self.digits)
+        return params
+
+
+Projection = Union[DateProjection, IntegerProjection]
+
+
+@dataclass(frozen=True)
+class TableSchema(abc.ABC):
+    """s3 location 아래 key=value/ 형태의 partition을 가진 external table (파일 형식은 subclass)"""
+    name: str
+    location: str  # s3://bucket/prefix (마지막 '/' 제외)
+    columns: Tuple[Column, ...]
+    partitions: Tuple[Projection, ...] = ()
+
+    def storage_location_template(self) -> str:
+        path = '/'.join(f'{partition.name}=${{{partition.name}}}' for partition in self.partitions)
+        return f'{self.location}/{path}/'
+
+    def format_parameters(self) -> Dict[str, str]:
+        return {}
+
+    @abc.abstractmethod
+    def storage_format(self) -> Dict[str, object]:
+        """StorageDescriptorProperty의 input / output format, serde"""
+
+    def parameters(self) -> Dict[str, str]:
+        params = self.format_parameters()
+        if self.partitions:
+            params['projection.enabled'] = 'true'
+            params['storage.location.template'] = self.storage_location_template()
+            for partition in self.partitions:
+                params.update(partition.parameters())
+        return params
+
+    def table_input(self) -> glue.CfnTable.TableInputProperty:
+        return glue.CfnTable.TableInputProperty(
+            name=self.name,
+            table_type='EXTERNAL_TABLE',
+            parameters=self.parameters(),
+            partition_keys=[
+                glue.CfnTable.ColumnProperty(name=partition.name, type=partition.column_type)
+                for partition in self.partitions
+            ],
+            storage_descriptor=glue.CfnTable.StorageDescriptorProperty(
+                columns=[column.to_property() for column in self.columns],
+                location=f'{self.location}/',
+                **self.storage_format()
+            )
+        )
+
+
+@dataclass(frozen=True)
+class CsvTableSchema(TableSchema):
+    """csv (header 포함) 파일"""
+    delimiter: str = ','
+    skip_header_lines: int = 1
+
+    def format_parameters(self) -> Dict[str, str]:
+        return {
+            'classification': 'csv',
+            'skip.header.line.count': str(self.skip_header_lines),
+        }
+
+    def storage_format(self) -> Dict[str, object]:
+        return dict(
+            input_format='org.apache.hadoop.mapred.TextInputFormat',
+            output_format='org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat',
+            serde_info=glue.CfnTable.SerdeInfoProperty(
+                serialization_library='org.apache.hadoop.hive.serde2.lazy.LazySimpleSerDe',
+                parameters={'field.delim': self.delimiter}
+            )
+        )
+
+
+@dataclass(frozen=True)
+class ParquetTableSchema(TableSchema):
+    """parquet 파일 (compression은 파일 메타데이터를 따른다)"""
+    compression: str = 'SNAPPY'
+
+    def format_parameters(self) -> Dict[str, str]:
+        return {
+            'classification': 'parquet',
+            'parquet.compression': self.compression,
+        }
+
+    def storage_format(self) -> Dict[str, object]:
+        return dict(
+            input_format='org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat',
+            output_format='org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat',
+            serde_info=glue.CfnTable.SerdeInfoProperty(
+                serialization_library='org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe',
+                parameters={'serialization.format': '1'}
+            )
+        )
@@ -1,31 +1,59 @@
 """custom(JwApp) vpc, subnet, sg 생성
 nat instance 때문에 비용이 지속적으로 발생해서 사용안할 시에는 제거 -> nat instance, subnet들만 제거는 불가능
 stack 자체를 제거 (cdk destroy)
+-> nat_mode=none으로 nat 없이 배포 가능 (private subnet은 isolated, vpc_endpoints로 aws service 접근)
 """
-from configparser import ConfigParser
 from aws_cdk import (
     Stack,
     aws_ec2 as ec2
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.settings import settings_for
+
+# vpc_endpoints 설정값 -> endpoint service
+# https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ec2/GatewayVpcEndpointAwsService.html
+# https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ec2/InterfaceVpcEndpointAwsService.html
+GATEWAY_ENDPOINTS = {
+    's3': ec2.GatewayVpcEndpointAwsService.S3,
+}
+INTERFACE_ENDPOINTS = {
+    'ecr.api': ec2.InterfaceVpcEndpointAwsService.ECR,
+    'ecr.dkr': ec2.InterfaceVpcEndpointAwsService.ECR_DOCKER,
+    'logs': ec2.InterfaceVpcEndpointAwsService.CLOUDWATCH_LOGS,
+    'secretsmanager': ec2.InterfaceVpcEndpointAwsService.SECRETS_MANAGER,
+}
+
+
+def endpoint_id(name: str) -> str:
+    """eg. ecr.dkr -> JwAppEcrDkrEndpoint"""
+    return 'JwApp' + ''.join(part.capitalize() for part in name.split('.')) + 'Endpoint'
 
 class JwApp(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).jw_app
+
+        # nat는 az마다 하나씩 만들어서 private subnet의 route table이 같은 az의 nat를 사용하도록 한다.
+        # (nat 하나에 모든 az의 트래픽이 몰리지 않고, cross-az 트래픽 비용도 없다)
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ec2/NatProvider.html
+        if settings.nat_mode == 'instance':
+            nat_gateway_provider = ec2.NatProvider.instance(
+                instance_type=ec2.InstanceType(settings.nat_instance_type)
+            )
+        elif settings.nat_mode == 'gateway':
+            nat_gateway_provider = ec2.NatProvider.gateway()
+        else:
+            nat_gateway_provider = None
 
         jw_app_vpc = ec2.Vpc(
             self,
             id='JwAppVpc',
             vpc_name='JwAppVpc',
-            cidr=config.get('jw_app', 'vpc_cidr'),
-            nat_gateway_provider=ec2.NatProvider.instance(
-                instance_type=ec2.InstanceType('t2.nano')
-            ),
-            nat_gateways=1,
-            max_azs=2,
+            cidr=settings.vpc_cidr,
+            nat_gateway_provider=nat_gateway_provider,
+            nat_gateways=settings.max_azs if nat_gateway_provider else 0,
+            max_azs=settings.max_azs,
             subnet_configuration=[
                 ec2.SubnetConfiguration(
                     name='JwPub',
@@ -34,7 +62,9 @@ class JwApp(Stack):
                 ),
                 ec2.SubnetConfiguration(
                     name='JwPri',
-                    subnet_type=ec2.SubnetType.PRIVATE_WITH_NAT,
+                    subnet_type=(
+                        ec2.SubnetType.PRIVATE_WITH_NAT if nat_gateway_provider else ec2.SubnetType.PRIVATE_ISOLATED
+                    ),
                     cidr_mask=20
                 )
             ]
@@ -60,3 +90,38 @@ class JwApp(Stack):
             peer=ec2.Peer.ipv4('0.0.0.0/0'),
             connection=ec2.Port.tcp(443)
         )
+
+        # ecr image pull, s3, logs, secrets manager 호출이 nat instance를 거치지 않도록 private subnet에 endpoint 추가
+        # (s3는 gateway endpoint: private route table에 route 추가 / 나머지는 interface endpoint: private subnet에 eni 생성)
+        private_subnets = ec2.SubnetSelection(subnet_group_name='JwPri')
+        interface_endpoints = [name for name in settings.vpc_endpoints if name in INTERFACE_ENDPOINTS]
+        if interface_endpoints:
+            jw_app_endpoint_sg = ec2.SecurityGroup(
+                self,
+                id='JwAppEndpointSg',
+                security_group_name='JwAppEndpointSg',
+                description='sg for JwApp interface vpc endpoints',
+                vpc=jw_app_vpc,
+                allow_all_outbound=False
+            )
+            jw_app_endpoint_sg.add_ingress_rule(
+                peer=ec2.Peer.ipv4(jw_app_vpc.vpc_cidr_block),
+                connection=ec2.Port.tcp(443)
+            )
+
+        for name in settings.vpc_endpoints:
+            if name in GATEWAY_ENDPOINTS:
+                jw_app_vpc.add_gateway_endpoint(
+                    endpoint_id(name),
+                    service=GATEWAY_ENDPOINTS[name],
+                    subnets=[private_subnets]
+                )
+            else:
+                jw_app_vpc.add_interface_endpoint(
+                    endpoint_id(name),
+                    service=INTERFACE_ENDPOINTS[name],
+                    subnets=private_subnets,
+                    security_groups=[jw_app_endpoint_sg],
+                    private_dns_enabled=True,
+                    open=False  # vpc cidr ingress는 JwAppEndpointSg에서 허용
+                )
@@ -0,0 +1,263 @@
+"""cloud assembly(cdk.out)의 stack 의존 관계대로 여러 stack을 동시에 배포
+manifest의 dependencies(add_dependency, cross-stack reference)와 template의 Fn::ImportValue로 DAG를 만들고,
+의존 stack이 끝난 stack부터 최대 -j개씩 `cdk deploy --app cdk.out --exclusively`로 배포한다.
+template / asset / template이 읽는 SSM parameter 값이 마지막 배포와 같은 stack은 배포하지 않는다. (iac_aws_cdk/deploy_state.py)
+끝나면 stack별 소요 시간과 critical path(가장 오래 걸린 의존 경로)를 출력한다.
+
+    $ cdk synth
+    $ python -m iac_aws_cdk.parallel_deploy [-j 4] [-s <stack명> ...] [--profile <프로필명>] [--dry-run]
+    $ python -m iac_aws_cdk.parallel_deploy --state s3://<bucket>/<key>.json [--force]
+"""
+import argparse
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from iac_aws_cdk.cloud_assembly import load_artifacts, load_template, stack_artifacts
+from iac_aws_cdk.deploy_state import SsmParameters, open_state, stack_fingerprints
+
+DEFAULT_ASSEMBLY_DIR = 'cdk.out'
+DEFAULT_MAX_WORKERS = 4
+
+DEPLOYED = 'deployed'
+UNCHANGED = 'unchanged'  # 마지막 배포와 같아서 배포하지 않음
+FAILED = 'failed'
+SKIPPED = 'skipped'  # 의존 stack이 실패해서 배포하지 않음
+
+
+class DeployError(RuntimeError):
+    """의존 관계에 순환이 있거나 stack 배포가 실패한 경우"""
+
+
+@dataclass(frozen=True)
+class StackNode:
+    name: str
+    template_file: str
+    environment: str
+    dependencies: Tuple[str, ...]
+
+
+class StackResult(NamedTuple):
+    status: str
+    started: float  # 배포 시작 후 경과 시간(초)
+    finished: float
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+def _walk_imports(value, names: set) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'Fn::ImportValue' and isinstance(item, str):
+                names.add(item)
+            else:
+                _walk_imports(item, names)
+    elif isinstance(value, list):
+        for item in value:
+            _walk_imports(item, names)
+
+
+def _exports_and_imports(template: Dict) -> Tuple[List[str], set]:
+    exports = [
+        output['Export']['Name'] for output in template.get('Outputs', {}).values()
+        if isinstance(output.get('Export', {}).get('Name'), str)
+    ]
+    imports: set = set()
+    _walk_imports(template.get('Resources', {}), imports)
+    return exports, imports
+
+
+def load_graph(assembly_dir: str = DEFAULT_ASSEMBLY_DIR) -> Dict[str, StackNode]:
+    """manifest.json의 stack artifact -> {stack명: StackNode} (asset manifest 등 stack이 아닌 의존은 제외)"""
+    stacks = stack_artifacts(load_artifacts(assembly_dir))
+
+    templates = {}
+    exporters: Dict[str, str] = {}
+    for name, artifact in stacks.items():
+        templates[name] = _exports_and_imports(load_template(assembly_dir, artifact))
+        for export_name in templates[name][0]:
+            exporters[export_name] = name
+
+    graph = {}
+    for name, artifact in stacks.items():
+        dependencies = {dependency for dependency in artifact.get('dependencies', []) if dependency in stacks}
+        # 직접 만든 export(CfnOutput export_name)를 import하는 경우도 의존으로 본다.
+        dependencies.update(exporters[import_name] for import_name in templates[name][1] if import_name in exporters)
+        dependencies.discard(name)
+        graph[name] = StackNode(
+            name=name,
+            template_file=artifact['properties']['templateFile'],
+            environment=artifact.get('environment', ''),
+            dependencies=tuple(sorted(dependencies))
+        )
+    return graph
+
+
+def select(graph: Dict[str, StackNode], names: Optional[Iterable[str]] = None) -> Dict[str, StackNode]:
+    """요청한 stack + 의존 stack (names가 없으면 전체)"""
+    if not names:
+        return dict(graph)
+    unknown = sorted(set(names) - set(graph))
+    if unknown:
+        raise DeployError(f'unknown stacks: {", ".join(unknown)} (available: {", ".join(graph)})')
+    needed: set = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(graph[name].dependencies)
+    return {name: node for name, node in graph.items() if name in needed}
+
+
+def waves(graph: Dict[str, StackNode]) -> List[List[str]]:
+    """동시에 배포할 수 있는 stack 묶음 (topological order). 순환이 있으면 DeployError"""
+    remaining = {name: set(node.dependencies) & set(graph) for name, node in graph.items()}
+    result = []
+    while remaining:
+        ready = sorted(name for name, dependencies in remaining.items() if not dependencies)
+        if not ready:
+            raise DeployError(f'dependency cycle between stacks: {", ".join(sorted(remaining))}')
+        result.append(ready)
+        for name in ready:
+            del remaining[name]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+    return result
+
+
+class CdkDeployer:
+    """stack 하나를 cdk CLI로 배포 (synth된 assembly를 그대로 사용, 의존 stack은 다시 배포하지 않음)"""
+
+    def __init__(self, assembly_dir: str = DEFAULT_ASSEMBLY_DIR, profile: Optional[str] = None) -> None:
+        self.assembly_dir = assembly_dir
+        self.profile = profile
+
+    def deploy(self, node: StackNode) -> None:
+        command = ['cdk', 'deploy', node.name, '--app', self.assembly_dir, '--exclusively',
+                   '--require-approval', 'never', '--progress', 'events']
+        if self.profile:
+            command += ['--profile', self.profile]
+        # 동시에 실행되므로 출력은 stack별로 모아서 실패할 때만 보여준다.
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise DeployError('\n'.join((result.stdout + result.stderr).strip().splitlines()[-20:]))
+
+
+def deploy_all(graph: Dict[str, StackNode], deployer, max_workers: int = DEFAULT_MAX_WORKERS,
+               log=print, unchanged: Iterable[str] = (),
+               on_deployed: Optional[Callable[[str], None]] = None) -> Dict[str, StackResult]:
+    """의존 stack이 모두 배포된 stack부터 최대 max_workers개씩 동시에 배포
+    unchanged: deployer를 호출하지 않고 배포된 것으로 보는 stack, on_deployed: 배포가 끝난 stack마다 호출
+    """
+    waves(graph)  # 순환 검사
+    unchanged = set(unchanged)
+    start = time.monotonic()
+    results: Dict[str, StackResult] = {}
+    running: Dict[Future, Tuple[str, float]] = {}
+
+    def _elapsed() -> float:
+        return time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(results) < len(graph):
+            for name, node in graph.items():
+                if name in results or name in {running_name for running_name, _ in running.values()}:
+                    continue
+                statuses = [results.get(dependency, StackResult('', 0, 0)).status
+                            for dependency in node.dependencies if dependency in graph]
+                if any(status in (FAILED, SKIPPED) for status in statuses):
+                    results[name] = StackResult(SKIPPED, _elapsed(), _elapsed())
+                    log(f'[{_elapsed():7.1f}s] {name}: skipped (dependency failed)')
+                elif not all(status in (DEPLOYED, UNCHANGED) for status in statuses):
+                    continue
+                elif name in unchanged:
+                    results[name] = StackResult(UNCHANGED, _elapsed(), _elapsed())
+                    log(f'[{_elapsed():7.1f}s] {name}: unchanged')
+                elif len(running) < max_workers:
+                    log(f'[{_elapsed():7.1f}s] {name}: deploying')
+                    running[executor.submit(deployer.deploy, node)] = (name, _elapsed())
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, started = running.pop(future)
+                error = future.exception()
+                results[name] = StackResult(FAILED if error else DEPLOYED, started, _elapsed(),
+                                            str(error) if error else None)
+                log(f'[{_elapsed():7.1f}s] {name}: {results[name].status} ({results[name].duration:.1f}s)')
+                if not error and on_deployed:
+                    on_deployed(name)
+    return {name: results[name] for name in graph}
+
+
+def critical_path(graph: Dict[str, StackNode], results: Dict[str, StackResult]) -> List[str]:
+    """소요 시간 합이 가장 큰 의존 경로 (worker가 충분해도 이 시간보다 빨리 끝날 수 없다)"""
+    longest: Dict[str, Tuple[float, List[str]]] = {}
+    for wave in waves(graph):
+        for name in wave:
+            before = max((longest[dependency] for dependency in graph[name].dependencies if dependency in graph),
+                         key=lambda item: item[0], default=(0.0, []))
+            longest[name] = (before[0] + results[name].duration, before[1] + [name])
+    if not longest:
+        return []
+    return max(longest.values(), key=lambda item: item[0])[1]
+
+
+def report(graph: Dict[str, StackNode], results: Dict[str, StackResult]) -> str:
+    lines = [f'{"stack":<24} {"status":<9} {"start":>8} {"duration":>9}']
+    for name, result in sorted(results.items(), key=lambda item: item[1].started):
+        lines.append(f'{name:<24} {result.status:<9} {result.started:7.1f}s {result.duration:8.1f}s')
+    wall = max((result.finished for result in results.values()), default=0.0)
+    serial = sum(result.duration for result in results.values())
+    path = critical_path(graph, results)
+    lines.append('')
+    lines.append(f'wall time {wall:.1f}s, serial {serial:.1f}s')
+    lines.append(f'critical path {sum(results[name].duration for name in path):.1f}s: '
+                 + ' -> '.join(f'{name} ({results[name].duration:.1f}s)' for name in path))
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-a', '--app', default=DEFAULT_ASSEMBLY_DIR, help='synth된 cloud assembly 디렉토리')
+    parser.add_argument('-j', '--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument('-s', '--stack', action='append', dest='stacks', help='stack명 (의존 stack 포함, 기본값 전체)')
+    parser.add_argument('--profile')
+    parser.add_argument('--dry-run', action='store_true', help='배포 순서(wave)만 출력')
+    parser.add_argument('--state', help='마지막 배포 기록 (파일 경로 또는 s3://<bucket>/<key>, 기본값 .cdk-deploy-state.json)')
+    parser.add_argument('--force', action='store_true', help='바뀌지 않은 stack도 배포')
+    args = parser.parse_args(argv)
+
+    try:
+        graph = select(load_graph(args.app), args.stacks)
+        fingerprints = stack_fingerprints(args.app, SsmParameters(args.profile))
+        state = open_state(args.state)
+        unchanged = set() if args.force else set(state.unchanged({name: fingerprints[name] for name in graph}))
+        if args.dry_run:
+            for index, wave in enumerate(waves(graph), 1):
+                print(f'wave {index}: ' + ', '.join(f'{name} (unchanged)' if name in unchanged else name
+                                                    for name in wave))
+            return 0
+        results = deploy_all(graph, CdkDeployer(args.app, args.profile), args.max_workers,
+                             unchanged=unchanged, on_deployed=lambda name: state.record(name, fingerprints[name]))
+    except DeployError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    print()
+    print(report(graph, results))
+    failed = [name for name, result in results.items() if result.status == FAILED]
+    for name in failed:
+        print(f'\n{name} failed:\n{results[name].error}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,81 +1,129 @@
-from configparser import ConfigParser
 from aws_cdk import (
+    CfnOutput,
+    Duration,
     Stack,
+    aws_autoscaling as autoscaling,
     aws_ec2 as ec2,
     aws_elasticloadbalancingv2 as elbv2,
     aws_elasticloadbalancingv2_targets as elasticloadbalancingv2_targets
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.cache_cluster import CacheCluster
+from iac_aws_cdk.settings import settings_for
+from iac_aws_cdk.wordpress_cdn import WordPressCdn
 
 
 class PubEc2Test(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).pub_ec2_test
 
         jw_app_vpc = ec2.Vpc.from_lookup(
             self,
             id='JwAppVpc',
-            vpc_id=config.get('pub_ec2_test', 'jw_app_vpc')
+            vpc_id=settings.jw_app_vpc
         )
 
         jw_app_pub_subnet1 = ec2.Subnet.from_subnet_attributes(
             self,
             id='JwAppPubSubnet1',
-            subnet_id=config.get('pub_ec2_test', 'jw_app_pub_subnet1'),
-            availability_zone=config.get('pub_ec2_test', 'az1')
+            subnet_id=settings.jw_app_pub_subnet1,
+            availability_zone=settings.az1
         )
 
         jw_app_pub_subnet2 = ec2.Subnet.from_subnet_attributes(
             self,
             id='JwAppPubSubnet2',
-            subnet_id=config.get('pub_ec2_test', 'jw_app_pub_subnet2'),
-            availability_zone=config.get('pub_ec2_test', 'az2')
+            subnet_id=settings.jw_app_pub_subnet2,
+            availability_zone=settings.az2
         )
 
         jw_app_sg = ec2.SecurityGroup.from_security_group_id(
             self,
             id='JwAppSg',
-            security_group_id=config.get('pub_ec2_test', 'jw_app_sg')
+            security_group_id=settings.jw_app_sg
         )
 
-        # word_press_pub_ec2_user_data = ec2.UserData.for_linux()
-        # word_press_pub_ec2_user_data.add_commands(
-        #     'sudo yum install -y httpd mariadb-server'
-        # )
-
-        word_press_pub_ec2 = ec2.Instance(
-            self,
-            id='WordpressPubEc2',
-            instance_name='WordpressPubEc2',
-            machine_image=ec2.AmazonLinuxImage(
+        # WordPressImage stack의 AMI에는 user data script의 설치 과정이 이미 들어 있다.
+        if settings.ami_id:
+            word_press_machine_image = ec2.MachineImage.generic_linux({settings.aws_region: settings.ami_id})
+        elif settings.ami_from_ssm:
+            # 배포 시점에 cloudformation parameter로 SSM 값을 읽는다.
+            word_press_machine_image = ec2.MachineImage.from_ssm_parameter(
+                settings.image_ssm_parameter,
+                os=ec2.OperatingSystemType.LINUX
+            )
+        else:
+            word_press_machine_image = ec2.AmazonLinuxImage(
                 generation=ec2.AmazonLinuxGeneration.AMAZON_LINUX_2
-            ),
-            instance_type=ec2.InstanceType.of(
-                instance_class=ec2.InstanceClass.BURSTABLE2,
-                instance_size=ec2.InstanceSize.MICRO
-            ),
-            vpc=jw_app_vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnets=[
-                    jw_app_pub_subnet1
-                ]
-            ),
-            security_group=jw_app_sg,
+            )
+        baked_image = bool(settings.ami_id or settings.ami_from_ssm)
 
-            # aws console에서 생성 후 keypair 다운로드
-            # local dir ~/.ssh이동
-            # chmod 400
-            key_name=config.get('pub_ec2_test', 'word_press_pub_ec2_key'),
+        # instance / launch template 공통 user data
+        word_press_user_data = ec2.UserData.for_linux()
+        if not baked_image:
+            with open(settings.word_press_pub_ec2_user_data_script, 'r') as stream:
+                word_press_user_data.add_commands(stream.read())
 
-            # user_data=word_press_pub_ec2_user_data  # user_data를 여기에 추가하는 방법도 있다.
+        if settings.cache:
+            # private subnet (nat_mode=none이면 isolated subnet)
+            cache_subnets = jw_app_vpc.private_subnets or jw_app_vpc.isolated_subnets
+            word_press_cache = CacheCluster(
+                self,
+                'WordPressCache',
+                settings=settings,
+                vpc_id=jw_app_vpc.vpc_id,
+                subnet_ids=[subnet.subnet_id for subnet in cache_subnets],
+                client_security_group_id=jw_app_sg.security_group_id
+            )
+            # php(apache)에서 getenv('CACHE_HOST')로 읽는다. (eg. redis object cache plugin 설정)
+            cache_environment = word_press_cache.environment()
+            word_press_user_data.add_commands(
+                *[f'echo "{name}={value}" >> /etc/environment' for name, value in cache_environment.items()],
+                *[f'echo "SetEnv {name} {value}" >> /etc/httpd/conf.d/cache.conf' for name, value in cache_environment.items()],
+                'systemctl restart httpd'
+            )
+
+        word_press_instance_type = ec2.InstanceType.of(
+            instance_class=ec2.InstanceClass.BURSTABLE2,
+            instance_size=ec2.InstanceSize.MICRO
         )
 
-        with open(config.get('pub_ec2_test', 'word_press_pub_ec2_user_data_script'), 'r') as stream:
-            user_data = stream.read()
-        word_press_pub_ec2.add_user_data(user_data)
+        word_press_targets = []
+        word_press_asg = None
+        if settings.web_tier == 'asg':
+            word_press_asg = self._word_press_asg(
+                settings, jw_app_vpc, [jw_app_pub_subnet1, jw_app_pub_subnet2], jw_app_sg,
+                word_press_machine_image, word_press_instance_type, word_press_user_data
+            )
+        else:
+            word_press_pub_ec2 = ec2.Instance(
+                self,
+                id='WordpressPubEc2',
+                instance_name='WordpressPubEc2',
+                machine_image=word_press_machine_image,
+                instance_type=word_press_instance_type,
+                vpc=jw_app_vpc,
+                vpc_subnets=ec2.SubnetSelection(
+                    subnets=[
+                        jw_app_pub_subnet1
+                    ]
+                ),
+                security_group=jw_app_sg,
+
+                # aws console에서 생성 후 keypair 다운로드
+                # local dir ~/.ssh이동
+                # chmod 400
+                key_name=settings.word_press_pub_ec2_key,
+
+                user_data=word_press_user_data
+            )
+            word_press_targets.append(
+                elasticloadbalancingv2_targets.InstanceTarget(
+                    word_press_pub_ec2
+                )
+            )
 
         # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_elasticloadbalancingv2/ApplicationLoadBalancer.html
         word_press_alb = elbv2.ApplicationLoadBalancer(
@@ -101,11 +149,7 @@ class PubEc2Test(Stack):
             target_group_name='WordPressTargetGroup',
             # ecs경우에는 IP로 설정후, 아래의 targets param은 없고, 따로 ecs service를 target에 추가했다.
             target_type=elbv2.TargetType.INSTANCE,
-            targets=[
-                elasticloadbalancingv2_targets.InstanceTarget(
-                    word_press_pub_ec2
-                )
-            ],
+            targets=word_press_targets,  # asg인 경우 아래에서 attach
             vpc=jw_app_vpc,
             port=80,
             protocol=elbv2.ApplicationProtocol.HTTP,  # Determined from port if known
@@ -126,4 +170,71 @@ class PubEc2Test(Stack):
             default_target_groups=[
                 word_press_target_group
             ]  # Cannot be specified together with defaultAction.
-        )
\ No newline at end of file
+        )
+
+        if word_press_asg:
+            word_press_asg.attach_to_application_target_group(word_press_target_group)
+            # target(instance) 하나당 분당 요청 수 (ALBRequestCountPerTarget) 기준 target tracking
+            word_press_asg.scale_on_request_count(
+                'RequestCountPerTarget',
+                target_requests_per_minute=settings.asg_requests_per_target_per_minute,
+                estimated_instance_warmup=Duration.minutes(5)
+            )
+
+        if settings.cdn:
+            word_press_cdn = WordPressCdn(
+                self,
+                'WordPressCdn',
+                settings=settings,
+                load_balancer=word_press_alb
+            )
+            CfnOutput(
+                self,
+                'WordPressCdnDomain',
+                value=word_press_cdn.domain_name
+            )
+
+    def _word_press_asg(self, settings, vpc: ec2.IVpc, subnets, security_group: ec2.ISecurityGroup,
+                        machine_image: ec2.IMachineImage, instance_type: ec2.InstanceType,
+                        user_data: ec2.UserData) -> autoscaling.AutoScalingGroup:
+        """단일 instance 대신 launch template + auto scaling group (public subnet 2개)"""
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_ec2/LaunchTemplate.html
+        word_press_launch_template = ec2.LaunchTemplate(
+            self,
+            id='WordPressLaunchTemplate',
+            launch_template_name='WordPressLaunchTemplate',
+            machine_image=machine_image,
+            instance_type=instance_type,
+            security_group=security_group,
+            key_name=settings.word_press_pub_ec2_key,
+            user_data=user_data
+        )
+
+        # https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_autoscaling/AutoScalingGroup.html
+        word_press_asg = autoscaling.AutoScalingGroup(
+            self,
+            id='WordPressAsg',
+            vpc=vpc,
+            vpc_subnets=ec2.SubnetSelection(subnets=subnets),
+            launch_template=word_press_launch_template,
+            min_capacity=settings.asg_min_size,
+            max_capacity=settings.asg_max_size,
+            # user data(yum install)가 끝나기 전에는 alb health check가 실패하므로 grace period를 둔다.
+            health_check=autoscaling.HealthCheck.elb(grace=Duration.minutes(5)),
+            # launch template(user data / ami)이 바뀌면 instance를 batch 단위로 교체 (cloudformation rolling update)
+            update_policy=autoscaling.UpdatePolicy.rolling_update(
+                max_batch_size=settings.asg_refresh_batch_size,
+                # max_size보다 작아야 교체할 instance를 띄울 수 있다. (min == max이면 cloudformation update 실패)
+                min_instances_in_service=min(settings.asg_min_size, settings.asg_max_size - 1),
+                pause_time=Duration.minutes(5)
+            )
+        )
+
+        # user data를 미리 실행해둔 instance를 pool에 두고 scale out 시 바로 투입
+        # https://docs.aws.amazon.com/autoscaling/ec2/userguide/ec2-auto-scaling-warm-pools.html
+        if settings.asg_warm_pool_size:
+            word_press_asg.add_warm_pool(
+                min_size=settings.asg_warm_pool_size,
+                pool_state=getattr(autoscaling.PoolState, settings.asg_warm_pool_state.upper())
+            )
+        return word_press_asg
@@ -1,4 +1,3 @@
-from configparser import ConfigParser
 from aws_cdk import (
     Stack,
     aws_s3 as s3,
@@ -7,12 +6,12 @@ from aws_cdk import (
 )
 from constructs import Construct
 
-config = ConfigParser()
-config.read('config/prod.ini')
+from iac_aws_cdk.settings import settings_for
 
 class S3ObjUpload(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).s3_obj_upload
         # https://docs.aws.amazon.com/AmazonS3/latest/userguide/bucketnamingrules.html
         s3_obj_upload_bucket = s3.Bucket(
             self,
@@ -55,11 +54,11 @@ class S3ObjUpload(Stack):
         ecr.Repository(
             self,
             id='WebServiceRepo',
-            repository_name=config.get('s3_obj_upload', 'ecr_repo_web_service')  # repo name은 대문자 사용 불가능
+            repository_name=settings.ecr_repo_web_service  # repo name은 대문자 사용 불가능
         )
 
         ecr.Repository(
             self,
             id='WebFrameworkRepo',
-            repository_name=config.get('s3_obj_upload', 'ecr_repo_web_framework')  # repo name은 대문자 사용 불가능
+            repository_name=settings.ecr_repo_web_framework  # repo name은 대문자 사용 불가능
         )
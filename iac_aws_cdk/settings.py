@@ -0,0 +1,584 @@
+"""config/<env>.ini 설정값
+ini 파일은 환경(prod/stage/dev)별로 한 번만 읽고, section별 frozen dataclass로 변환한다.
+`config/prod.ini.default`에 선언된 section/key는 construct를 만들기 전에 한 번에 검사한다.
+
+환경 선택 (우선순위 순)
+    -c config=<ini 경로>  /  CDK_CONFIG=<ini 경로>
+    -c env=stage          /  CDK_ENV=stage           -> config/stage.ini
+    (기본값)                                          -> config/prod.ini
+"""
+import os
+import typing
+from configparser import ConfigParser
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import ClassVar, Dict, List, NamedTuple, Optional, Tuple
+
+from constructs import Construct
+
+from iac_aws_cdk.eb_capacity import EbCapacityProfile
+
+CONFIG_DIR = 'config'
+DEFAULT_ENV = 'prod'
+CONFIG_CONTEXT_KEY = 'config'
+CONFIG_ENV_VAR = 'CDK_CONFIG'
+ENV_CONTEXT_KEY = 'env'
+ENV_ENV_VAR = 'CDK_ENV'
+
+
+class SettingsError(ValueError):
+    """ini 파일이 없거나 section/key가 빠졌거나 값을 변환할 수 없는 경우"""
+
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def _convert(raw: str, type_):
+    if type_ is bool:
+        value = raw.strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+        raise ValueError(f'not a boolean: {raw!r}')
+    if type_ in (int, float):
+        return type_(raw)
+    if hasattr(type_, 'parse'):
+        return type_.parse(raw)
+    if typing.get_origin(type_) is tuple:
+        item_type = typing.get_args(type_)[0]
+        return tuple(_convert(item.strip(), item_type) for item in raw.split(',') if item.strip())
+    return raw
+
+
+class CapacityProviderWeight(NamedTuple):
+    """ecs capacity provider strategy 항목. ini에는 <provider>:<weight>[:<base>] 형태 (eg. FARGATE_SPOT:3)"""
+    provider: str
+    weight: int
+    base: int = 0
+
+    PROVIDERS = ('FARGATE', 'FARGATE_SPOT')
+
+    @classmethod
+    def parse(cls, raw: str) -> 'CapacityProviderWeight':
+        parts = [part.strip() for part in raw.split(':')]
+        if len(parts) not in (2, 3) or parts[0] not in cls.PROVIDERS:
+            raise ValueError(f'{raw!r} is not <{"|".join(cls.PROVIDERS)}>:<weight>[:<base>]')
+        return cls(parts[0], *(int(part) for part in parts[1:]))
+
+
+class SecretEnv(NamedTuple):
+    """container에 주입할 secret 환경변수. ini에는 <환경변수>=<secret name>[:<json key>] 형태 (eg. DB_PASSWORD=MyTestSecret:password)"""
+    env_name: str
+    secret_name: str
+    field: str = ''
+
+    @classmethod
+    def parse(cls, raw: str) -> 'SecretEnv':
+        env_name, _, source = (part.strip() for part in raw.partition('='))
+        secret_name, _, field = (part.strip() for part in source.partition(':'))
+        if not env_name or not secret_name:
+            raise ValueError(f'{raw!r} is not <env name>=<secret name>[:<json key>]')
+        return cls(env_name, secret_name, field)
+
+
+@dataclass(frozen=True)
+class SectionSettings:
+    """section 하나. field가 ini key이며, OPTIONAL에 있는 key는 생략 가능 (값은 ini 문자열 형태)
+    CHOICES에 있는 key는 나열된 값만 허용한다.
+    """
+    __slots__ = ()
+    OPTIONAL: ClassVar[Dict[str, str]] = {}
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    @classmethod
+    def from_section(cls, section: str, values: Dict[str, str], errors: List[str]):
+        hints = typing.get_type_hints(cls)
+        kwargs = {}
+        for field in fields(cls):
+            raw = values.get(field.name, '').strip()
+            if not raw:
+                if field.name not in cls.OPTIONAL:
+                    errors.append(f'[{section}] {field.name} is missing or empty')
+                    continue
+                raw = cls.OPTIONAL[field.name]
+            try:
+                value = _convert(raw, hints[field.name])
+            except ValueError as e:
+                errors.append(f'[{section}] {field.name}: {e}')
+                continue
+            if field.name in cls.CHOICES:
+                choices = cls.CHOICES[field.name]
+                invalid = [item for item in (value if isinstance(value, tuple) else (value,)) if item not in choices]
+                if invalid:
+                    errors.append(f'[{section}] {field.name}: {", ".join(map(repr, invalid))} is not one of {", ".join(choices)}')
+                    continue
+            kwargs[field.name] = value
+        if len(kwargs) != len(fields(cls)):
+            return None
+        settings = cls(**kwargs)
+        errors.extend(f'[{section}] {error}' for error in settings.validate())
+        return settings
+
+    def validate(self) -> List[str]:
+        """key 사이의 조건 검사 (문제 목록 반환)"""
+        return []
+
+
+@dataclass(frozen=True)
+class AwsEnvSettings(SectionSettings):
+    __slots__ = ('aws_account', 'aws_region')
+    aws_account: str
+    aws_region: str
+
+
+# fargate task cpu -> 가능한 memory(MiB)
+# https://docs.aws.amazon.com/AmazonECS/latest/developerguide/task-cpu-memory-error.html
+FARGATE_MEMORY_MIB: Dict[int, Tuple[int, ...]] = {
+    256: (512, 1024, 2048),
+    512: tuple(range(1024, 4096 + 1, 1024)),
+    1024: tuple(range(2048, 8192 + 1, 1024)),
+    2048: tuple(range(4096, 16384 + 1, 1024)),
+    4096: tuple(range(8192, 30720 + 1, 1024)),
+    8192: tuple(range(16384, 61440 + 1, 4096)),
+    16384: tuple(range(32768, 122880 + 1, 8192)),
+}
+
+
+@dataclass(frozen=True)
+class EcsTaskSettings(AwsEnvSettings):
+    __slots__ = (
+        'aws_profile', 'vpc_id', 'vpc_subnet', 'sg_id', 'ecr_repo', 'ecs_container',
+        'task_cpu', 'task_memory_mib', 'task_ephemeral_storage_gib', 'task_cpu_architecture',
+        'capacity_provider_strategy', 'mode', 'worker_max_tasks', 'worker_messages_per_task',
+        'worker_max_message_age_seconds', 'secrets', 'secret_cache_ttl_seconds'
+    )
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        'aws_profile': 'default',
+        'task_cpu': '256',
+        'task_memory_mib': '512',
+        'task_ephemeral_storage_gib': '0',
+        'task_cpu_architecture': 'x86_64',
+        'capacity_provider_strategy': '',
+        'mode': 'cron',
+        'worker_max_tasks': '10',
+        'worker_messages_per_task': '100',
+        'worker_max_message_age_seconds': '300',
+        'secrets': '',
+        'secret_cache_ttl_seconds': '0',
+    }
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'task_cpu_architecture': ('x86_64', 'arm64'),
+        'mode': ('cron', 'queue'),
+    }
+    aws_profile: str
+    vpc_id: str
+    vpc_subnet: str
+    sg_id: str
+    ecr_repo: str
+    ecs_container: str
+    # fargate cpu/memory 조합만 가능 (FARGATE_MEMORY_MIB)
+    task_cpu: int
+    task_memory_mib: int
+    task_ephemeral_storage_gib: int  # 0: fargate 기본값(20GiB), 21~200
+    task_cpu_architecture: str
+    # 비어 있으면 launch type FARGATE. eg. FARGATE:1:1,FARGATE_SPOT:3 -> 1개는 FARGATE, 나머지는 1:3 비율
+    capacity_provider_strategy: Tuple[CapacityProviderWeight, ...]
+    # cron: 2분마다 task 1개 실행 / queue: sqs 작업 queue + queue 길이에 따라 scaling하는 service
+    mode: str
+    worker_max_tasks: int
+    worker_messages_per_task: int  # task 하나가 맡는 message 수 (scale out 기준)
+    worker_max_message_age_seconds: int  # 가장 오래된 message가 이보다 오래되면 backlog를 2배로 보고 task 추가
+    # task 시작할 때 ecs가 secrets manager 값을 환경변수로 주입 (eg. DB_USER=MyTestSecret:username,DB_PASSWORD=MyTestSecret:password)
+    secrets: Tuple[SecretEnv, ...]
+    # queue mode(service)에서 task가 오래 실행되는 경우 이 시간(초)이 지나면 secret을 다시 읽는다. (scripts/ecs/secret_cache.py, 0이면 사용 안 함)
+    secret_cache_ttl_seconds: int
+
+    def validate(self) -> List[str]:
+        errors = []
+        if self.task_cpu not in FARGATE_MEMORY_MIB:
+            errors.append(f'task_cpu {self.task_cpu} is not a fargate cpu ({", ".join(map(str, FARGATE_MEMORY_MIB))})')
+        elif self.task_memory_mib not in FARGATE_MEMORY_MIB[self.task_cpu]:
+            memory = FARGATE_MEMORY_MIB[self.task_cpu]
+            allowed = (', '.join(map(str, memory)) if len(memory) <= 4
+                       else f'{memory[0]}~{memory[-1]} step {memory[1] - memory[0]}')
+            errors.append(f'task_memory_mib {self.task_memory_mib} is not valid with task_cpu {self.task_cpu} ({allowed})')
+        if self.secret_cache_ttl_seconds and self.mode != 'queue':
+            errors.append('secret_cache_ttl_seconds is only used in queue mode')
+        if self.secret_cache_ttl_seconds and not self.secrets:
+            errors.append('secret_cache_ttl_seconds requires secrets')
+        return errors
+
+
+@dataclass(frozen=True)
+class JwAppSettings(AwsEnvSettings):
+    __slots__ = ('vpc_cidr', 'max_azs', 'nat_mode', 'nat_instance_type', 'vpc_endpoints')
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        'max_azs': '2',
+        'nat_mode': 'instance',
+        'nat_instance_type': 't2.nano',
+        'vpc_endpoints': '',
+    }
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'nat_mode': ('instance', 'gateway', 'none'),
+        'vpc_endpoints': ('s3', 'ecr.api', 'ecr.dkr', 'logs', 'secretsmanager'),
+    }
+    vpc_cidr: str
+    max_azs: int
+    # instance: az별 nat instance / gateway: az별 nat gateway / none: nat 없음 (private subnet은 isolated)
+    nat_mode: str
+    nat_instance_type: str
+    vpc_endpoints: Tuple[str, ...]  # private subnet에서 nat를 거치지 않고 접근할 aws service
+
+
+# iac_aws_cdk.cache_cluster.CacheCluster를 사용하는 section의 공통 key
+CACHE_SLOTS = ('cache', 'cache_engine', 'cache_node_type', 'cache_replicas')
+CACHE_OPTIONAL: Dict[str, str] = {
+    'cache': 'false',
+    'cache_engine': 'redis',
+    'cache_node_type': 'cache.t4g.micro',
+    'cache_replicas': '0',
+}
+CACHE_CHOICES: Dict[str, Tuple[str, ...]] = {'cache_engine': ('redis', 'valkey')}
+
+
+@dataclass(frozen=True)
+class PubEc2TestSettings(AwsEnvSettings):
+    __slots__ = (
+        'az1', 'az2', 'jw_app_vpc', 'jw_app_pub_subnet1', 'jw_app_pub_subnet2', 'jw_app_sg',
+        'word_press_pub_ec2_key', 'word_press_pub_ec2_user_data_script', *CACHE_SLOTS,
+        'cdn', 'cdn_static_ttl_days', 'cdn_origin_shield_region', 'cdn_price_class',
+        'web_tier', 'asg_min_size', 'asg_max_size', 'asg_requests_per_target_per_minute',
+        'asg_warm_pool_size', 'asg_warm_pool_state', 'asg_refresh_batch_size',
+        'ami_id', 'ami_from_ssm', 'image_parent_image', 'image_instance_types', 'image_subnet',
+        'image_security_group', 'image_ssm_parameter', 'image_schedule'
+    )
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        **CACHE_OPTIONAL,
+        'cdn': 'false',
+        'cdn_static_ttl_days': '365',
+        'cdn_origin_shield_region': '',
+        'cdn_price_class': '100',
+        'web_tier': 'instance',
+        'asg_min_size': '1',
+        'asg_max_size': '4',
+        'asg_requests_per_target_per_minute': '1000',
+        'asg_warm_pool_size': '0',
+        'asg_warm_pool_state': 'stopped',
+        'asg_refresh_batch_size': '1',
+        'ami_id': '',
+        'ami_from_ssm': 'false',
+        'image_parent_image': 'amazon-linux-2-x86',
+        'image_instance_types': 't3.small',
+        'image_subnet': '',
+        'image_security_group': '',
+        'image_ssm_parameter': '/imagebuilder/word-press/ami-id',
+        'image_schedule': '',
+    }
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        **CACHE_CHOICES,
+        'cdn_price_class': ('100', '200', 'All'),
+        'web_tier': ('instance', 'asg'),
+        'asg_warm_pool_state': ('stopped', 'running', 'hibernated'),
+    }
+    az1: str
+    az2: str
+    jw_app_vpc: str
+    jw_app_pub_subnet1: str
+    jw_app_pub_subnet2: str
+    jw_app_sg: str
+    word_press_pub_ec2_key: str
+    word_press_pub_ec2_user_data_script: str
+    # jw app vpc private subnet에 elasticache 생성 (endpoint는 user data에서 환경변수로 설정)
+    cache: bool
+    cache_engine: str
+    cache_node_type: str
+    cache_replicas: int
+    # WordPressAlb 앞에 cloudfront 생성 (정적 파일 edge cache)
+    cdn: bool
+    cdn_static_ttl_days: int  # 최소 1
+    cdn_origin_shield_region: str  # 비어 있으면 origin shield 없음 (eg. ap-northeast-2)
+    cdn_price_class: str
+    # instance: WordpressPubEc2 1개 / asg: launch template + auto scaling group
+    web_tier: str
+    asg_min_size: int
+    asg_max_size: int
+    asg_requests_per_target_per_minute: int
+    asg_warm_pool_size: int  # 0이면 warm pool 없음
+    asg_warm_pool_state: str
+    asg_refresh_batch_size: int  # launch template 변경 시 한 번에 교체할 instance 수
+    # WordPressImage stack으로 만든 AMI 사용 (ami_id > ami_from_ssm > AmazonLinuxImage + user data 설치)
+    ami_id: str
+    ami_from_ssm: bool  # image_ssm_parameter의 AMI id
+    # WordPressImage stack (EC2 Image Builder)
+    image_parent_image: str  # image builder image 이름(eg. amazon-linux-2-x86), ami-... 또는 arn
+    image_instance_types: Tuple[str, ...]
+    image_subnet: str  # 비어 있으면 default vpc
+    image_security_group: str
+    image_ssm_parameter: str  # image builder가 build마다 갱신 (/imagebuilder/ 아래만 가능)
+    image_schedule: str  # eg. cron(0 0 ? * sun *), 비어 있으면 수동 실행
+
+    def validate(self) -> List[str]:
+        errors = []
+        if not 1 <= self.asg_min_size <= self.asg_max_size:
+            errors.append(f'invalid asg_min_size/asg_max_size: {self.asg_min_size}/{self.asg_max_size}')
+        if self.asg_refresh_batch_size < 1:
+            errors.append('asg_refresh_batch_size must be positive')
+        if self.cdn_static_ttl_days < 1:
+            # StaticCachePolicy의 min_ttl이 1일이라 default/max ttl도 1일 이상이어야 한다.
+            errors.append(f'cdn_static_ttl_days must be at least 1: {self.cdn_static_ttl_days}')
+        if self.ami_id and not self.ami_id.startswith('ami-'):
+            errors.append(f'ami_id {self.ami_id!r} is not an ami id')
+        if not self.image_ssm_parameter.startswith('/imagebuilder/'):
+            errors.append(f'image_ssm_parameter {self.image_ssm_parameter!r} must start with /imagebuilder/')
+        return errors
+
+
+@dataclass(frozen=True)
+class S3ObjUploadSettings(AwsEnvSettings):
+    __slots__ = ('ecr_repo_web_service', 'ecr_repo_web_framework')
+    ecr_repo_web_service: str
+    ecr_repo_web_framework: str
+
+
+@dataclass(frozen=True)
+class BoxOfficeMojoSettings(AwsEnvSettings):
+    __slots__ = (
+        'crawl_mode', 'partition_projection', 'partition_projection_from',
+        'compaction_job', 'compaction_target_file_size_mb', 'athena_workgroups'
+    )
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        'crawl_mode': 'everything',
+        'partition_projection': 'false',
+        'partition_projection_from': '2020-01-01',
+        'compaction_job': 'false',
+        'compaction_target_file_size_mb': '128',
+        'athena_workgroups': 'AthenaTestWorkGroup',
+    }
+    # everything: 매번 전체 prefix crawl / event: s3 ObjectCreated event(sqs)로 들어온 object만 crawl
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {'crawl_mode': ('everything', 'event')}
+    crawl_mode: str
+    partition_projection: bool  # mojo/dt=yyyy-MM-dd/ partition을 projection으로 조회하는 table 생성
+    partition_projection_from: str
+    compaction_job: bool  # crawler 성공 후 csv -> parquet(curated/mojo) glue job 실행
+    compaction_target_file_size_mb: int
+    athena_workgroups: Tuple[str, ...]  # workgroup별 설정은 [athena_workgroup.<name>] section
+
+
+@dataclass(frozen=True)
+class AthenaWorkGroupSettings(SectionSettings):
+    """[athena_workgroup.<name>] section. section이 없으면 모두 기본값 (기존 AthenaTestWorkGroup과 같다)"""
+    __slots__ = (
+        'description', 'bytes_scanned_cutoff_mb', 'engine_version', 'enforce_configuration',
+        'result_reuse_max_age_minutes', 'result_prefix', 'result_expiration_days'
+    )
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        'description': '',
+        'bytes_scanned_cutoff_mb': '0',
+        'engine_version': 'none',
+        'enforce_configuration': 'false',
+        'result_reuse_max_age_minutes': '0',
+        'result_prefix': '',
+        'result_expiration_days': '0',
+    }
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {'engine_version': ('none', 'auto', '2', '3')}
+    description: str
+    bytes_scanned_cutoff_mb: int  # query 하나가 scan할 수 있는 최대 크기 (0: 제한 없음, 최소 10)
+    engine_version: str  # none: 지정하지 않음
+    # true이면 client가 workgroup 설정(cutoff, output location)을 덮어쓰지 못한다. (false: 지정하지 않음)
+    enforce_configuration: bool
+    # workgroup tag로만 남는 client(StartQueryExecution)용 값, athena가 적용하지 않는다. (0: 재사용 안함)
+    result_reuse_max_age_minutes: int
+    result_prefix: str  # query 결과 bucket 안의 prefix (비어 있으면 bucket root)
+    result_expiration_days: int  # result_prefix의 query 결과 보관 기간 (0: 만료 없음)
+
+    def validate(self) -> List[str]:
+        errors = []
+        if self.bytes_scanned_cutoff_mb and self.bytes_scanned_cutoff_mb < 10:
+            errors.append(f'bytes_scanned_cutoff_mb must be 0 or at least 10: {self.bytes_scanned_cutoff_mb}')
+        if self.result_expiration_days and not self.result_prefix.strip('/'):
+            # lifecycle rule은 prefix 단위라 bucket root면 다른 workgroup의 결과까지 만료된다.
+            errors.append('result_expiration_days requires result_prefix')
+        return errors
+
+
+@dataclass(frozen=True)
+class EbNetworkStackSettings(AwsEnvSettings):
+    __slots__ = ()
+
+
+@dataclass(frozen=True)
+class EbStackSettings(AwsEnvSettings):
+    """iac_aws_cdk.eb_capacity.EbCapacityProfile로 변환해서 사용"""
+    __slots__ = (
+        'instance_types', 'min_size', 'max_size', 'scaling_metric', 'scaling_upper_threshold',
+        'scaling_lower_threshold', 'scaling_breach_duration_minutes', 'deployment_batch_size',
+        'deployment_batch_size_type', 'health_reporting', 'db_proxy', 'db_proxy_require_tls',
+        'db_proxy_idle_client_timeout_seconds', 'db_proxy_max_connections_percent',
+        'db_proxy_max_idle_connections_percent', 'db_instance_class', 'db_storage_type',
+        'db_allocated_storage_gib', 'db_iops', 'db_storage_throughput', 'db_read_replicas',
+        'db_replica_instance_class', *CACHE_SLOTS, 'source_dir', 'source_excludes'
+    )
+    OPTIONAL: ClassVar[Dict[str, str]] = {
+        'instance_types': 't3.micro',
+        'min_size': '1',
+        'max_size': '4',
+        'scaling_metric': 'cpu',
+        'scaling_upper_threshold': '0',
+        'scaling_lower_threshold': '0',
+        'scaling_breach_duration_minutes': '5',
+        'deployment_batch_size': '30',
+        'deployment_batch_size_type': 'Percentage',
+        'health_reporting': 'basic',
+        'db_proxy': 'false',
+        'db_proxy_require_tls': 'false',
+        'db_proxy_idle_client_timeout_seconds': '1800',
+        'db_proxy_max_connections_percent': '90',
+        'db_proxy_max_idle_connections_percent': '50',
+        'db_instance_class': 'db.t2.micro',
+        'db_storage_type': 'gp2',
+        'db_allocated_storage_gib': '20',
+        'db_iops': '0',
+        'db_storage_throughput': '0',
+        'db_read_replicas': '0',
+        'db_replica_instance_class': 'db.t2.micro',
+        **CACHE_OPTIONAL,
+        'source_dir': '',
+        'source_excludes': '.git,.venv,__pycache__,*.pyc,.DS_Store',
+    }
+    CHOICES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'scaling_metric': ('cpu', 'latency', 'request_count'),
+        'deployment_batch_size_type': ('Percentage', 'Fixed'),
+        'health_reporting': ('basic', 'enhanced'),
+        'db_storage_type': ('gp2', 'gp3', 'io1', 'standard'),
+        **CACHE_CHOICES,
+    }
+    instance_types: Tuple[str, ...]  # 같은 architecture끼리만 (eg. t4g.small,m6g.medium)
+    min_size: int
+    max_size: int
+    scaling_metric: str
+    scaling_upper_threshold: float  # 0이면 metric별 기본값
+    scaling_lower_threshold: float
+    scaling_breach_duration_minutes: int
+    deployment_batch_size: int
+    deployment_batch_size_type: str
+    health_reporting: str  # enhanced이면 EbStack이 beanstalk service role을 만든다.
+    # true이면 db 앞에 RDS Proxy를 두고 eb 환경변수 DB_WRITER_HOST로 proxy endpoint를 전달
+    db_proxy: bool
+    db_proxy_require_tls: bool
+    db_proxy_idle_client_timeout_seconds: int
+    db_proxy_max_connections_percent: int  # db max_connections 중 proxy가 사용할 비율
+    db_proxy_max_idle_connections_percent: int
+    db_instance_class: str
+    # https://docs.aws.amazon.com/AmazonRDS/latest/UserGuide/CHAP_Storage.html
+    db_storage_type: str
+    db_allocated_storage_gib: int
+    db_iops: int  # 0이면 지정하지 않음 (io1은 필수, gp3는 선택)
+    db_storage_throughput: int  # MiB/s, gp3만 가능 (0이면 지정하지 않음)
+    db_read_replicas: int  # private subnet(az)에 번갈아 생성
+    db_replica_instance_class: str
+    # eb vpc private subnet에 elasticache 생성 (eb 환경변수 CACHE_HOST / CACHE_READER_HOST / CACHE_PORT)
+    cache: bool
+    cache_engine: str
+    cache_node_type: str
+    cache_replicas: int
+    # app source 디렉토리 (비어 있으면 project 밖의 ../aws_onboarding.zip 사용)
+    source_dir: str
+    source_excludes: Tuple[str, ...]  # 상대 경로 또는 파일/디렉토리 이름 glob
+
+    def validate(self) -> List[str]:
+        errors = EbCapacityProfile.from_settings(self).validate()
+        if self.db_storage_type == 'io1' and not self.db_iops:
+            errors.append('db_iops is required with db_storage_type=io1')
+        if self.db_iops and self.db_storage_type not in ('io1', 'gp3'):
+            errors.append(f'db_iops is not supported with db_storage_type={self.db_storage_type}')
+        if self.db_storage_throughput and self.db_storage_type != 'gp3':
+            errors.append('db_storage_throughput requires db_storage_type=gp3')
+        if self.db_read_replicas < 0:
+            errors.append('db_read_replicas must not be negative')
+        return errors
+
+
+@dataclass(frozen=True)
+class Settings:
+    """field명 = ini section명"""
+    __slots__ = (
+        'path', 'ecs_task', 'jw_app', 'pub_ec2_test', 's3_obj_upload', 'box_office_mojo',
+        'eb_network_stack', 'eb_stack', 'athena_workgroups'
+    )
+    path: str
+    ecs_task: EcsTaskSettings
+    jw_app: JwAppSettings
+    pub_ec2_test: PubEc2TestSettings
+    s3_obj_upload: S3ObjUploadSettings
+    box_office_mojo: BoxOfficeMojoSettings
+    eb_network_stack: EbNetworkStackSettings
+    eb_stack: EbStackSettings
+    athena_workgroups: Dict[str, AthenaWorkGroupSettings]
+
+    ATHENA_WORKGROUP_SECTION: ClassVar[str] = 'athena_workgroup.{}'
+
+    @classmethod
+    def sections(cls) -> Dict[str, type]:
+        """고정 section (athena_workgroup.<name> 처럼 이름이 설정값에 따라 바뀌는 section 제외)"""
+        hints = typing.get_type_hints(cls)
+        return {
+            field.name: hints[field.name] for field in fields(cls)
+            if isinstance(hints[field.name], type) and issubclass(hints[field.name], SectionSettings)
+        }
+
+    def section(self, name: str) -> AwsEnvSettings:
+        return getattr(self, name)
+
+
+def parse_settings(parser: ConfigParser, path: str) -> Settings:
+    """모든 section/key를 검사한 뒤 문제를 한 번에 SettingsError로 알린다."""
+    errors: List[str] = []
+    sections = {}
+    for name, section_cls in Settings.sections().items():
+        if not parser.has_section(name):
+            errors.append(f'[{name}] section is missing')
+            continue
+        sections[name] = section_cls.from_section(name, dict(parser.items(name)), errors)
+
+    athena_workgroups = {}
+    if sections.get('box_office_mojo'):
+        for workgroup in sections['box_office_mojo'].athena_workgroups:
+            name = Settings.ATHENA_WORKGROUP_SECTION.format(workgroup)
+            values = dict(parser.items(name)) if parser.has_section(name) else {}
+            athena_workgroups[workgroup] = AthenaWorkGroupSettings.from_section(name, values, errors)
+
+    if errors:
+        raise SettingsError(f'invalid config {path}:\n  ' + '\n  '.join(errors))
+    return Settings(path=path, athena_workgroups=athena_workgroups, **sections)
+
+
+@lru_cache(maxsize=None)
+def load_settings(path: str) -> Settings:
+    """path별로 한 번만 읽는다 (memoized)"""
+    parser = ConfigParser()
+    if not parser.read(path):
+        raise SettingsError(f'config file not found: {path} (copy config/prod.ini.default)')
+    return parse_settings(parser, path)
+
+
+def config_path(env: Optional[str] = None, path: Optional[str] = None) -> str:
+    if path:
+        return path
+    if os.environ.get(CONFIG_ENV_VAR):
+        return os.environ[CONFIG_ENV_VAR]
+    env = env or os.environ.get(ENV_ENV_VAR) or DEFAULT_ENV
+    return os.path.join(CONFIG_DIR, f'{env}.ini')
+
+
+def get_settings(env: Optional[str] = None, path: Optional[str] = None) -> Settings:
+    return load_settings(config_path(env, path))
+
+
+def settings_for(scope: Construct) -> Settings:
+    """app context(-c config=..., -c env=...)를 반영한 설정값"""
+    return get_settings(
+        env=scope.node.try_get_context(ENV_CONTEXT_KEY),
+        path=scope.node.try_get_context(CONFIG_CONTEXT_KEY)
+    )
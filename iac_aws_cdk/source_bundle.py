@@ -0,0 +1,143 @@
+"""elastic beanstalk source bundle (zip)을 디렉토리에서 직접 만든다.
+같은 tree면 항상 같은 zip(= 같은 asset hash)이 나오도록 entry 순서 / 시간 / 권한을 고정하고,
+파일별 digest manifest로 tree가 바뀌지 않았으면 zip을 다시 만들지 않는다.
+https://docs.aws.amazon.com/elasticbeanstalk/latest/dg/applications-sourcebundle.html
+
+bundle 위치: CDK_SOURCE_BUNDLE_DIR 또는 .cdk-source-bundle/ (cdk.out 옆)
+"""
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import stat
+import tempfile
+import zipfile
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from iac_aws_cdk.asset_cache import CHUNK_SIZE, file_sha256
+
+OUTPUT_DIR_ENV_VAR = 'CDK_SOURCE_BUNDLE_DIR'
+DEFAULT_OUTPUT_DIR = '.cdk-source-bundle'
+MANIFEST_FILE = 'manifest.json'
+# zip은 1980년 이전 시간을 저장할 수 없다.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# 완성된 bundle 이름 (만드는 중인 임시 파일은 .bundle-*.zip)
+_BUNDLE_NAME = re.compile(r'[0-9a-f]{64}\.zip')
+
+
+def bundle_dir() -> str:
+    return os.environ.get(OUTPUT_DIR_ENV_VAR) or DEFAULT_OUTPUT_DIR
+
+
+class SourceBundle(NamedTuple):
+    path: str
+    digest: str  # tree digest (= zip 내용이 같으면 같은 값)
+    rebuilt: bool
+
+
+def _excluded(relative_path: str, patterns: Iterable[str]) -> bool:
+    """pattern은 상대 경로 전체 또는 파일/디렉토리 이름과 비교 (eg. .git, *.pyc, static/cache/*)"""
+    name = relative_path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatchcase(relative_path, pattern) or fnmatch.fnmatchcase(name, pattern)
+               for pattern in patterns)
+
+
+def iter_files(source_dir: str, excludes: Iterable[str] = ()) -> Iterator[Tuple[str, str]]:
+    """(상대 경로(posix), 절대 경로)를 정렬된 순서로 반환. 제외된 디렉토리는 내려가지 않는다."""
+    excludes = tuple(excludes)
+    for root, dirs, files in os.walk(source_dir):
+        relative_root = os.path.relpath(root, source_dir).replace(os.sep, '/')
+        prefix = '' if relative_root == '.' else relative_root + '/'
+        dirs[:] = sorted(name for name in dirs if not _excluded(prefix + name, excludes))
+        for name in sorted(files):
+            if not _excluded(prefix + name, excludes):
+                yield prefix + name, os.path.join(root, name)
+
+
+def _load_manifest(path: str) -> Dict:
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return {}
+
+
+def scan(source_dir: str, excludes: Iterable[str] = (), previous: Optional[Dict] = None) -> Dict[str, Dict]:
+    """파일별 {size, mtime_ns, mode, sha256}. size/mtime이 이전 manifest와 같으면 sha256을 다시 계산하지 않는다."""
+    previous_files = (previous or {}).get('files', {})
+    files = {}
+    for relative_path, path in iter_files(source_dir, excludes):
+        file_stat = os.stat(path)
+        # 실행 권한만 유지 (umask / 소유자에 따라 zip이 달라지지 않도록)
+        mode = 0o755 if file_stat.st_mode & stat.S_IXUSR else 0o644
+        entry = {'size': file_stat.st_size, 'mtime_ns': file_stat.st_mtime_ns, 'mode': mode}
+        before = previous_files.get(relative_path)
+        if before and all(before.get(key) == value for key, value in entry.items()):
+            entry['sha256'] = before['sha256']
+        else:
+            entry['sha256'] = file_sha256(path)
+        files[relative_path] = entry
+    return files
+
+
+def tree_digest(files: Dict[str, Dict]) -> str:
+    """경로 / 권한 / 내용만 사용 (mtime 제외)"""
+    digest = hashlib.sha256()
+    for relative_path in sorted(files):
+        entry = files[relative_path]
+        digest.update(f'{relative_path}\0{entry["mode"]:o}\0{entry["sha256"]}\n'.encode())
+    return digest.hexdigest()
+
+
+def write_zip(source_dir: str, files: Dict[str, Dict], path: str) -> None:
+    """파일을 chunk 단위로 zip에 쓴다. (bundle 전체를 메모리에 올리지 않음)"""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for relative_path in sorted(files):
+            info = zipfile.ZipInfo(relative_path, date_time=FIXED_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (stat.S_IFREG | files[relative_path]['mode']) << 16
+            with open(os.path.join(source_dir, *relative_path.split('/')), 'rb') as source, \
+                    archive.open(info, 'w', force_zip64=True) as target:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    target.write(chunk)
+
+
+def build_source_bundle(source_dir: str, excludes: Iterable[str] = (),
+                        directory: Optional[str] = None) -> SourceBundle:
+    """<directory>/<digest>.zip. tree가 바뀌지 않았으면 기존 zip을 그대로 사용"""
+    if not os.path.isdir(source_dir):
+        raise FileNotFoundError(f'source bundle directory not found: {source_dir}')
+    output_dir = directory or bundle_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_path)
+    if manifest.get('source_dir') != os.path.realpath(source_dir):
+        manifest = {}
+
+    files = scan(source_dir, excludes, manifest)
+    digest = tree_digest(files)
+    bundle_path = os.path.join(output_dir, f'{digest}.zip')
+
+    rebuilt = not os.path.exists(bundle_path)
+    if rebuilt:
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix='.bundle-', suffix='.zip')
+        os.close(fd)
+        try:
+            write_zip(source_dir, files, tmp_path)
+            os.replace(tmp_path, bundle_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        # 이전 bundle 정리 (최신 하나만 유지), 동시에 실행 중인 synth의 임시 파일은 건드리지 않는다.
+        for name in os.listdir(output_dir):
+            if _BUNDLE_NAME.fullmatch(name) and name != os.path.basename(bundle_path):
+                try:
+                    os.remove(os.path.join(output_dir, name))
+                except FileNotFoundError:
+                    pass  # 다른 synth가 먼저 지움
+
+    with open(manifest_path, 'w') as stream:
+        json.dump({'source_dir': os.path.realpath(source_dir), 'digest': digest, 'files': files},
+                  stream, indent=1, sort_keys=True)
+    return SourceBundle(bundle_path, digest, rebuilt)
@@ -0,0 +1,181 @@
+"""app.py에서 사용하는 stack registry
+stack별 factory를 등록해두고, 요청된 stack(+ 의존하는 stack)만 생성한다.
+
+    $ cdk synth -c stacks=BoxOfficeMojo
+    $ CDK_STACKS=EbStack cdk deploy EbStack   # EbNetworkStack도 함께 생성
+
+선택값이 없으면 (또는 'all'/'*') 기존처럼 모든 stack을 생성한다.
+"""
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import aws_cdk as cdk
+
+from iac_aws_cdk.settings import Settings, settings_for
+
+STACKS_CONTEXT_KEY = 'stacks'
+STACKS_ENV_VAR = 'CDK_STACKS'
+
+# Important Environment settings. Note: Make sure to check most recent valid versions of `beanstalk_stack`
+# https://awscli.amazonaws.com/v2/documentation/api/latest/reference/elasticbeanstalk/list-available-solution-stacks.html
+EB_PROPS = {
+    'namespace': 'MyNamespace',
+    'vpc_name': 'vpc-myvpc',
+    'instance_name': 'rds-webserver',
+    'instance_type': 't2.small',
+    'wan_ip': '1.1.1.1',
+    'beanstalk_stack': '64bit Amazon Linux 2 v3.4.1 running Python 3.8',
+    'eb_name': 'myEbApp',
+    'db_master_username': 'tutorial_user',
+    'db_subnet_group_name': 'sgp-rds-db',
+    'db_name': 'EBDb',
+    'db_instance_identifier': 'tutorial-db-instance',
+    'db_instance_engine': 'MYSQL'
+}
+
+
+# stack명 목록, 또는 설정값에 따라 stack명 목록을 돌려주는 함수
+DependsOn = Union[Tuple[str, ...], Callable[[Settings], Iterable[str]]]
+
+
+@dataclass(frozen=True)
+class StackEntry:
+    name: str
+    config_section: str
+    depends_on: DependsOn
+    factory: Callable[..., cdk.Stack]
+
+    def dependencies(self, settings: Settings) -> Tuple[str, ...]:
+        return tuple(self.depends_on(settings) if callable(self.depends_on) else self.depends_on)
+
+
+_REGISTRY: Dict[str, StackEntry] = {}
+
+
+def register(name: str, config_section: str,
+             depends_on: Union[Iterable[str], Callable[[Settings], Iterable[str]]] = ()):
+    """factory(app, construct_id, env, deps)를 registry에 등록 (등록 순서 = 생성 순서)"""
+    def decorator(factory):
+        dependencies = depends_on if callable(depends_on) else tuple(depends_on)
+        _REGISTRY[name] = StackEntry(name, config_section, dependencies, factory)
+        return factory
+    return decorator
+
+
+def stack_names() -> List[str]:
+    return list(_REGISTRY)
+
+
+def _environment(app: cdk.App, section: str) -> cdk.Environment:
+    settings = settings_for(app).section(section)
+    return cdk.Environment(
+        account=settings.aws_account,
+        region=settings.aws_region
+    )
+
+
+def requested_stack_names(app: cdk.App) -> Optional[List[str]]:
+    """-c stacks=A,B 또는 CDK_STACKS=A,B. 지정하지 않으면 None (= 전체)"""
+    raw = app.node.try_get_context(STACKS_CONTEXT_KEY) or os.environ.get(STACKS_ENV_VAR, '')
+    if isinstance(raw, (list, tuple)):
+        raw = ','.join(raw)
+    names = [name.strip() for name in str(raw).split(',') if name.strip()]
+    if not names or names in (['all'], ['*']):
+        return None
+
+    unknown = [name for name in names if name not in _REGISTRY]
+    if unknown:
+        raise ValueError(
+            f"unknown stack(s) {', '.join(unknown)}; known stacks: {', '.join(_REGISTRY)}"
+        )
+    return names
+
+
+def resolve(names: Optional[Iterable[str]], settings: Settings) -> List[str]:
+    """요청된 stack과 그 의존 stack을 registry 순서대로 반환"""
+    if names is None:
+        return stack_names()
+
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        pending.extend(_REGISTRY[name].dependencies(settings))
+    return [name for name in _REGISTRY if name in needed]
+
+
+def build_stacks(app: cdk.App, names: Optional[Iterable[str]] = None) -> Dict[str, cdk.Stack]:
+    if names is None:
+        names = requested_stack_names(app)
+    # construct를 만들기 전에 설정 파일 전체를 검사 (잘못된 설정은 여기서 바로 실패)
+    settings = settings_for(app)
+
+    built: Dict[str, cdk.Stack] = {}
+    for name in resolve(names, settings):
+        entry = _REGISTRY[name]
+        deps = {dep: built[dep] for dep in entry.dependencies(settings)}
+        built[name] = entry.factory(app, name, _environment(app, entry.config_section), deps)
+        for dep in deps.values():
+            built[name].add_dependency(dep)
+    return built
+
+
+# module import는 factory 안에서 한다. (선택되지 않은 stack module은 import하지 않음)
+@register('SecretCreation', config_section='ecs_task')
+def _secret_creation(app, construct_id, env, deps):
+    from iac_aws_cdk.secret_creation import SecretCreation
+    return SecretCreation(app, construct_id, env=env)
+
+
+@register('EcsTask', config_section='ecs_task')
+def _ecs_task(app, construct_id, env, deps):
+    from iac_aws_cdk.ecs_task import EcsTask
+    return EcsTask(app, construct_id, env=env)
+
+
+@register('JwApp', config_section='jw_app')
+def _jw_app(app, construct_id, env, deps):
+    from iac_aws_cdk.jw_app import JwApp
+    return JwApp(app, construct_id, env=env)
+
+
+@register('WordPressImage', config_section='pub_ec2_test')
+def _word_press_image(app, construct_id, env, deps):
+    from iac_aws_cdk.word_press_image import WordPressImage
+    return WordPressImage(app, construct_id, env=env)
+
+
+# ami_from_ssm=true일 때만 WordPressImage가 SSM parameter에 저장한 AMI를 사용 (image build는 20분 정도)
+@register('PubEc2Test', config_section='jw_app',
+          depends_on=lambda settings: ('WordPressImage',) if settings.pub_ec2_test.ami_from_ssm else ())
+def _pub_ec2_test(app, construct_id, env, deps):
+    from iac_aws_cdk.pub_ec2_test import PubEc2Test
+    return PubEc2Test(app, construct_id, env=env)
+
+
+@register('S3ObjUpload', config_section='s3_obj_upload')
+def _s3_obj_upload(app, construct_id, env, deps):
+    from iac_aws_cdk.s3_obj_upload import S3ObjUpload
+    return S3ObjUpload(app, construct_id, env=env)
+
+
+@register('BoxOfficeMojo', config_section='box_office_mojo')
+def _box_office_mojo(app, construct_id, env, deps):
+    from iac_aws_cdk.box_office_mojo import BoxOfficeMojo
+    return BoxOfficeMojo(app, construct_id, env=env)
+
+
+@register('EbNetworkStack', config_section='eb_network_stack')
+def _eb_network_stack(app, construct_id, env, deps):
+    from iac_aws_cdk.eb_network_stack import EbNetworkStack
+    return EbNetworkStack(app, construct_id, EB_PROPS, env=env)
+
+
+@register('EbStack', config_section='eb_stack', depends_on=('EbNetworkStack',))
+def _eb_stack(app, construct_id, env, deps):
+    from iac_aws_cdk.eb_stack import EbStack
+    return EbStack(app, construct_id, deps['EbNetworkStack'].output_props, env=env)
@@ -0,0 +1,173 @@
+"""WordPress AMI (EC2 Image Builder)
+word_press_pub_ec2_user_data_script의 설치 과정을 AMI에 미리 구워두고, build할 때마다 AMI id를 SSM parameter에 저장한다.
+PubEc2Test에서 ami_from_ssm=true (또는 ami_id)로 사용하면 boot할 때 yum install을 다시 하지 않는다.
+
+    $ cdk deploy WordPressImage      # 배포하면서 AMI를 한 번 build (20분 정도)
+"""
+import hashlib
+import json
+from typing import List
+
+from aws_cdk import (
+    Aws,
+    Stack,
+    aws_iam as iam,
+    aws_imagebuilder as imagebuilder
+)
+from constructs import Construct
+
+from iac_aws_cdk.settings import settings_for
+
+# image builder는 root로 실행하므로 sudo / sudo su는 필요 없다.
+_SKIP_COMMANDS = ('sudo su',)
+
+
+def script_commands(script: str) -> List[str]:
+    """user data script -> image builder ExecuteBash commands (빈 줄 / 주석 / shebang 제외)"""
+    commands = []
+    for line in script.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or line in _SKIP_COMMANDS:
+            continue
+        commands.append(line[len('sudo '):] if line.startswith('sudo ') else line)
+    return commands
+
+
+def component_document(commands: List[str]) -> str:
+    """AWSTOE component document (json은 yaml이므로 그대로 사용)
+    https://docs.aws.amazon.com/imagebuilder/latest/userguide/toe-use-documents.html
+    """
+    return json.dumps({
+        'name': 'WordPressInstall',
+        'schemaVersion': '1.0',
+        'phases': [
+            {
+                'name': 'build',
+                'steps': [{'name': 'Install', 'action': 'ExecuteBash', 'inputs': {'commands': commands}}]
+            },
+            {
+                'name': 'validate',
+                'steps': [{'name': 'Httpd', 'action': 'ExecuteBash', 'inputs': {'commands': ['httpd -v']}}]
+            }
+        ]
+    }, indent=2)
+
+
+def content_version(*parts: str) -> str:
+    """component / recipe는 version별로 immutable이므로 내용이 바뀌면 version도 바뀌게 한다."""
+    digest = hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+    return f'1.0.{int(digest[:6], 16)}'
+
+
+class WordPressImage(Stack):
+    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+        settings = settings_for(self).pub_ec2_test
+
+        with open(settings.word_press_pub_ec2_user_data_script, 'r') as stream:
+            component_data = component_document(script_commands(stream.read()))
+        parent_image = settings.image_parent_image
+        if not parent_image.startswith(('ami-', 'arn:')):
+            # image builder 관리 image (eg. amazon-linux-2-x86) 최신 버전
+            parent_image = f'arn:{Aws.PARTITION}:imagebuilder:{self.region}:aws:image/{parent_image}/x.x.x'
+
+        # https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-resource-imagebuilder-component.html
+        word_press_component = imagebuilder.CfnComponent(
+            self,
+            'WordPressComponent',
+            name='WordPressInstall',
+            platform='Linux',
+            version=content_version(component_data),
+            data=component_data
+        )
+
+        word_press_recipe = imagebuilder.CfnImageRecipe(
+            self,
+            'WordPressRecipe',
+            name='WordPressRecipe',
+            version=content_version(component_data, settings.image_parent_image),
+            parent_image=parent_image,
+            components=[
+                imagebuilder.CfnImageRecipe.ComponentConfigurationProperty(
+                    component_arn=word_press_component.attr_arn
+                )
+            ]
+        )
+
+        # build instance role (SSM agent로 component 실행)
+        word_press_image_role = iam.Role(
+            self,
+            'WordPressImageRole',
+            assumed_by=iam.ServicePrincipal('ec2.amazonaws.com'),
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name('AmazonSSMManagedInstanceCore'),
+                iam.ManagedPolicy.from_aws_managed_policy_name('EC2InstanceProfileForImageBuilder'),
+            ]
+        )
+        word_press_image_profile = iam.CfnInstanceProfile(
+            self,
+            'WordPressImageProfile',
+            roles=[word_press_image_role.role_name]
+        )
+
+        # subnet을 지정하지 않으면 default vpc에서 build (yum 때문에 인터넷 접근 필요)
+        word_press_infrastructure = imagebuilder.CfnInfrastructureConfiguration(
+            self,
+            'WordPressInfrastructure',
+            name='WordPressInfrastructure',
+            instance_profile_name=word_press_image_profile.ref,
+            instance_types=list(settings.image_instance_types),
+            subnet_id=settings.image_subnet or None,
+            security_group_ids=[settings.image_security_group] if settings.image_security_group else None,
+            terminate_instance_on_failure=True
+        )
+
+        word_press_distribution = imagebuilder.CfnDistributionConfiguration(
+            self,
+            'WordPressDistribution',
+            name='WordPressDistribution',
+            distributions=[
+                imagebuilder.CfnDistributionConfiguration.DistributionProperty(
+                    region=self.region,
+                    ami_distribution_configuration={
+                        'Name': 'WordPress-{{ imagebuilder:buildDate }}',
+                        'AmiTags': {'Name': 'WordPress'}
+                    }
+                )
+            ]
+        )
+
+        # 배포 시점 build / pipeline build 모두 distribution에서 SSM parameter를 갱신한다.
+        # CfnDistributionConfiguration(2.38)에 SsmParameterConfigurations 속성이 없어서 직접 추가
+        # image builder service linked role은 /imagebuilder/ 아래 parameter만 쓸 수 있다.
+        # https://docs.aws.amazon.com/imagebuilder/latest/userguide/integ-ssm-parameters.html
+        word_press_distribution.add_property_override(
+            'Distributions.0.SsmParameterConfigurations',
+            [{'ParameterName': settings.image_ssm_parameter, 'DataType': 'aws:ec2:image'}]
+        )
+
+        # 배포 시점에 한 번 build
+        imagebuilder.CfnImage(
+            self,
+            'WordPressImage',
+            image_recipe_arn=word_press_recipe.attr_arn,
+            infrastructure_configuration_arn=word_press_infrastructure.attr_arn,
+            distribution_configuration_arn=word_press_distribution.attr_arn
+        )
+
+        # 보안 update 등을 반영한 AMI를 주기적으로 다시 build (image_schedule이 없으면 수동 실행)
+        # 새 AMI는 PubEc2Test를 다시 배포할 때 (launch template이 바뀌면서) 반영된다.
+        # template은 그대로이므로 parallel_deploy는 SSM parameter 값까지 비교해서 PubEc2Test를 다시 배포한다. (deploy_state.py)
+        imagebuilder.CfnImagePipeline(
+            self,
+            'WordPressPipeline',
+            name='WordPressPipeline',
+            image_recipe_arn=word_press_recipe.attr_arn,
+            infrastructure_configuration_arn=word_press_infrastructure.attr_arn,
+            distribution_configuration_arn=word_press_distribution.attr_arn,
+            schedule=imagebuilder.CfnImagePipeline.ScheduleProperty(
+                schedule_expression=settings.image_schedule,
+                pipeline_execution_start_condition='EXPRESSION_MATCH_AND_DEPENDENCY_UPDATES_AVAILABLE'
+            ) if settings.image_schedule else None,
+            status='ENABLED'
+        )
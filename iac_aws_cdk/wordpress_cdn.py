@@ -0,0 +1,80 @@
+"""wordpress alb 앞의 cloudfront distribution
+정적 파일(/wp-content/*, /wp-includes/*)은 edge에서 오래 cache하고,
+나머지(페이지, wp-admin, 로그인)는 cookie/query string을 그대로 origin에 전달한다.
+https://docs.aws.amazon.com/cdk/api/v2/python/aws_cdk.aws_cloudfront/Distribution.html
+"""
+from aws_cdk import (
+    Duration,
+    aws_cloudfront as cloudfront,
+    aws_cloudfront_origins as origins,
+    aws_elasticloadbalancingv2 as elbv2
+)
+from constructs import Construct
+
+STATIC_PATHS = ('/wp-content/*', '/wp-includes/*')
+
+PRICE_CLASSES = {
+    '100': cloudfront.PriceClass.PRICE_CLASS_100,
+    '200': cloudfront.PriceClass.PRICE_CLASS_200,
+    'All': cloudfront.PriceClass.PRICE_CLASS_ALL,
+}
+
+
+class WordPressCdn(Construct):
+    """settings: cdn_static_ttl_days / cdn_origin_shield_region / cdn_price_class를 가진 section settings"""
+    def __init__(self, scope: Construct, construct_id: str, *, settings,
+                 load_balancer: elbv2.ILoadBalancerV2) -> None:
+        super().__init__(scope, construct_id)
+
+        # alb listener가 http(80)만 열려 있으므로 origin도 http
+        origin = origins.LoadBalancerV2Origin(
+            load_balancer,
+            protocol_policy=cloudfront.OriginProtocolPolicy.HTTP_ONLY,
+            # origin에 가까운 region 하나에 cache를 한 번 더 둔다. (edge별 origin 요청 감소)
+            origin_shield_region=settings.cdn_origin_shield_region or None
+        )
+
+        # css/js/image는 ?ver= query string으로 버전을 바꾸므로 query string은 cache key에 포함
+        static_ttl = Duration.days(settings.cdn_static_ttl_days)
+        static_cache_policy = cloudfront.CachePolicy(
+            self,
+            'StaticCachePolicy',
+            comment='wordpress static files',
+            default_ttl=static_ttl,
+            max_ttl=static_ttl,
+            min_ttl=Duration.days(1),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.all(),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True
+        )
+        static_behavior = cloudfront.BehaviorOptions(
+            origin=origin,
+            viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+            allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD,
+            cache_policy=static_cache_policy,
+            compress=True
+        )
+
+        self.distribution = cloudfront.Distribution(
+            self,
+            'Distribution',
+            comment=f'{construct_id} (wordpress alb)',
+            price_class=PRICE_CLASSES[settings.cdn_price_class],
+            # 로그인 cookie(wordpress_logged_in_*)는 이름이 사이트마다 달라서 cache key로 지정할 수 없다.
+            # 동적 페이지는 cache하지 않고 cookie / query string / header를 모두 origin에 전달
+            default_behavior=cloudfront.BehaviorOptions(
+                origin=origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
+                cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,
+                origin_request_policy=cloudfront.OriginRequestPolicy.ALL_VIEWER,
+                compress=True
+            ),
+            additional_behaviors={path: static_behavior for path in STATIC_PATHS}
+        )
+
+    @property
+    def domain_name(self) -> str:
+        return self.distribution.distribution_domain_name
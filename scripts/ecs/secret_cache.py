@@ -0,0 +1,79 @@
+"""EcsTask container용 secret cache (worker image에 복사해서 사용)
+ecs가 task 시작할 때 주입한 환경변수 값을 먼저 쓰고, ttl이 지나면 GetSecretValue로 다시 읽는다.
+짧게 실행되는 task는 secrets manager를 호출하지 않고, 오래 실행되는 worker는 rotation된 값을 ttl 안에 반영한다.
+
+EcsTask stack이 넣어주는 환경변수 ([ecs_task] secrets / secret_cache_ttl_seconds)
+    SECRET_SOURCES              {"DB_PASSWORD": {"secret_id": "MyTestSecret", "field": "password"}, ...}
+    SECRETS_CACHE_TTL_SECONDS   300
+
+    from secret_cache import SecretCache
+    secrets = SecretCache.from_environment()
+    password = secrets.get('DB_PASSWORD')
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+SOURCES_ENV_VAR = 'SECRET_SOURCES'
+TTL_ENV_VAR = 'SECRETS_CACHE_TTL_SECONDS'
+DEFAULT_TTL_SECONDS = 300
+
+
+class SecretCache:
+    def __init__(self, sources: Mapping[str, Dict[str, str]], ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 client=None, environ: Optional[Mapping[str, str]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.sources = dict(sources)
+        self.ttl_seconds = ttl_seconds
+        self._client = client
+        self._clock = clock
+        self._lock = threading.Lock()
+        environ = os.environ if environ is None else environ
+        now = clock()
+        # 주입된 값은 task 시작 시점의 값 -> 시작 시간 기준으로 ttl 적용
+        self._values: Dict[str, Tuple[str, float]] = {
+            name: (environ[name], now) for name in self.sources if name in environ
+        }
+        self.calls = 0
+
+    @classmethod
+    def from_environment(cls, client=None) -> 'SecretCache':
+        return cls(
+            json.loads(os.environ.get(SOURCES_ENV_VAR) or '{}'),
+            float(os.environ.get(TTL_ENV_VAR) or DEFAULT_TTL_SECONDS),
+            client=client
+        )
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('secretsmanager')
+        return self._client
+
+    def _fetch(self, name: str) -> str:
+        source = self.sources[name]
+        self.calls += 1
+        secret_string = self.client.get_secret_value(SecretId=source['secret_id'])['SecretString']
+        if not source.get('field'):
+            return secret_string
+        return str(json.loads(secret_string)[source['field']])
+
+    def get(self, name: str) -> str:
+        if name not in self.sources:
+            raise KeyError(f'{name} is not in {SOURCES_ENV_VAR}')
+        with self._lock:
+            cached = self._values.get(name)
+            if cached and self._clock() - cached[1] < self.ttl_seconds:
+                return cached[0]
+            try:
+                value = self._fetch(name)
+            except Exception:
+                # secrets manager 장애 시에는 이전 값을 계속 사용
+                if cached:
+                    return cached[0]
+                raise
+            self._values[name] = (value, self._clock())
+            return value
@@ -0,0 +1,153 @@
+"""box office mojo csv -> parquet(snappy) compaction job
+crawler가 등록한 csv table에서 새로 들어온 파일만 (job bookmark) 읽어서
+partition(dt)별로 기존 parquet와 합쳐서 target file size에 가깝게 나눈 parquet를 curated prefix에 쓴다.
+
+glue에서 실행 (BoxOfficeMojo stack의 MojoCsvToParquetJob, crawler 성공 후 trigger로 실행)
+    --source_database glue-test-database --source_table mojo --target_path s3://.../curated/mojo
+
+local에서 실행 (pyspark + java 필요, aws 접근 없음)
+    $ python scripts/glue/mojo_csv_to_parquet.py --local \
+        --source_path tests/fixtures/mojo --target_path /tmp/curated/mojo
+"""
+import argparse
+import sys
+from typing import Iterable, List, Optional
+
+DEFAULT_TARGET_FILE_SIZE_MB = 128
+# csv -> snappy parquet 크기 비율 추정치 (실제 비율은 데이터에 따라 다르다)
+DEFAULT_COMPRESSION_RATIO = 0.25
+
+
+def target_records_per_file(input_bytes: int, input_records: int, target_file_size_bytes: int,
+                            compression_ratio: float = DEFAULT_COMPRESSION_RATIO) -> int:
+    """parquet 파일 하나에 넣을 record 수 (writer의 maxRecordsPerFile, 0이면 제한 없음)
+    입력 csv의 record당 크기로 출력 record당 크기를 추정한다.
+    """
+    if target_file_size_bytes <= 0:
+        raise ValueError('target_file_size_bytes must be positive')
+    if input_bytes <= 0 or input_records <= 0:
+        return 0
+    return max(1, int(target_file_size_bytes / (input_bytes * compression_ratio / input_records)))
+
+
+def input_size_bytes(spark, paths: Iterable[str]) -> int:
+    """hadoop FileSystem으로 입력 파일 크기 합계 (local / s3 모두 동작)"""
+    jvm = spark.sparkContext._jvm
+    hadoop_conf = spark.sparkContext._jsc.hadoopConfiguration()
+    total = 0
+    for path in paths:
+        hadoop_path = jvm.org.apache.hadoop.fs.Path(path)
+        total += hadoop_path.getFileSystem(hadoop_conf).getFileStatus(hadoop_path).getLen()
+    return total
+
+
+def path_exists(spark, path: str) -> bool:
+    jvm = spark.sparkContext._jvm
+    hadoop_path = jvm.org.apache.hadoop.fs.Path(path)
+    return hadoop_path.getFileSystem(spark.sparkContext._jsc.hadoopConfiguration()).exists(hadoop_path)
+
+
+def with_existing_partitions(spark, df, target_path: str, partition_keys: List[str]):
+    """df에 target_path에 이미 있는 같은 partition의 row를 합친다.
+    dynamic overwrite는 partition을 통째로 바꾸므로, 새 파일만 쓰면 그 partition의 이전 row가 사라진다.
+    """
+    if not path_exists(spark, target_path):
+        return df
+    # df의 schema로 읽어야 partition column(dt) type이 같다.
+    existing = spark.read.schema(df.schema).parquet(target_path)
+    touched = df.select(*partition_keys).distinct()
+    return df.unionByName(existing.join(touched, partition_keys, 'left_semi'))
+
+
+def compact(spark, df, target_path: str, partition_keys: List[str], target_file_size_mb: int) -> int:
+    """df를 partition_keys로 나눠 parquet로 쓴다. 파일당 record 수 반환"""
+    records_per_file = target_records_per_file(
+        input_size_bytes(spark, df.inputFiles()), df.count(), target_file_size_mb * 1024 * 1024
+    )
+    # 이번에 들어온 partition만 (기존 row와 합쳐서) 다시 쓰고 나머지 partition은 유지
+    # 읽고 있는 path를 덮어쓰므로 쓰기 전에 합친 결과를 materialize 한다.
+    merged = with_existing_partitions(spark, df, target_path, partition_keys).localCheckpoint()
+    spark.conf.set('spark.sql.sources.partitionOverwriteMode', 'dynamic')
+    (
+        # partition 하나는 task 하나가 쓰고, maxRecordsPerFile로 target size마다 파일을 나눈다.
+        merged.repartition(*partition_keys)
+        .write
+        .mode('overwrite')
+        .partitionBy(*partition_keys)
+        .option('compression', 'snappy')
+        .option('maxRecordsPerFile', records_per_file)
+        .parquet(target_path)
+    )
+    return records_per_file
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='box office mojo csv -> parquet compaction')
+    parser.add_argument('--local', action='store_true', help='glue 없이 local spark로 실행')
+    parser.add_argument('--source_path', help='(local) csv root (dt=yyyy-MM-dd/ 하위 폴더)')
+    parser.add_argument('--source_database')
+    parser.add_argument('--source_table')
+    parser.add_argument('--target_path', required=True)
+    parser.add_argument('--partition_keys', default='dt')
+    parser.add_argument('--target_file_size_mb', type=int, default=DEFAULT_TARGET_FILE_SIZE_MB)
+    # glue가 추가하는 인자(--JOB_NAME, --job-bookmark-option 등)는 무시
+    args, _ = parser.parse_known_args(argv)
+    if args.local and not args.source_path:
+        parser.error('--source_path is required with --local')
+    if not args.local and not (args.source_database and args.source_table):
+        parser.error('--source_database and --source_table are required')
+    return args
+
+
+def run_local(args: argparse.Namespace) -> int:
+    from pyspark.sql import SparkSession
+
+    spark = SparkSession.builder.master('local[*]').appName('mojo_csv_to_parquet').getOrCreate()
+    try:
+        df = spark.read.option('header', True).option('inferSchema', True).csv(args.source_path)
+        return compact(spark, df, args.target_path, args.partition_keys.split(','), args.target_file_size_mb)
+    finally:
+        spark.stop()
+
+
+def run_glue() -> int:
+    from awsglue.context import GlueContext
+    from awsglue.job import Job
+    from awsglue.utils import getResolvedOptions
+    from pyspark.context import SparkContext
+
+    options = getResolvedOptions(
+        sys.argv,
+        ['JOB_NAME', 'source_database', 'source_table', 'target_path', 'partition_keys', 'target_file_size_mb']
+    )
+    glue_context = GlueContext(SparkContext.getOrCreate())
+    job = Job(glue_context)
+    job.init(options['JOB_NAME'], options)
+
+    # transformation_ctx가 있어야 job bookmark가 적용되어 이전에 처리한 파일은 다시 읽지 않는다.
+    source = glue_context.create_dynamic_frame.from_catalog(
+        database=options['source_database'],
+        table_name=options['source_table'],
+        transformation_ctx='source'
+    )
+    records_per_file = 0
+    if source.count() > 0:
+        records_per_file = compact(
+            glue_context.spark_session,
+            source.toDF(),
+            options['target_path'],
+            options['partition_keys'].split(','),
+            int(options['target_file_size_mb'])
+        )
+    job.commit()
+    return records_per_file
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    records_per_file = run_local(args) if args.local else run_glue()
+    print(f'compacted into {args.target_path} (max {records_per_file} records per file)')
+
+
+if __name__ == '__main__':
+    main()
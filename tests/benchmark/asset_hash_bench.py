@@ -0,0 +1,101 @@
+"""asset fingerprint 시간 측정 (cdk 기본 fingerprint / cache miss / cache hit)
+
+    $ python -m tests.benchmark.asset_hash_bench                 # 256MB 임시 파일
+    $ python -m tests.benchmark.asset_hash_bench --size-mb 1024 -r 5
+    $ python -m tests.benchmark.asset_hash_bench --path ../aws_onboarding.zip
+
+cache hit은 stat 한 번 + dict 조회라서 파일 크기와 관계없이 거의 일정해야 한다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+CHUNK = b'\0' * (1024 * 1024)
+
+
+def _make_file(path: str, size_mb: int) -> None:
+    with open(path, 'wb') as stream:
+        for i in range(size_mb):
+            # 같은 chunk만 반복하면 너무 단순하므로 chunk마다 번호를 섞는다.
+            stream.write(i.to_bytes(8, 'big') + CHUNK[8:])
+
+
+# cdk fingerprint는 process 안에서 memoize되므로 synth 한 번(= 새 process)의 비용은 새 process에서 측정
+_CDK_PROBE = """
+import sys, time
+import aws_cdk as cdk
+start = time.perf_counter()
+cdk.FileSystem.fingerprint(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def _cdk_fingerprint_seconds(path: str, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', _CDK_PROBE, path], capture_output=True, text=True, check=True)
+        runs.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(runs)
+
+
+def _median_seconds(func: Callable[[], object], repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def run_benchmark(path: Optional[str] = None, size_mb: int = 256, repeat: int = 3,
+                  skip_cdk: bool = False) -> Dict[str, float]:
+    from iac_aws_cdk.asset_cache import FingerprintCache
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if path is None:
+            path = os.path.join(work_dir, 'asset.bin')
+            _make_file(path, size_mb)
+        cache_dir = os.path.join(work_dir, 'cache')
+
+        def miss():
+            # 매번 새 cache 디렉토리 = 항상 miss (hash 계산 + cache 저장)
+            FingerprintCache(tempfile.mkdtemp(dir=work_dir)).fingerprint(path)
+
+        warm = FingerprintCache(cache_dir)
+        warm.fingerprint(path)
+
+        def hit():
+            # 새 process에서 synth하는 경우처럼 cache 파일부터 다시 읽는다.
+            FingerprintCache(cache_dir).fingerprint(path)
+
+        result = {
+            'size_mb': round(os.path.getsize(path) / 1024 / 1024, 1),
+            'cache_miss_s': _median_seconds(miss, repeat),
+            'cache_hit_s': _median_seconds(hit, repeat),
+            'cache_hit_in_process_s': _median_seconds(lambda: warm.fingerprint(path), repeat),
+        }
+        if not skip_cdk:
+            result['cdk_fingerprint_s'] = _cdk_fingerprint_seconds(path, repeat)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', help='측정할 파일 (기본값: 임시 파일 생성)')
+    parser.add_argument('--size-mb', type=int, default=256, help='임시 파일 크기')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='반복 횟수 (median 사용)')
+    parser.add_argument('--skip-cdk', action='store_true', help='cdk 기본 fingerprint 측정 생략')
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.path, args.size_mb, args.repeat, args.skip_cdk), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""cdk synth 시간 측정 (import / stack 생성 / app.synth())
+from_lookup 값은 tests/fixtures/cdk.context.json을 사용하므로 네트워크 없이 실행된다.
+
+    $ python -m tests.benchmark.synth_bench                        # 전체 stack
+    $ python -m tests.benchmark.synth_bench -s BoxOfficeMojo -r 5
+    $ python -m tests.benchmark.synth_bench --compare bench_results/baseline.json
+
+output dir에 summary.json과 phase별 cProfile dump(*.pstats)를 남긴다.
+    $ python -m pstats bench_results/EbStack.construct.pstats
+"""
+import argparse
+import cProfile
+import json
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from tests.fixture_paths import FIXTURE_CONFIG, FIXTURE_CONTEXT
+
+DEFAULT_OUTPUT_DIR = 'bench_results'
+
+# 새 python process에서 측정해야 jsii runtime 시작 시간까지 포함된다.
+_IMPORT_PROBE = """
+import cProfile, importlib, json, sys, time
+profile = cProfile.Profile()
+timings = {}
+profile.enable()
+start = time.perf_counter()
+import aws_cdk
+timings['aws_cdk'] = time.perf_counter() - start
+for module in sys.argv[2:]:
+    start = time.perf_counter()
+    importlib.import_module(module)
+    timings[module] = time.perf_counter() - start
+profile.disable()
+profile.dump_stats(sys.argv[1])
+print(json.dumps(timings))
+"""
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _stack_modules() -> List[str]:
+    import iac_aws_cdk
+    return [f'iac_aws_cdk.{module.name}' for module in pkgutil.iter_modules(iac_aws_cdk.__path__)]
+
+
+def time_imports(out_dir: str, repeat: int) -> Dict[str, float]:
+    modules = _stack_modules()
+    runs: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', _IMPORT_PROBE, os.path.join(out_dir, 'import.pstats'), *modules],
+            capture_output=True, text=True, check=True
+        )
+        for name, seconds in json.loads(result.stdout.strip().splitlines()[-1]).items():
+            runs.setdefault(name, []).append(seconds)
+    return {name: statistics.median(values) for name, values in runs.items()}
+
+
+def _new_app(context: Dict, cdk_out: str):
+    import aws_cdk as cdk
+    from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY
+
+    return cdk.App(outdir=cdk_out, context={**context, CONFIG_CONTEXT_KEY: FIXTURE_CONFIG})
+
+
+def time_stack(name: str, context: Dict, out_dir: str, repeat: int) -> Dict[str, float]:
+    """stack 하나(+ 의존 stack)를 새 App에 생성/synth. 첫 번째 실행의 profile을 저장한다."""
+    from iac_aws_cdk.stack_registry import build_stacks
+
+    construct_runs, synth_runs = [], []
+    for i in range(repeat):
+        with tempfile.TemporaryDirectory() as cdk_out:
+            app = _new_app(context, cdk_out)
+            profile = cProfile.Profile()
+
+            start = time.perf_counter()
+            profile.enable()
+            build_stacks(app, [name])
+            profile.disable()
+            construct_runs.append(time.perf_counter() - start)
+            if i == 0:
+                profile.dump_stats(os.path.join(out_dir, f'{name}.construct.pstats'))
+
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            app.synth()
+            profile.disable()
+            synth_runs.append(time.perf_counter() - start)
+            if i == 0:
+                profile.dump_stats(os.path.join(out_dir, f'{name}.synth.pstats'))
+
+    return {
+        'construct_s': statistics.median(construct_runs),
+        'synth_s': statistics.median(synth_runs),
+        'total_s': statistics.median(c + s for c, s in zip(construct_runs, synth_runs)),
+    }
+
+
+def run_benchmark(stacks: Optional[List[str]] = None, repeat: int = 3,
+                  out_dir: str = DEFAULT_OUTPUT_DIR, skip_imports: bool = False) -> Dict:
+    from iac_aws_cdk import stack_registry
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(FIXTURE_CONTEXT) as stream:
+        context = json.load(stream)
+
+    summary = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'imports': {} if skip_imports else time_imports(out_dir, repeat),
+        'stacks': {},
+    }
+    for name in stacks or stack_registry.stack_names():
+        try:
+            summary['stacks'][name] = time_stack(name, context, out_dir, repeat)
+        except Exception as e:  # 한 stack이 실패해도 나머지는 측정
+            summary['stacks'][name] = {'error': f'{type(e).__name__}: {e}'.splitlines()[0]}
+
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as stream:
+        json.dump(summary, stream, indent=2)
+    return summary
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """baseline 대비 threshold(비율) 이상 느려진 항목 + baseline에서는 성공했는데 이번에 실패한 stack"""
+    regressions = []
+    for name, result in current['stacks'].items():
+        before = baseline.get('stacks', {}).get(name, {})
+        if 'error' in result:
+            if 'error' not in before:
+                regressions.append(f'{name}: synth failed ({result["error"]})')
+            continue
+        for key in ('construct_s', 'synth_s', 'total_s'):
+            if key in result and before.get(key):
+                ratio = result[key] / before[key] - 1
+                if ratio > threshold:
+                    regressions.append(f'{name}.{key}: {before[key]:.3f}s -> {result[key]:.3f}s (+{ratio:.0%})')
+    return regressions
+
+
+def _print_summary(summary: Dict) -> None:
+    for name, seconds in summary['imports'].items():
+        print(f'import {name:<40} {seconds:8.3f}s')
+    for name, result in summary['stacks'].items():
+        if 'error' in result:
+            print(f'{name:<20} ERROR {result["error"]}')
+        else:
+            print(f'{name:<20} construct {result["construct_s"]:7.3f}s  '
+                  f'synth {result["synth_s"]:7.3f}s  total {result["total_s"]:7.3f}s')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--stack', action='append', dest='stacks', help='stack명 (반복 가능, 기본값: 전체)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='반복 횟수 (median 사용)')
+    parser.add_argument('-o', '--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--skip-imports', action='store_true')
+    parser.add_argument('--compare', metavar='SUMMARY_JSON', help='이전 summary.json과 비교')
+    parser.add_argument('--threshold', type=float, default=0.2, help='regression 판단 비율 (기본값 0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    summary = run_benchmark(args.stacks, args.repeat, args.output_dir, args.skip_imports)
+    _print_summary(summary)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            regressions = compare(summary, json.load(stream), args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+from tests.benchmark import asset_hash_bench
+
+
+def test_run_benchmark_small_file():
+    result = asset_hash_bench.run_benchmark(size_mb=2, repeat=1)
+
+    assert result['size_mb'] == 2
+    assert set(result) == {'size_mb', 'cache_miss_s', 'cache_hit_s', 'cache_hit_in_process_s', 'cdk_fingerprint_s'}
+    assert result['cache_hit_in_process_s'] <= result['cache_miss_s']
@@ -0,0 +1,41 @@
+import json
+import os
+
+from tests.benchmark import synth_bench
+
+
+def test_run_benchmark_writes_summary_and_profiles(tmp_path):
+    summary = synth_bench.run_benchmark(['S3ObjUpload'], repeat=1, out_dir=str(tmp_path), skip_imports=True)
+
+    result = summary['stacks']['S3ObjUpload']
+    assert set(result) == {'construct_s', 'synth_s', 'total_s'}
+    with open(tmp_path / 'summary.json') as stream:
+        assert json.load(stream)['stacks'] == summary['stacks']
+    assert os.path.exists(tmp_path / 'S3ObjUpload.construct.pstats')
+    assert os.path.exists(tmp_path / 'S3ObjUpload.synth.pstats')
+
+
+def test_compare_reports_regressions_over_threshold():
+    baseline = {'stacks': {'EbStack': {'construct_s': 1.0, 'synth_s': 1.0, 'total_s': 2.0}}}
+    current = {'stacks': {'EbStack': {'construct_s': 1.5, 'synth_s': 1.1, 'total_s': 2.6}}}
+
+    regressions = synth_bench.compare(current, baseline, threshold=0.2)
+    assert [line.split(':')[0] for line in regressions] == ['EbStack.construct_s', 'EbStack.total_s']
+
+
+def test_compare_reports_newly_failing_stacks():
+    baseline = {'stacks': {
+        'EbStack': {'construct_s': 1.0, 'synth_s': 1.0, 'total_s': 2.0},
+        'JwApp': {'error': 'KeyError: vpc'},
+    }}
+    current = {'stacks': {
+        'EbStack': {'error': 'ValueError: unknown stack'},
+        'JwApp': {'error': 'KeyError: vpc'},
+        'S3ObjUpload': {'error': 'KeyError: bucket'},
+    }}
+
+    regressions = synth_bench.compare(current, baseline, threshold=0.2)
+    assert regressions == [
+        'EbStack: synth failed (ValueError: unknown stack)',
+        'S3ObjUpload: synth failed (KeyError: bucket)',
+    ]
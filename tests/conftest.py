@@ -0,0 +1,64 @@
+import json
+from configparser import ConfigParser
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+
+from iac_aws_cdk.asset_cache import CACHE_DIR_ENV_VAR
+from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY
+from iac_aws_cdk.source_bundle import OUTPUT_DIR_ENV_VAR
+from iac_aws_cdk.stack_registry import build_stacks
+from tests.fixture_paths import FIXTURE_CONFIG, FIXTURE_CONTEXT
+
+
+def pytest_addoption(parser):
+    parser.addoption('--snapshot-update', action='store_true',
+                     help='tests/snapshots/*.template.json을 현재 synth 결과로 다시 저장')
+
+
+@pytest.fixture(autouse=True)
+def asset_cache_dir(tmp_path, monkeypatch):
+    """asset fingerprint cache를 test마다 분리"""
+    path = tmp_path / 'asset-cache'
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(path))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def source_bundle_dir(tmp_path, monkeypatch):
+    """eb source bundle zip / manifest를 test마다 분리"""
+    path = tmp_path / 'source-bundle'
+    monkeypatch.setenv(OUTPUT_DIR_ENV_VAR, str(path))
+    return path
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """fixture config를 복사하고 {section: {key: value}}로 덮어쓴 ini 경로"""
+    def _make_config(overrides=None, name='prod.ini'):
+        parser = ConfigParser()
+        parser.read(FIXTURE_CONFIG)
+        for section, values in (overrides or {}).items():
+            if not parser.has_section(section):
+                parser.add_section(section)
+            for key, value in values.items():
+                parser.set(section, key, str(value))
+        path = tmp_path / name
+        with open(path, 'w') as stream:
+            parser.write(stream)
+        return str(path)
+    return _make_config
+
+
+@pytest.fixture
+def synth_template():
+    """stack 하나(+ 의존 stack)를 fixture context로 생성해서 assertions.Template 반환"""
+    with open(FIXTURE_CONTEXT) as stream:
+        context = json.load(stream)
+
+    def _synth_template(stack_name, config_path=FIXTURE_CONFIG):
+        app = core.App(context={**context, CONFIG_CONTEXT_KEY: config_path})
+        stacks = build_stacks(app, [stack_name])
+        return assertions.Template.from_stack(stacks[stack_name])
+    return _synth_template
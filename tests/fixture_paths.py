@@ -0,0 +1,8 @@
+"""tests/fixtures 경로 (conftest, unit test, benchmark 공용)
+fixture config / cdk.context.json(lookup)을 사용하면 네트워크 없이 synth할 수 있다.
+"""
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURE_CONFIG = os.path.join(FIXTURES_DIR, 'config', 'prod.ini')
+FIXTURE_CONTEXT = os.path.join(FIXTURES_DIR, 'cdk.context.json')
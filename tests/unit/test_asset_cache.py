@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+import aws_cdk as core
+
+from iac_aws_cdk import asset_cache
+from iac_aws_cdk.asset_cache import FingerprintCache, asset_hash_props
+
+
+def _write(path, content):
+    with open(path, 'wb') as stream:
+        stream.write(content)
+
+
+def test_fingerprint_is_cached_by_stat(tmp_path):
+    asset = tmp_path / 'bundle.zip'
+    _write(asset, b'v1')
+    cache = FingerprintCache(str(tmp_path / 'cache'))
+
+    assert cache.fingerprint(str(asset)) == hashlib.sha256(b'v1').hexdigest()
+    assert cache.fingerprint(str(asset)) == hashlib.sha256(b'v1').hexdigest()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 다른 process (새 FingerprintCache)도 저장된 값을 사용
+    other = FingerprintCache(str(tmp_path / 'cache'))
+    other.fingerprint(str(asset))
+    assert (other.hits, other.misses) == (1, 0)
+    with open(tmp_path / 'cache' / asset_cache.CACHE_FILE) as stream:
+        entry, = json.load(stream).values()
+    assert set(entry) == {'size', 'mtime_ns', 'inode', 'sha256'}
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    asset = tmp_path / 'bundle.zip'
+    _write(asset, b'v1')
+    cache = FingerprintCache(str(tmp_path / 'cache'))
+    cache.fingerprint(str(asset))
+
+    # 크기가 같고 mtime도 되돌려도 inode가 바뀌면 (새 파일로 교체) 다시 계산
+    stat = os.stat(asset)
+    replacement = tmp_path / 'new.zip'
+    _write(replacement, b'v2')
+    os.replace(replacement, asset)
+    os.utime(asset, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.fingerprint(str(asset)) == hashlib.sha256(b'v2').hexdigest()
+
+    # 같은 파일을 수정 (mtime 변경)
+    _write(asset, b'v3')
+    os.utime(asset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.fingerprint(str(asset)) == hashlib.sha256(b'v3').hexdigest()
+    assert cache.misses == 3
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    asset = tmp_path / 'bundle.zip'
+    _write(asset, b'v1')
+    os.makedirs(tmp_path / 'cache')
+    _write(tmp_path / 'cache' / asset_cache.CACHE_FILE, b'{not json')
+
+    assert FingerprintCache(str(tmp_path / 'cache')).fingerprint(str(asset)) == hashlib.sha256(b'v1').hexdigest()
+
+
+def test_asset_hash_props(tmp_path):
+    asset = tmp_path / 'bundle.zip'
+    _write(asset, b'v1')
+
+    props = asset_hash_props(str(asset), str(tmp_path / 'cache'))
+    assert props == {'asset_hash': hashlib.sha256(b'v1').hexdigest(), 'asset_hash_type': core.AssetHashType.CUSTOM}
@@ -0,0 +1,189 @@
+import aws_cdk.assertions as assertions
+
+
+def test_full_crawl_by_default(synth_template):
+    template = synth_template('BoxOfficeMojo')
+
+    template.has_resource_properties('AWS::Glue::Crawler', {
+        'RecrawlPolicy': {'RecrawlBehavior': 'CRAWL_EVERYTHING'},
+        'SchemaChangePolicy': assertions.Match.absent(),
+        'Targets': {'S3Targets': [assertions.Match.object_equals({
+            'Path': assertions.Match.any_value()
+        })]}
+    })
+    template.resource_count_is('AWS::SQS::Queue', 0)
+    template.resource_count_is('Custom::S3BucketNotifications', 0)
+
+
+def test_event_mode_crawls_from_sqs(synth_template, make_config):
+    template = synth_template('BoxOfficeMojo', make_config({'box_office_mojo': {'crawl_mode': 'event'}}))
+
+    template.resource_count_is('AWS::SQS::Queue', 2)
+    queue = template.find_resources('AWS::SQS::Queue', {
+        'Properties': {'QueueName': 'glue-crawler-event-queue'}
+    })
+    dlq = template.find_resources('AWS::SQS::Queue', {
+        'Properties': {'QueueName': 'glue-crawler-event-dlq'}
+    })
+    queue_id, = queue
+    dlq_id, = dlq
+
+    template.has_resource_properties('AWS::Glue::Crawler', {
+        'RecrawlPolicy': {'RecrawlBehavior': 'CRAWL_EVENT_MODE'},
+        'SchemaChangePolicy': {'DeleteBehavior': 'LOG', 'UpdateBehavior': 'UPDATE_IN_DATABASE'},
+        'Targets': {'S3Targets': [{
+            'Path': assertions.Match.any_value(),
+            'EventQueueArn': {'Fn::GetAtt': [queue_id, 'Arn']},
+            'DlqEventQueueArn': {'Fn::GetAtt': [dlq_id, 'Arn']}
+        }]}
+    })
+    template.has_resource_properties('Custom::S3BucketNotifications', {
+        'NotificationConfiguration': {'QueueConfigurations': [{
+            'Events': ['s3:ObjectCreated:*'],
+            'Filter': {'Key': {'FilterRules': [{'Name': 'prefix', 'Value': 'mojo/'}]}},
+            'QueueArn': {'Fn::GetAtt': [queue_id, 'Arn']}
+        }]}
+    })
+
+
+def test_event_mode_grants_glue_role_queue_access(synth_template, make_config):
+    template = synth_template('BoxOfficeMojo', make_config({'box_office_mojo': {'crawl_mode': 'event'}}))
+
+    role_id, = template.find_resources('AWS::IAM::Role', {
+        'Properties': {'RoleName': 'AWSGlueServiceRoleDefault'}
+    })
+    template.has_resource_properties('AWS::IAM::Policy', {
+        'PolicyName': 'AWSGlueServiceRoleDefaultEventPolicy',
+        'Roles': [{'Ref': role_id}],
+        'PolicyDocument': {'Statement': [assertions.Match.object_like({
+            'Action': assertions.Match.array_with(['sqs:DeleteMessage', 'sqs:ReceiveMessage']),
+            'Effect': 'Allow'
+        })]}
+    })
+    crawler, = template.find_resources('AWS::Glue::Crawler').values()
+    assert any(dep.startswith('AWSGlueServiceRoleDefaultEventPolicy') for dep in crawler['DependsOn'])
+
+
+def test_partition_projection_table(synth_template, make_config):
+    template = synth_template('BoxOfficeMojo', make_config({'box_office_mojo': {
+        'partition_projection': 'true',
+        'partition_projection_from': '2021-06-01'
+    }}))
+
+    template.has_resource_properties('AWS::Glue::Table', {
+        'DatabaseName': 'glue-test-database',
+        'TableInput': {
+            'Name': 'box_office_mojo',
+            'PartitionKeys': [{'Name': 'dt', 'Type': 'string'}],
+            'Parameters': assertions.Match.object_like({
+                'projection.enabled': 'true',
+                'projection.dt.type': 'date',
+                'projection.dt.range': '2021-06-01,NOW',
+                'storage.location.template': {'Fn::Join': ['', [
+                    's3://', {'Ref': assertions.Match.any_value()}, '/mojo/dt=${dt}/'
+                ]]}
+            })
+        }
+    })
+
+
+def test_no_projection_table_by_default(synth_template):
+    synth_template('BoxOfficeMojo').resource_count_is('AWS::Glue::Table', 0)
+
+
+def test_compaction_job_runs_after_crawler(synth_template, make_config):
+    template = synth_template('BoxOfficeMojo', make_config({'box_office_mojo': {
+        'compaction_job': 'true',
+        'compaction_target_file_size_mb': '64'
+    }}))
+
+    job_id, = template.find_resources('AWS::Glue::Job')
+    crawler_id, = template.find_resources('AWS::Glue::Crawler')
+    template.has_resource_properties('AWS::Glue::Job', {
+        'Command': {'Name': 'glueetl', 'PythonVersion': '3', 'ScriptLocation': assertions.Match.any_value()},
+        'DefaultArguments': assertions.Match.object_like({
+            '--job-bookmark-option': 'job-bookmark-enable',
+            '--source_table': 'mojo',
+            '--target_file_size_mb': '64'
+        })
+    })
+    template.has_resource_properties('AWS::Glue::Trigger', {
+        'Type': 'CONDITIONAL',
+        'StartOnCreation': True,
+        'Predicate': {'Conditions': [{
+            'CrawlerName': {'Ref': crawler_id}, 'CrawlState': 'SUCCEEDED', 'LogicalOperator': 'EQUALS'
+        }]},
+        'Actions': [{'JobName': {'Ref': job_id}}]
+    })
+    template.has_resource_properties('AWS::Glue::Table', {
+        'TableInput': assertions.Match.object_like({
+            'Name': 'box_office_mojo_curated',
+            'Parameters': assertions.Match.object_like({'classification': 'parquet'})
+        })
+    })
+
+
+def test_default_athena_workgroup(synth_template):
+    template = synth_template('BoxOfficeMojo')
+
+    # 기본값은 기존 AthenaTestWorkGroup 그대로 (scan 제한 / engine 지정 / 결과 만료 없음)
+    template.resource_count_is('AWS::Athena::WorkGroup', 1)
+    template.has_resource_properties('AWS::Athena::WorkGroup', {
+        'Name': 'AthenaTestWorkGroup',
+        'State': 'ENABLED',
+        'WorkGroupConfiguration': {
+            'PublishCloudWatchMetricsEnabled': True,
+            'ResultConfiguration': {'OutputLocation': {'Fn::Join': ['', [
+                's3://', {'Ref': assertions.Match.string_like_regexp('MojoAthenaQueryResult')}
+            ]]}}
+        }
+    })
+    workgroup, = template.find_resources('AWS::Athena::WorkGroup').values()
+    assert set(workgroup['Properties']) == {'Name', 'State', 'WorkGroupConfiguration'}
+    bucket, = template.find_resources('AWS::S3::Bucket', {
+        'Properties': {'BucketName': 'mojo-athena-query-result'}
+    }).values()
+    assert 'LifecycleConfiguration' not in bucket['Properties']
+
+
+def test_named_athena_workgroups(synth_template, make_config):
+    template = synth_template('BoxOfficeMojo', make_config({
+        'box_office_mojo': {'athena_workgroups': 'interactive, batch'},
+        'athena_workgroup.interactive': {
+            'bytes_scanned_cutoff_mb': '1024',
+            'engine_version': '3',
+            'enforce_configuration': 'true',
+            'result_reuse_max_age_minutes': '60',
+            'result_prefix': 'interactive',
+            'result_expiration_days': '1'
+        },
+        'athena_workgroup.batch': {
+            'bytes_scanned_cutoff_mb': '0',
+            'engine_version': '2',
+            'result_prefix': 'batch/'
+        }
+    }))
+
+    template.resource_count_is('AWS::Athena::WorkGroup', 2)
+    template.has_resource_properties('AWS::Athena::WorkGroup', {
+        'Name': 'interactive',
+        'WorkGroupConfiguration': assertions.Match.object_like({
+            'BytesScannedCutoffPerQuery': 1024 * 1000 * 1000,
+            'EnforceWorkGroupConfiguration': True,
+            'EngineVersion': {'SelectedEngineVersion': 'Athena engine version 3'}
+        }),
+        'Tags': [{'Key': 'result-reuse-max-age-minutes', 'Value': '60'}]
+    })
+    batch, = template.find_resources('AWS::Athena::WorkGroup', {'Properties': {'Name': 'batch'}}).values()
+    assert 'BytesScannedCutoffPerQuery' not in batch['Properties']['WorkGroupConfiguration']
+    assert batch['Properties']['WorkGroupConfiguration']['EngineVersion'] == {
+        'SelectedEngineVersion': 'Athena engine version 2'
+    }
+    output_location = batch['Properties']['WorkGroupConfiguration']['ResultConfiguration']['OutputLocation']
+    assert output_location['Fn::Join'][1][-1] == '/batch/'
+    template.has_resource_properties('AWS::S3::Bucket', {
+        'BucketName': 'mojo-athena-query-result',
+        'LifecycleConfiguration': {'Rules': [assertions.Match.object_like({
+            'Prefix': 'interactive/', 'ExpirationInDays': 1
+        })]}
+    })
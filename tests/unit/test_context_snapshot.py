@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+
+import aws_cdk as core
+import pytest
+
+from iac_aws_cdk import context_snapshot
+from iac_aws_cdk.context_snapshot import (
+    ContextSnapshotError,
+    MissingContext,
+    StandInProvider,
+    check_offline,
+    resolve_context,
+    snapshot_context,
+)
+from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY
+from iac_aws_cdk.stack_registry import build_stacks
+from tests.fixture_paths import FIXTURE_CONFIG, FIXTURE_CONTEXT, FIXTURES_DIR
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+FIXTURE_LOOKUPS = os.path.join(FIXTURES_DIR, 'context_lookups.json')
+
+VPC_LOOKUP = MissingContext(
+    'vpc-provider:account=1:filter.vpc-id=vpc-1:region=r:returnAsymmetricSubnets=true',
+    'vpc-provider',
+    {'account': '1', 'region': 'r', 'filter': {'vpc-id': 'vpc-1'}, 'returnAsymmetricSubnets': True}
+)
+
+
+def test_stand_in_provider_matches_partial_props():
+    provider = StandInProvider([
+        {'provider': 'vpc-provider', 'props': {'filter': {'vpc-id': 'vpc-2'}}, 'value': 'other'},
+        {'provider': 'vpc-provider', 'props': {'filter': {'vpc-id': 'vpc-1'}}, 'value': 'vpc'},
+    ])
+
+    assert provider.lookup(VPC_LOOKUP) == 'vpc'
+    assert provider.lookup(VPC_LOOKUP._replace(provider='ami')) is None
+
+
+def test_replay_fixture_matches_recorded_context():
+    # stand-in provider만으로 전체 stack의 lookup을 채울 수 있어야 한다.
+    resolved = resolve_context(StandInProvider.from_file(FIXTURE_LOOKUPS), config=FIXTURE_CONFIG)
+
+    with open(FIXTURE_CONTEXT) as stream:
+        assert resolved == json.load(stream)
+
+
+def test_unresolved_lookup():
+    with pytest.raises(ContextSnapshotError, match='vpc-provider'):
+        resolve_context(StandInProvider([]), config=FIXTURE_CONFIG, stacks=['EcsTask'])
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path = tmp_path / context_snapshot.CONTEXT_DIR
+    with open(FIXTURE_CONTEXT) as stream:
+        context = json.load(stream)
+    context_snapshot.write_snapshot(context_snapshot.snapshot_path('prod'), context)
+    return tmp_path
+
+
+def test_snapshot_context_env(snapshot_dir, monkeypatch):
+    assert len(snapshot_context()) == 4
+    # cdk CLI의 -c env=stage
+    monkeypatch.setenv(context_snapshot.CLI_CONTEXT_ENV_VAR, json.dumps({'env': 'stage'}))
+    assert snapshot_context() == {}
+
+
+def test_snapshot_context_keeps_cli_context(snapshot_dir):
+    key, = [key for key in snapshot_context() if key.startswith('availability-zones')]
+    # jsii runtime은 process를 시작할 때의 환경변수를 읽으므로 cdk CLI처럼 새 process에서 확인
+    script = (
+        'import aws_cdk, json, sys; from iac_aws_cdk.context_snapshot import snapshot_context; '
+        'app = aws_cdk.App(context=snapshot_context()); '
+        'print(json.dumps([app.node.try_get_context(key) for key in sys.argv[1:]]))'
+    )
+    other_key, = [key for key in snapshot_context() if key.startswith('ami')]
+    result = subprocess.run(
+        [sys.executable, '-c', script, key, other_key],
+        cwd=str(snapshot_dir.parent), capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONPATH': PROJECT_DIR, context_snapshot.CLI_CONTEXT_ENV_VAR: json.dumps({key: ['cli-az']})}
+    )
+
+    assert json.loads(result.stdout) == [['cli-az'], snapshot_context()[other_key]]
+
+
+def _synth(context, outdir):
+    app = core.App(outdir=outdir, context={**context, CONFIG_CONTEXT_KEY: FIXTURE_CONFIG})
+    build_stacks(app, ['EcsTask'])
+    return app, app.synth()
+
+
+def test_offline_synth(snapshot_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv(context_snapshot.OFFLINE_ENV_VAR, '1')
+    check_offline(*_synth(snapshot_context(), str(tmp_path / 'cdk.out')))
+
+    # snapshot이 없는 환경
+    with pytest.raises(ContextSnapshotError, match='stage.context.json'):
+        check_offline(*_synth({'env': 'stage', **snapshot_context('stage')}, str(tmp_path / 'cdk.out.stage')))
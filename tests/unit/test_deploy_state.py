@@ -0,0 +1,140 @@
+import io
+import json
+
+import aws_cdk as core
+import pytest
+
+from iac_aws_cdk.deploy_state import DeployState, LocalState, S3State, SsmParameters, stack_fingerprints
+from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY
+from iac_aws_cdk.stack_registry import build_stacks
+from tests.fixture_paths import FIXTURE_CONTEXT
+
+STACKS = ['BoxOfficeMojo', 'EbStack']
+
+
+@pytest.fixture
+def synth_assembly(tmp_path):
+    with open(FIXTURE_CONTEXT) as stream:
+        context = json.load(stream)
+
+    def _synth_assembly(config_path, name, stacks=STACKS):
+        outdir = str(tmp_path / name)
+        app = core.App(outdir=outdir, context={**context, CONFIG_CONTEXT_KEY: config_path})
+        build_stacks(app, stacks)
+        app.synth()
+        return outdir
+    return _synth_assembly
+
+
+def test_fingerprints_follow_template_changes(make_config, synth_assembly):
+    before = stack_fingerprints(synth_assembly(make_config(), 'first'))
+    again = stack_fingerprints(synth_assembly(make_config(name='again.ini'), 'again'))
+    changed = stack_fingerprints(synth_assembly(
+        make_config({'box_office_mojo': {'crawl_mode': 'event'}}, name='changed.ini'), 'changed'
+    ))
+
+    assert set(before) == {'BoxOfficeMojo', 'EbNetworkStack', 'EbStack'}
+    # 같은 설정이면 synth할 때마다 같은 값 (EbStack의 source bundle asset 포함)
+    assert again == before
+    assert {name for name in before if changed[name] != before[name]} == {'BoxOfficeMojo'}
+
+
+def test_fingerprints_follow_ssm_parameter_values(make_config, synth_assembly):
+    # pipeline이 SSM parameter의 AMI id만 바꾸면 template은 그대로
+    outdir = synth_assembly(make_config({'pub_ec2_test': {'ami_from_ssm': 'true'}}), 'ssm', ['PubEc2Test'])
+    values = {'/imagebuilder/word-press/ami-id': 'ami-0000000000000000a'}
+    lookups = []
+
+    def resolve(environment, name):
+        lookups.append((environment, name))
+        return values[name]
+
+    before = stack_fingerprints(outdir, resolve)
+    values['/imagebuilder/word-press/ami-id'] = 'ami-0000000000000000b'
+    after = stack_fingerprints(outdir, resolve)
+
+    assert before['PubEc2Test'] != after['PubEc2Test']
+    assert before['WordPressImage'] == after['WordPressImage']
+    # bootstrap version parameter는 읽지 않는다.
+    assert {name for _, name in lookups} == {'/imagebuilder/word-press/ami-id'}
+
+
+class FakeSsm:
+    class exceptions:
+        class ParameterNotFound(Exception):
+            pass
+
+    def __init__(self, region, values):
+        self.region = region
+        self.values = values
+        self.calls = 0
+
+    def get_parameter(self, Name):
+        self.calls += 1
+        if Name not in self.values:
+            raise self.exceptions.ParameterNotFound(Name)
+        return {'Parameter': {'Name': Name, 'Value': self.values[Name]}}
+
+
+def test_ssm_parameters_by_stack_region():
+    clients = {}
+
+    def client_factory(region):
+        clients[region] = FakeSsm(region, {'/ami': f'ami-{region}'})
+        return clients[region]
+
+    parameters = SsmParameters(client_factory=client_factory)
+    assert parameters('aws://123456789012/ap-northeast-2', '/ami') == 'ami-ap-northeast-2'
+    assert parameters('aws://123456789012/ap-northeast-2', '/ami') == 'ami-ap-northeast-2'
+    assert parameters('aws://unknown-account/unknown-region', '/ami') == 'ami-None'
+    assert parameters('aws://123456789012/ap-northeast-2', '/missing') is None
+    assert clients['ap-northeast-2'].calls == 2
+
+
+def test_local_state(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state = LocalState(path)
+    assert state.unchanged({'A': 'a1', 'B': 'b1'}) == {}
+
+    state.record('A', 'a1')
+    state.record('B', 'b1')
+
+    reloaded = LocalState(path)
+    assert reloaded.unchanged({'A': 'a1', 'B': 'b2', 'C': 'c1'}) == {'A': 'a1'}
+    assert set(reloaded.records['A']) == {'fingerprint', 'deployed_at'}
+
+
+def test_state_store_must_implement_read_and_write():
+    class ReadOnlyState(DeployState):
+        def _read(self):
+            return {}
+
+    with pytest.raises(TypeError, match='_write'):
+        ReadOnlyState()
+
+
+class FakeS3:
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        return {'Body': io.BytesIO(self.objects[Bucket, Key])}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Bucket, Key] = Body
+
+
+def test_s3_state():
+    client = FakeS3()
+    S3State('s3://deploy-state/prod/stacks.json', client=client).record('A', 'a1')
+
+    assert list(client.objects) == [('deploy-state', 'prod/stacks.json')]
+    assert S3State('s3://deploy-state/prod/stacks.json', client=client).unchanged({'A': 'a1'}) == {'A': 'a1'}
+    with pytest.raises(ValueError):
+        S3State('s3://deploy-state', client=client)
@@ -0,0 +1,99 @@
+import pytest
+
+from iac_aws_cdk.eb_capacity import EbCapacityProfile, instance_architecture
+from iac_aws_cdk.settings import SettingsError, load_settings
+
+
+def _options(profile):
+    return {(namespace, name): value for namespace, name, value in profile.options()}
+
+
+def test_instance_architecture():
+    assert instance_architecture('t3.micro') == 'x86_64'
+    assert instance_architecture('t4g.small') == 'arm64'
+    assert instance_architecture('c7gn.large') == 'arm64'
+    assert instance_architecture('m6gd.xlarge') == 'arm64'
+    assert instance_architecture('g4dn.xlarge') == 'x86_64'
+
+
+def test_default_profile_from_settings(make_config):
+    profile = EbCapacityProfile.from_settings(load_settings(make_config()).eb_stack)
+
+    assert profile.options() == [
+        ('aws:ec2:instances', 'InstanceTypes', 't3.micro'),
+        ('aws:ec2:instances', 'SupportedArchitectures', 'x86_64'),
+        ('aws:autoscaling:asg', 'MinSize', '1'),
+        ('aws:autoscaling:asg', 'MaxSize', '4'),
+        ('aws:autoscaling:trigger', 'MeasureName', 'CPUUtilization'),
+        ('aws:autoscaling:trigger', 'Statistic', 'Average'),
+        ('aws:autoscaling:trigger', 'Unit', 'Percent'),
+        ('aws:autoscaling:trigger', 'UpperThreshold', '70'),
+        ('aws:autoscaling:trigger', 'LowerThreshold', '30'),
+        ('aws:autoscaling:trigger', 'BreachDuration', '5'),
+        ('aws:autoscaling:trigger', 'UpperBreachScaleIncrement', '1'),
+        ('aws:autoscaling:trigger', 'LowerBreachScaleIncrement', '-1'),
+        ('aws:elasticbeanstalk:command', 'DeploymentPolicy', 'Rolling'),
+        ('aws:elasticbeanstalk:command', 'BatchSizeType', 'Percentage'),
+        ('aws:elasticbeanstalk:command', 'BatchSize', '30'),
+        ('aws:elasticbeanstalk:healthreporting:system', 'SystemType', 'basic'),
+    ]
+
+
+def test_graviton_latency_profile(make_config):
+    settings = load_settings(make_config({'eb_stack': {
+        'instance_types': 't4g.small, t4g.medium',
+        'min_size': '2',
+        'max_size': '8',
+        'scaling_metric': 'latency',
+        'scaling_upper_threshold': '0.5',
+        'deployment_batch_size': '1',
+        'deployment_batch_size_type': 'Fixed',
+        'health_reporting': 'enhanced',
+    }}, name='graviton.ini')).eb_stack
+    options = _options(EbCapacityProfile.from_settings(settings))
+
+    assert options[('aws:ec2:instances', 'InstanceTypes')] == 't4g.small,t4g.medium'
+    assert options[('aws:ec2:instances', 'SupportedArchitectures')] == 'arm64'
+    assert options[('aws:autoscaling:asg', 'MinSize')] == '2'
+    assert options[('aws:autoscaling:asg', 'MaxSize')] == '8'
+    assert options[('aws:autoscaling:trigger', 'MeasureName')] == 'TargetResponseTime'
+    assert options[('aws:autoscaling:trigger', 'Unit')] == 'Seconds'
+    assert options[('aws:autoscaling:trigger', 'UpperThreshold')] == '0.5'
+    assert options[('aws:autoscaling:trigger', 'LowerThreshold')] == '0.3'
+    assert options[('aws:elasticbeanstalk:command', 'BatchSizeType')] == 'Fixed'
+    assert options[('aws:elasticbeanstalk:command', 'BatchSize')] == '1'
+    assert options[('aws:elasticbeanstalk:healthreporting:system', 'SystemType')] == 'enhanced'
+
+
+def test_request_count_profile():
+    profile = EbCapacityProfile(('m5.large',), scaling_metric='request_count', upper_threshold=2000)
+    options = _options(profile)
+
+    assert options[('aws:autoscaling:trigger', 'MeasureName')] == 'RequestCount'
+    assert options[('aws:autoscaling:trigger', 'Statistic')] == 'Sum'
+    assert options[('aws:autoscaling:trigger', 'UpperThreshold')] == '2000'
+    assert options[('aws:autoscaling:trigger', 'LowerThreshold')] == '1000'
+    assert len(profile.option_settings()) == len(profile.options())
+
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'instance_types': 't3.micro, t4g.micro'}, 'mixes architectures'),
+    ({'min_size': '3', 'max_size': '2'}, 'min_size/max_size: 3/2'),
+    ({'scaling_lower_threshold': '80'}, 'not below upper threshold'),
+    ({'deployment_batch_size': '0'}, 'deployment_batch_size'),
+])
+def test_invalid_profile(make_config, overrides, message):
+    # construct를 만들기 전에 설정 파일의 다른 오류와 함께 보고된다.
+    with pytest.raises(SettingsError, match=rf'\[eb_stack\] .*{message}'):
+        load_settings(make_config({'eb_stack': overrides}, name='invalid.ini'))
+
+
+def test_invalid_profile_collects_errors(make_config):
+    config = make_config({'eb_stack': {
+        'min_size': '3', 'max_size': '2', 'deployment_batch_size': '0'
+    }}, name='invalid.ini')
+
+    with pytest.raises(SettingsError) as excinfo:
+        load_settings(config)
+    assert 'min_size/max_size' in str(excinfo.value)
+    assert 'deployment_batch_size' in str(excinfo.value)
@@ -0,0 +1,192 @@
+import os
+import shutil
+
+import aws_cdk.assertions as assertions
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'eb_app')
+
+
+def _environment_option(template, namespace, option_name):
+    environment, = template.find_resources('AWS::ElasticBeanstalk::Environment').values()
+    values = [
+        option['Value'] for option in environment['Properties']['OptionSettings']
+        if option['Namespace'] == namespace and option['OptionName'] == option_name
+    ]
+    return values[0] if values else None
+
+
+def test_capacity_option_settings(synth_template):
+    template = synth_template('EbStack')
+
+    assert _environment_option(template, 'aws:ec2:instances', 'InstanceTypes') == 't3.micro'
+    assert _environment_option(template, 'aws:autoscaling:asg', 'MaxSize') == '4'
+    assert _environment_option(template, 'aws:autoscaling:trigger', 'MeasureName') == 'CPUUtilization'
+    assert _environment_option(template, 'aws:elasticbeanstalk:healthreporting:system', 'SystemType') == 'basic'
+    assert _environment_option(template, 'aws:elasticbeanstalk:environment', 'ServiceRole') is None
+
+
+def test_enhanced_health_service_role(synth_template, make_config):
+    template = synth_template('EbStack', make_config({'eb_stack': {'health_reporting': 'enhanced'}}))
+
+    template.has_resource_properties('AWS::IAM::Role', {
+        'AssumeRolePolicyDocument': assertions.Match.object_like({
+            'Statement': [assertions.Match.object_like({
+                'Principal': {'Service': 'elasticbeanstalk.amazonaws.com'}
+            })]
+        })
+    })
+    service_role = _environment_option(template, 'aws:elasticbeanstalk:environment', 'ServiceRole')
+    assert service_role['Fn::GetAtt'][1] == 'Arn'
+
+
+def test_no_db_proxy_by_default(synth_template):
+    template = synth_template('EbStack')
+
+    template.resource_count_is('AWS::RDS::DBProxy', 0)
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_WRITER_HOST') == {
+        'Fn::GetAtt': ['rdsinstance', 'Endpoint.Address']
+    }
+    template.resource_count_is('AWS::SecretsManager::Secret', 1)
+    template.has_resource_properties('AWS::SecretsManager::Secret', {
+        'GenerateSecretString': assertions.Match.object_like({
+            'GenerateStringKey': 'db-master-user-password',
+            'SecretStringTemplate': '{"db-master-username": "tutorial_user"}'
+        })
+    })
+
+
+def test_db_proxy(synth_template, make_config):
+    template = synth_template('EbStack', make_config({'eb_stack': {
+        'db_proxy': 'true',
+        'db_proxy_max_connections_percent': '75'
+    }}))
+
+    # master user secret은 proxy를 켜도 그대로 (password가 다시 생성되지 않는다)
+    master_secret_id, = template.find_resources('AWS::SecretsManager::Secret', {
+        'Properties': {'Name': 'db-master-user-password'}
+    })
+    default_secrets = synth_template('EbStack').find_resources('AWS::SecretsManager::Secret')
+    assert template.find_resources('AWS::SecretsManager::Secret')[master_secret_id] == default_secrets[master_secret_id]
+    # proxy는 username / password key를 가진 별도 secret을 읽는다.
+    proxy_secret_id, = template.find_resources('AWS::SecretsManager::Secret', {
+        'Properties': {'SecretString': assertions.Match.any_value()}
+    })
+    template.has_resource_properties('AWS::SecretsManager::Secret', {
+        'SecretString': {'Fn::Join': ['', [
+            '{"username":"tutorial_user","password":"{{resolve:secretsmanager:',
+            {'Ref': master_secret_id},
+            ':SecretString:db-master-user-password::}}"}'
+        ]]}
+    })
+    template.has_resource_properties('AWS::RDS::DBProxy', {
+        'EngineFamily': 'MYSQL',
+        'Auth': [{'AuthScheme': 'SECRETS', 'IAMAuth': 'DISABLED', 'SecretArn': {'Ref': proxy_secret_id}}],
+        'VpcSubnetIds': [assertions.Match.any_value(), assertions.Match.any_value()],
+        'VpcSecurityGroupIds': [assertions.Match.any_value()],
+        'RequireTLS': False
+    })
+    template.has_resource_properties('AWS::RDS::DBProxyTargetGroup', {
+        'TargetGroupName': 'default',
+        'DBInstanceIdentifiers': [{'Ref': assertions.Match.any_value()}],
+        'ConnectionPoolConfigurationInfo': {'MaxConnectionsPercent': 75, 'MaxIdleConnectionsPercent': 50}
+    })
+    template.has_resource_properties('AWS::RDS::DBInstance', {
+        'MasterUserPassword': {'Fn::Join': ['', assertions.Match.array_with([
+            ':SecretString:db-master-user-password::}}'
+        ])]}
+    })
+    # app은 DB_WRITER_HOST 하나로 proxy에 접속
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_WRITER_HOST') == {
+        'Fn::GetAtt': ['rdsproxy', 'Endpoint']
+    }
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_HOST') is None
+
+
+def test_read_replicas_and_storage(synth_template, make_config):
+    template = synth_template('EbStack', make_config({'eb_stack': {
+        'db_instance_class': 'db.m6g.large',
+        'db_storage_type': 'gp3',
+        'db_allocated_storage_gib': '400',
+        'db_iops': '12000',
+        'db_storage_throughput': '500',
+        'db_read_replicas': '3',
+        'db_replica_instance_class': 'db.r6g.large'
+    }}))
+
+    template.has_resource_properties('AWS::RDS::DBInstance', {
+        'DBInstanceClass': 'db.m6g.large',
+        'StorageType': 'gp3',
+        'AllocatedStorage': '400',
+        'Iops': 12000,
+        'StorageThroughput': 500,
+        'DBSubnetGroupName': 'sgp-rds-db'
+    })
+    replicas = template.find_resources('AWS::RDS::DBInstance', {
+        'Properties': {'SourceDBInstanceIdentifier': {'Ref': 'rdsinstance'}}
+    })
+    assert len(replicas) == 3
+    assert {replica['Properties']['DBInstanceClass'] for replica in replicas.values()} == {'db.r6g.large'}
+    # private-subnet1 / private-subnet2 az에 번갈아 생성
+    assert [replica['Properties']['AvailabilityZone'] for replica in replicas.values()] == [
+        'ap-northeast-2b', 'ap-northeast-2c', 'ap-northeast-2b'
+    ]
+
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_WRITER_HOST') == {
+        'Fn::GetAtt': ['rdsinstance', 'Endpoint.Address']
+    }
+    reader_hosts = _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_READER_HOSTS')
+    assert reader_hosts == {'Fn::Join': [',', [
+        {'Fn::GetAtt': [name, 'Endpoint.Address']} for name in replicas
+    ]]}
+
+
+def test_reader_falls_back_to_writer(synth_template):
+    template = synth_template('EbStack')
+
+    template.resource_count_is('AWS::RDS::DBInstance', 1)
+    template.has_resource_properties('AWS::RDS::DBInstance', {
+        'DBInstanceClass': 'db.t2.micro',
+        'StorageType': 'gp2',
+        'AllocatedStorage': '20'
+    })
+    writer = _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_WRITER_HOST')
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'DB_READER_HOSTS') == writer
+
+
+def test_cache_endpoint_in_environment(synth_template, make_config):
+    template = synth_template('EbStack', make_config({'eb_stack': {'cache': 'true'}}))
+
+    template.has_resource_properties('AWS::ElastiCache::ReplicationGroup', {
+        'Engine': 'redis',
+        'NumCacheClusters': 1,
+        'AutomaticFailoverEnabled': False
+    })
+    template.has_resource_properties('AWS::EC2::SecurityGroupIngress', {
+        'FromPort': 6379,
+        'SourceSecurityGroupId': {'Fn::ImportValue': assertions.Match.string_like_regexp('webserversecgroup')}
+    })
+    replication_group, = template.find_resources('AWS::ElastiCache::ReplicationGroup')
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'CACHE_HOST') == {
+        'Fn::GetAtt': [replication_group, 'PrimaryEndPoint.Address']
+    }
+    assert _environment_option(template, 'aws:elasticbeanstalk:application:environment', 'CACHE_PORT') == '6379'
+
+
+
+def _source_bundle_key(template):
+    version, = template.find_resources('AWS::ElasticBeanstalk::ApplicationVersion').values()
+    return version['Properties']['SourceBundle']['S3Key']
+
+
+def test_source_bundle_asset_hash(synth_template, make_config, tmp_path):
+    source_dir = tmp_path / 'app'
+    shutil.copytree(SOURCE_DIR, source_dir)
+    config_path = make_config({'eb_stack': {'source_dir': source_dir}})
+
+    first = _source_bundle_key(synth_template('EbStack', config_path))
+    os.utime(source_dir / 'application.py', (0, 0))
+    # 내용이 같으면 같은 asset (다시 upload하지 않음)
+    assert _source_bundle_key(synth_template('EbStack', config_path)) == first
+
+    (source_dir / 'application.py').write_text('changed\n')
+    assert _source_bundle_key(synth_template('EbStack', config_path)) != first
@@ -0,0 +1,217 @@
+import json
+
+import pytest
+import aws_cdk.assertions as assertions
+
+
+def _ecs_parameters(template):
+    rule, = template.find_resources('AWS::Events::Rule', {'Properties': {'Name': 'MySchedule'}}).values()
+    target, = rule['Properties']['Targets']
+    return target['EcsParameters']
+
+
+def test_default_task_size_and_launch_type(synth_template):
+    template = synth_template('EcsTask')
+
+    template.has_resource_properties('AWS::ECS::TaskDefinition', {
+        'Family': 'DeploymentExampleTask',
+        'Cpu': '256',
+        'Memory': '512',
+        'RuntimePlatform': {'OperatingSystemFamily': 'LINUX', 'CpuArchitecture': 'X86_64'}
+    })
+    ecs_parameters = _ecs_parameters(template)
+    assert ecs_parameters['LaunchType'] == 'FARGATE'
+    assert 'CapacityProviderStrategy' not in ecs_parameters
+
+
+def test_task_sizing_from_config(synth_template, make_config):
+    template = synth_template('EcsTask', make_config({'ecs_task': {
+        'task_cpu': '1024',
+        'task_memory_mib': '4096',
+        'task_ephemeral_storage_gib': '50',
+        'task_cpu_architecture': 'arm64'
+    }}))
+
+    template.has_resource_properties('AWS::ECS::TaskDefinition', {
+        'Cpu': '1024',
+        'Memory': '4096',
+        'EphemeralStorage': {'SizeInGiB': 50},
+        'RuntimePlatform': {'OperatingSystemFamily': 'LINUX', 'CpuArchitecture': 'ARM64'}
+    })
+
+
+def test_capacity_provider_strategy(synth_template, make_config):
+    template = synth_template('EcsTask', make_config({'ecs_task': {
+        'capacity_provider_strategy': 'FARGATE:1:1, FARGATE_SPOT:3'
+    }}))
+
+    ecs_parameters = _ecs_parameters(template)
+    assert 'LaunchType' not in ecs_parameters
+    assert ecs_parameters['CapacityProviderStrategy'] == [
+        {'CapacityProvider': 'FARGATE', 'Weight': 1, 'Base': 1},
+        {'CapacityProvider': 'FARGATE_SPOT', 'Weight': 3, 'Base': 0},
+    ]
+    template.has_resource_properties('AWS::ECS::ClusterCapacityProviderAssociations', {
+        'CapacityProviders': assertions.Match.array_with(['FARGATE', 'FARGATE_SPOT'])
+    })
+
+
+def test_backlog_scaling_steps():
+    from iac_aws_cdk.ecs_task import backlog_scaling_steps
+
+    steps = backlog_scaling_steps(max_tasks=10, messages_per_task=100)
+    assert [(step.lower, step.upper, step.change) for step in steps] == [
+        (None, 0, 0),
+        (1, None, 1),
+        (100, None, 2),
+        (200, None, 4),
+        (400, None, 8),
+        (800, None, 10),
+    ]
+    assert len(backlog_scaling_steps(max_tasks=1, messages_per_task=100)) == 2
+
+
+def test_queue_mode_scales_service_on_queue(synth_template, make_config):
+    template = synth_template('EcsTask', make_config({'ecs_task': {
+        'mode': 'queue',
+        'worker_max_tasks': '4',
+        'worker_messages_per_task': '50',
+        'worker_max_message_age_seconds': '120',
+        'capacity_provider_strategy': 'FARGATE_SPOT:1'
+    }}))
+
+    template.resource_count_is('AWS::Events::Rule', 0)
+    template.resource_count_is('AWS::SQS::Queue', 2)
+    template.has_resource_properties('AWS::ECS::Service', {
+        'DesiredCount': 0,
+        'CapacityProviderStrategy': [{'CapacityProvider': 'FARGATE_SPOT', 'Weight': 1, 'Base': 0}]
+    })
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalableTarget', {
+        'MinCapacity': 0,
+        'MaxCapacity': 4,
+        'ScalableDimension': 'ecs:service:DesiredCount'
+    })
+    template.has_resource_properties('AWS::ECS::TaskDefinition', {
+        'ContainerDefinitions': [assertions.Match.object_like({
+            'Command': ['python', '-m', 'src.run'],
+            'Environment': [{'Name': 'WORK_QUEUE_URL', 'Value': assertions.Match.any_value()}]
+        })]
+    })
+
+    # backlog: 0이면 0개 (scale to zero), 이후 1 -> 2 -> 4
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalingPolicy', {
+        'StepScalingPolicyConfiguration': {
+            'AdjustmentType': 'ExactCapacity',
+            'StepAdjustments': [{'MetricIntervalUpperBound': 0, 'ScalingAdjustment': 0}]
+        }
+    })
+    template.has_resource_properties('AWS::ApplicationAutoScaling::ScalingPolicy', {
+        'StepScalingPolicyConfiguration': assertions.Match.object_like({
+            'AdjustmentType': 'ExactCapacity',
+            'StepAdjustments': [
+                {'MetricIntervalLowerBound': 0, 'MetricIntervalUpperBound': 49, 'ScalingAdjustment': 1},
+                {'MetricIntervalLowerBound': 49, 'MetricIntervalUpperBound': 99, 'ScalingAdjustment': 2},
+                {'MetricIntervalLowerBound': 99, 'ScalingAdjustment': 4},
+            ]
+        })
+    })
+    template.has_resource_properties('AWS::CloudWatch::Alarm', {
+        'ComparisonOperator': 'LessThanOrEqualToThreshold',
+        'Threshold': 0,
+        'Metrics': assertions.Match.array_with([
+            assertions.Match.object_like({
+                'Expression': '(visible + in_flight) * IF(age >= 240, 4, IF(age >= 120, 2, 1))'
+            }),
+            assertions.Match.object_like({'Id': 'age', 'MetricStat': assertions.Match.object_like({
+                'Metric': assertions.Match.object_like({'MetricName': 'ApproximateAgeOfOldestMessage'})
+            })})
+        ])
+    })
+    # backlog와 message 나이를 policy 하나로 정한다. (step scaling은 upper / lower policy 2개)
+    template.resource_count_is('AWS::ApplicationAutoScaling::ScalingPolicy', 2)
+    template.resource_count_is('AWS::CloudWatch::Alarm', 2)
+
+
+def _desired_tasks(steps, value):
+    return [step.change for step in steps if (step.lower or 0) <= value][-1] if value > 0 else 0
+
+
+def test_message_age_raises_backlog_step():
+    from iac_aws_cdk.ecs_task import backlog_metric_expression, backlog_scaling_steps
+
+    steps = backlog_scaling_steps(max_tasks=10, messages_per_task=100)
+    expression = backlog_metric_expression(300)
+
+    def backlog_metric(visible, in_flight, age):
+        return eval(expression.replace('IF', '_if'), {'_if': lambda condition, yes, no: yes if condition else no},
+                    {'visible': visible, 'in_flight': in_flight, 'age': age})
+
+    assert _desired_tasks(steps, backlog_metric(150, 0, 10)) == 2
+    # 처리가 밀리면 task 수가 한 단계(2배)씩 늘고, queue가 비면 나이와 관계없이 0개
+    assert _desired_tasks(steps, backlog_metric(100, 50, 300)) == 4
+    assert _desired_tasks(steps, backlog_metric(150, 0, 600)) == 8
+    assert _desired_tasks(steps, backlog_metric(0, 0, 900)) == 0
+
+
+def test_invalid_mode(make_config):
+    from iac_aws_cdk.settings import SettingsError, load_settings
+
+    with pytest.raises(SettingsError, match='mode'):
+        load_settings(make_config({'ecs_task': {'mode': 'lambda'}}, name='invalid.ini'))
+
+
+def _container_definition(template):
+    task_definition, = template.find_resources('AWS::ECS::TaskDefinition').values()
+    container, = task_definition['Properties']['ContainerDefinitions']
+    return container
+
+
+def test_secrets_are_injected_into_container(synth_template, make_config):
+    template = synth_template('EcsTask', make_config({'ecs_task': {
+        'secrets': 'DB_USER=MyTestSecret:username, DB_PASSWORD=MyTestSecret:password, API_KEY=shared/api-key'
+    }}))
+
+    secrets = {secret['Name']: secret['ValueFrom'] for secret in _container_definition(template)['Secrets']}
+    # 같은 stack의 secret은 ref, json key는 <arn>:<key>::
+    secret_ref, = template.find_resources('AWS::SecretsManager::Secret', {'Properties': {'Name': 'MyTestSecret'}})
+    assert secrets['DB_PASSWORD'] == {'Fn::Join': ['', [{'Ref': secret_ref}, ':password::']]}
+    assert secrets['DB_USER']['Fn::Join'][1][1] == ':username::'
+    # 다른 stack의 secret은 이름으로 참조 (json key가 없으면 secret 전체)
+    assert ':secret:shared/api-key' in json.dumps(secrets['API_KEY'])
+    assert 'Environment' not in _container_definition(template)
+
+    # task 시작할 때 ecs agent가 읽으므로 execution role에 권한
+    execution_role_policies = template.find_resources('AWS::IAM::Policy', {'Properties': {
+        'PolicyName': assertions.Match.string_like_regexp('ExecutionRole'),
+    }})
+    statements = [statement for policy in execution_role_policies.values()
+                  for statement in policy['Properties']['PolicyDocument']['Statement']]
+    assert any('secretsmanager:GetSecretValue' in statement['Action'] for statement in statements)
+
+
+def test_secret_cache_in_queue_mode(synth_template, make_config):
+    template = synth_template('EcsTask', make_config({'ecs_task': {
+        'mode': 'queue',
+        'secrets': 'DB_PASSWORD=MyTestSecret:password',
+        'secret_cache_ttl_seconds': '600',
+    }}))
+
+    environment = {item['Name']: item['Value'] for item in _container_definition(template)['Environment']}
+    assert environment['SECRETS_CACHE_TTL_SECONDS'] == '600'
+    assert json.loads(environment['SECRET_SOURCES']) == {
+        'DB_PASSWORD': {'secret_id': 'MyTestSecret', 'field': 'password'}
+    }
+
+
+def test_secret_settings(make_config):
+    from iac_aws_cdk.settings import SettingsError, load_settings
+
+    settings = load_settings(make_config({'ecs_task': {'secrets': 'A=s1, B=s2:key'}}))
+    assert settings.ecs_task.secrets == (('A', 's1', ''), ('B', 's2', 'key'))
+
+    with pytest.raises(SettingsError, match='secrets'):
+        load_settings(make_config({'ecs_task': {'secrets': 'MyTestSecret'}}, name='invalid.ini'))
+    with pytest.raises(SettingsError, match='only used in queue mode'):
+        load_settings(make_config({'ecs_task': {
+            'secrets': 'A=s1', 'secret_cache_ttl_seconds': '60'
+        }}, name='cron.ini'))
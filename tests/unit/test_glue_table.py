@@ -0,0 +1,40 @@
+import pytest
+
+from iac_aws_cdk.glue_table import Column, CsvTableSchema, DateProjection, IntegerProjection, TableSchema
+
+
+def test_projection_parameters():
+    schema = CsvTableSchema(
+        name='events',
+        location='s3://bucket/events',
+        columns=(Column('id', 'bigint'),),
+        partitions=(
+            IntegerProjection('year', 2020, 2030),
+            IntegerProjection('month', 1, 12, digits=2),
+            DateProjection('dt', range_from='2020-01-01', range_to='NOW'),
+        )
+    )
+
+    params = schema.parameters()
+    assert params['projection.enabled'] == 'true'
+    assert params['storage.location.template'] == 's3://bucket/events/year=${year}/month=${month}/dt=${dt}/'
+    assert params['projection.year.type'] == 'integer'
+    assert params['projection.year.range'] == '2020,2030'
+    assert 'projection.year.digits' not in params
+    assert params['projection.month.digits'] == '2'
+    assert params['projection.dt.type'] == 'date'
+    assert params['projection.dt.range'] == '2020-01-01,NOW'
+    assert params['projection.dt.format'] == 'yyyy-MM-dd'
+    assert params['projection.dt.interval.unit'] == 'DAYS'
+
+
+def test_unpartitioned_table_has_no_projection():
+    schema = CsvTableSchema(name='plain', location='s3://bucket/plain', columns=(Column('id', 'bigint'),))
+
+    assert 'projection.enabled' not in schema.parameters()
+    assert schema.table_input().partition_keys == []
+
+
+def test_table_schema_needs_storage_format():
+    with pytest.raises(TypeError, match='storage_format'):
+        TableSchema(name='plain', location='s3://bucket/plain', columns=())
@@ -0,0 +1,105 @@
+import aws_cdk.assertions as assertions
+
+
+def _private_subnet_refs(template):
+    """JwPri subnet과 route table의 Ref 목록"""
+    subnets = template.find_resources('AWS::EC2::Subnet', {
+        'Properties': {'Tags': assertions.Match.array_with([{'Key': 'aws-cdk:subnet-name', 'Value': 'JwPri'}])}
+    })
+    route_tables = template.find_resources('AWS::EC2::RouteTable', {
+        'Properties': {'Tags': [{'Key': 'Name', 'Value': assertions.Match.string_like_regexp('JwPri')}]}
+    })
+    return [{'Ref': key} for key in sorted(subnets)], [{'Ref': key} for key in sorted(route_tables)]
+
+
+def _refs(values):
+    return sorted(values, key=lambda ref: ref['Ref'])
+
+
+def test_no_vpc_endpoints_by_default(synth_template):
+    synth_template('JwApp').resource_count_is('AWS::EC2::VPCEndpoint', 0)
+
+
+def test_vpc_endpoints_in_private_subnets(synth_template, make_config):
+    template = synth_template('JwApp', make_config({
+        'jw_app': {'vpc_endpoints': 's3,ecr.api,ecr.dkr,logs,secretsmanager'}
+    }))
+    subnet_refs, route_table_refs = _private_subnet_refs(template)
+    endpoint_sg_id, = template.find_resources('AWS::EC2::SecurityGroup', {
+        'Properties': {'GroupName': 'JwAppEndpointSg'}
+    })
+
+    template.resource_count_is('AWS::EC2::VPCEndpoint', 5)
+    s3, = template.find_resources('AWS::EC2::VPCEndpoint', {
+        'Properties': {'VpcEndpointType': 'Gateway'}
+    }).values()
+    assert _refs(s3['Properties']['RouteTableIds']) == route_table_refs
+    assert len(route_table_refs) == 2
+
+    interfaces = template.find_resources('AWS::EC2::VPCEndpoint', {
+        'Properties': {'VpcEndpointType': 'Interface'}
+    })
+    assert len(interfaces) == 4
+    for endpoint in interfaces.values():
+        properties = endpoint['Properties']
+        assert properties['PrivateDnsEnabled'] is True
+        assert _refs(properties['SubnetIds']) == subnet_refs
+        assert properties['SecurityGroupIds'] == [{'Fn::GetAtt': [endpoint_sg_id, 'GroupId']}]
+
+    template.has_resource_properties('AWS::EC2::SecurityGroup', {
+        'GroupName': 'JwAppEndpointSg',
+        'SecurityGroupIngress': [{
+            'CidrIp': {'Fn::GetAtt': [assertions.Match.any_value(), 'CidrBlock']},
+            'FromPort': 443, 'ToPort': 443, 'IpProtocol': 'tcp'
+        }]
+    })
+
+
+def test_gateway_endpoint_only_has_no_endpoint_sg(synth_template, make_config):
+    template = synth_template('JwApp', make_config({'jw_app': {'vpc_endpoints': 's3'}}))
+
+    template.resource_count_is('AWS::EC2::VPCEndpoint', 1)
+    assert not template.find_resources('AWS::EC2::SecurityGroup', {'Properties': {'GroupName': 'JwAppEndpointSg'}})
+
+
+def _private_default_routes(template):
+    return [
+        route['Properties'] for route in template.find_resources('AWS::EC2::Route', {
+            'Properties': {'DestinationCidrBlock': '0.0.0.0/0'}
+        }).values()
+        if 'GatewayId' not in route['Properties']
+    ]
+
+
+def test_nat_instance_per_az(synth_template, make_config):
+    template = synth_template('JwApp', make_config({'jw_app': {'nat_instance_type': 't3.small'}}))
+
+    template.resource_count_is('AWS::EC2::NatGateway', 0)
+    template.resource_count_is('AWS::EC2::Instance', 2)
+    for instance in template.find_resources('AWS::EC2::Instance').values():
+        assert instance['Properties']['InstanceType'] == 't3.small'
+        assert instance['Properties']['SourceDestCheck'] is False
+    routes = _private_default_routes(template)
+    assert len(routes) == 2
+    assert len({route['InstanceId']['Ref'] for route in routes}) == 2
+
+
+def test_nat_gateway_per_az(synth_template, make_config):
+    template = synth_template('JwApp', make_config({'jw_app': {'nat_mode': 'gateway', 'max_azs': '3'}}))
+
+    template.resource_count_is('AWS::EC2::Instance', 0)
+    template.resource_count_is('AWS::EC2::NatGateway', 3)
+    routes = _private_default_routes(template)
+    assert len(routes) == 3
+    assert len({route['NatGatewayId']['Ref'] for route in routes}) == 3
+
+
+def test_no_nat(synth_template, make_config):
+    template = synth_template('JwApp', make_config({'jw_app': {'nat_mode': 'none'}}))
+
+    template.resource_count_is('AWS::EC2::Instance', 0)
+    template.resource_count_is('AWS::EC2::NatGateway', 0)
+    assert _private_default_routes(template) == []
+    template.has_resource_properties('AWS::EC2::Subnet', {
+        'Tags': assertions.Match.array_with([{'Key': 'aws-cdk:subnet-type', 'Value': 'Isolated'}])
+    })
@@ -0,0 +1,165 @@
+import importlib.util
+import os
+import shutil
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'glue', 'mojo_csv_to_parquet.py')
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'mojo')
+
+spec = importlib.util.spec_from_file_location('mojo_csv_to_parquet', SCRIPT)
+job = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(job)
+
+
+def test_target_records_per_file():
+    mb = 1024 * 1024
+    # csv 1GB / 1M record -> parquet record당 약 268 byte (compression 0.25)
+    assert job.target_records_per_file(1024 * mb, 1000000, 128 * mb, compression_ratio=0.25) == 500000
+    assert job.target_records_per_file(1024 * mb, 1000000, 128 * mb, compression_ratio=1.0) == 125000
+    assert job.target_records_per_file(10, 1000, 128 * mb) >= 1
+    assert job.target_records_per_file(0, 0, 128 * mb) == 0
+    with pytest.raises(ValueError):
+        job.target_records_per_file(1, 1, 0)
+
+
+class FakeFrame:
+    """compact()가 쓰는 DataFrame API만 row(dict) list로 흉내 낸다 (spark / java 없이 실행)"""
+
+    def __init__(self, spark, rows):
+        self.spark = spark
+        self.rows = list(rows)
+        self.schema = 'schema'
+        self.partition_keys = None
+        self.options = {}
+
+    def inputFiles(self):
+        return [f'part-{index}.csv' for index in range(len(self.rows))]
+
+    def count(self):
+        return len(self.rows)
+
+    def select(self, *columns):
+        return FakeFrame(self.spark, [{column: row[column] for column in columns} for row in self.rows])
+
+    def distinct(self):
+        return FakeFrame(self.spark, [dict(items) for items in {tuple(sorted(row.items())) for row in self.rows}])
+
+    def join(self, other, on, how):
+        assert how == 'left_semi'
+        keys = {tuple(row[column] for column in on) for row in other.rows}
+        return FakeFrame(self.spark, [row for row in self.rows if tuple(row[column] for column in on) in keys])
+
+    def unionByName(self, other):
+        return FakeFrame(self.spark, self.rows + other.rows)
+
+    def localCheckpoint(self):
+        return FakeFrame(self.spark, self.rows)
+
+    def repartition(self, *columns):
+        return self
+
+    @property
+    def write(self):
+        return self
+
+    def mode(self, mode):
+        assert mode == 'overwrite'
+        return self
+
+    def partitionBy(self, *columns):
+        self.partition_keys = columns
+        return self
+
+    def option(self, key, value):
+        self.options[key] = value
+        return self
+
+    def parquet(self, path):
+        """dynamic overwrite: row가 있는 partition의 파일만 바꾼다."""
+        assert self.spark.conf['spark.sql.sources.partitionOverwriteMode'] == 'dynamic'
+        limit = self.options['maxRecordsPerFile'] or len(self.rows)
+        partitions = {}
+        for row in self.rows:
+            partitions.setdefault(tuple(row[column] for column in self.partition_keys), []).append(row)
+        files = self.spark.files.setdefault(path, {})
+        for key, rows in partitions.items():
+            files[key] = [rows[index:index + limit] for index in range(0, len(rows), limit)]
+
+
+class FakeConf(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+class FakeSpark:
+    def __init__(self):
+        self.conf = FakeConf()
+        self.files = {}  # path -> {partition: [file별 row list]}
+
+    @property
+    def read(self):
+        return self
+
+    def schema(self, schema):
+        return self
+
+    def parquet(self, path):
+        return FakeFrame(self, [row for files in self.files[path].values() for rows in files for row in rows])
+
+
+@pytest.fixture
+def fake_spark(monkeypatch):
+    spark = FakeSpark()
+    # 입력 csv record당 1MB -> parquet record당 256KB (compression 0.25)
+    monkeypatch.setattr(job, 'input_size_bytes', lambda spark, paths: len(paths) * 1024 * 1024)
+    monkeypatch.setattr(job, 'path_exists', lambda spark, path: path in spark.files)
+    return spark
+
+
+def test_compact_keeps_rows_of_previous_runs(fake_spark):
+    first = [{'title': f'a{index}', 'dt': '2022-08-01'} for index in range(3)]
+    second = [{'title': 'b0', 'dt': '2022-08-01'}, {'title': 'b1', 'dt': '2022-08-02'}]
+
+    job.compact(fake_spark, FakeFrame(fake_spark, first), '/curated', ['dt'], 128)
+    job.compact(fake_spark, FakeFrame(fake_spark, second), '/curated', ['dt'], 128)
+
+    written = fake_spark.read.parquet('/curated').rows
+    assert sorted(row['title'] for row in written) == ['a0', 'a1', 'a2', 'b0', 'b1']
+
+
+def test_compact_splits_partition_by_target_size(fake_spark):
+    rows = [{'title': f'a{index}', 'dt': '2022-08-01'} for index in range(10)]
+
+    records_per_file = job.compact(fake_spark, FakeFrame(fake_spark, rows), '/curated', ['dt'], 1)
+
+    assert records_per_file == 4
+    assert [len(rows) for rows in fake_spark.files['/curated'][('2022-08-01',)]] == [4, 4, 2]
+
+
+def test_parse_args_ignores_glue_arguments():
+    args = job.parse_args([
+        '--JOB_NAME', 'MojoCsvToParquetJob', '--job-bookmark-option', 'job-bookmark-enable',
+        '--source_database', 'glue-test-database', '--source_table', 'mojo',
+        '--target_path', 's3://bucket/curated/mojo', '--target_file_size_mb', '64'
+    ])
+    assert not args.local
+    assert args.source_table == 'mojo'
+    assert args.target_file_size_mb == 64
+
+
+def test_parse_args_local_requires_source_path():
+    with pytest.raises(SystemExit):
+        job.parse_args(['--local', '--target_path', '/tmp/out'])
+
+
+@pytest.mark.skipif(shutil.which('java') is None, reason='local spark needs java')
+def test_run_local_writes_partitioned_parquet(tmp_path):
+    pytest.importorskip('pyspark')
+    target = tmp_path / 'curated'
+
+    job.main(['--local', '--source_path', SAMPLE_CSV, '--target_path', str(target)])
+
+    assert sorted(os.listdir(target)) == ['_SUCCESS', 'dt=2022-08-01', 'dt=2022-08-02']
+    assert all(name.endswith('.snappy.parquet') for name in os.listdir(target / 'dt=2022-08-01')
+               if not name.startswith('.'))
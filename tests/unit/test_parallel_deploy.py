@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+
+import aws_cdk as core
+import pytest
+
+from iac_aws_cdk.parallel_deploy import (
+    DEPLOYED,
+    FAILED,
+    SKIPPED,
+    UNCHANGED,
+    DeployError,
+    StackNode,
+    critical_path,
+    deploy_all,
+    load_graph,
+    report,
+    select,
+    waves,
+)
+from iac_aws_cdk.settings import CONFIG_CONTEXT_KEY
+from iac_aws_cdk.stack_registry import build_stacks
+from tests.fixture_paths import FIXTURE_CONFIG, FIXTURE_CONTEXT
+
+
+class FakeCloudFormation:
+    """stack별 latency(초)만큼 걸리는 CloudFormation 대신 사용"""
+
+    def __init__(self, latencies, failures=()):
+        self.latencies = latencies
+        self.failures = set(failures)
+        self.order = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def deploy(self, node):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.order.append(node.name)
+        try:
+            time.sleep(self.latencies.get(node.name, 0))
+            if node.name in self.failures:
+                raise RuntimeError(f'{node.name} rolled back')
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _graph(**dependencies):
+    return {name: StackNode(name, f'{name}.template.json', 'aws://1/r', tuple(deps))
+            for name, deps in dependencies.items()}
+
+
+GRAPH = _graph(Network=(), App=('Network',), Jobs=(), Web=('Network',), Edge=('App', 'Web'))
+
+
+def test_load_graph_from_assembly(tmp_path):
+    with open(FIXTURE_CONTEXT) as stream:
+        context = json.load(stream)
+    app = core.App(outdir=str(tmp_path / 'cdk.out'), context={**context, CONFIG_CONTEXT_KEY: FIXTURE_CONFIG})
+    build_stacks(app, ['EbStack', 'BoxOfficeMojo'])
+    app.synth()
+
+    graph = load_graph(str(tmp_path / 'cdk.out'))
+
+    assert graph['EbStack'].dependencies == ('EbNetworkStack',)
+    assert graph['EbNetworkStack'].dependencies == ()
+    assert waves(graph) == [['BoxOfficeMojo', 'EbNetworkStack'], ['EbStack']]
+
+
+def test_select_includes_dependencies():
+    assert list(select(GRAPH, ['App'])) == ['Network', 'App']
+    with pytest.raises(DeployError, match='Missing'):
+        select(GRAPH, ['Missing'])
+
+
+def test_cycle():
+    with pytest.raises(DeployError, match='cycle'):
+        waves(_graph(A=('B',), B=('A',)))
+
+
+def test_parallel_deploy_respects_dependencies():
+    latencies = {'Network': 0.2, 'App': 0.2, 'Jobs': 0.1, 'Web': 0.05, 'Edge': 0.05}
+    client = FakeCloudFormation(latencies)
+
+    started = time.monotonic()
+    results = deploy_all(GRAPH, client, max_workers=4, log=lambda line: None)
+    wall = time.monotonic() - started
+
+    assert {result.status for result in results.values()} == {DEPLOYED}
+    for name, node in GRAPH.items():
+        assert all(results[dependency].finished <= results[name].started for dependency in node.dependencies)
+    # Network -> App -> Edge (0.45s)가 전체 시간, 순서대로 배포하면 0.6s
+    assert wall < sum(latencies.values())
+    assert critical_path(GRAPH, results) == ['Network', 'App', 'Edge']
+    assert 'critical path' in report(GRAPH, results)
+
+
+def test_worker_pool_is_bounded():
+    client = FakeCloudFormation({name: 0.05 for name in GRAPH})
+    deploy_all(GRAPH, client, max_workers=1, log=lambda line: None)
+
+    assert client.peak == 1
+    assert client.order.index('Network') < client.order.index('App') < client.order.index('Edge')
+
+
+def test_failure_skips_dependents():
+    client = FakeCloudFormation({}, failures=['Network'])
+    results = deploy_all(GRAPH, client, max_workers=2, log=lambda line: None)
+
+    assert results['Network'].status == FAILED
+    assert 'rolled back' in results['Network'].error
+    assert {results[name].status for name in ('App', 'Web', 'Edge')} == {SKIPPED}
+    assert results['Jobs'].status == DEPLOYED
+    assert 'App' not in client.order
+
+
+def test_unchanged_stacks_are_not_deployed():
+    client = FakeCloudFormation({})
+    deployed = []
+    results = deploy_all(GRAPH, client, log=lambda line: None,
+                         unchanged=['Network', 'Jobs'], on_deployed=deployed.append)
+
+    assert results['Network'].status == UNCHANGED
+    assert sorted(client.order) == sorted(deployed) == ['App', 'Edge', 'Web']
@@ -0,0 +1,175 @@
+import pytest
+import aws_cdk.assertions as assertions
+
+
+def test_no_cache_by_default(synth_template):
+    template = synth_template('PubEc2Test')
+
+    template.resource_count_is('AWS::ElastiCache::ReplicationGroup', 0)
+
+
+def test_cache_in_private_subnets(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {
+        'cache': 'true',
+        'cache_engine': 'valkey',
+        'cache_replicas': '1'
+    }}))
+
+    template.has_resource_properties('AWS::ElastiCache::ReplicationGroup', {
+        'Engine': 'valkey',
+        'CacheNodeType': 'cache.t4g.micro',
+        'NumCacheClusters': 2,
+        'AutomaticFailoverEnabled': True,
+        'MultiAZEnabled': True,
+        'Port': 6379
+    })
+    subnet_group, = template.find_resources('AWS::ElastiCache::SubnetGroup').values()
+    assert subnet_group['Properties']['SubnetIds'] == ['subnet-0jwapppri00001', 'subnet-0jwapppri00002']
+    # web tier(jw_app_sg)에서만 6379 허용
+    template.has_resource_properties('AWS::EC2::SecurityGroupIngress', {
+        'FromPort': 6379,
+        'ToPort': 6379,
+        'SourceSecurityGroupId': 'sg-0jwapp0000000001',
+        'GroupId': {'Fn::GetAtt': [assertions.Match.string_like_regexp('WordPressCacheSecurityGroup'), 'GroupId']}
+    })
+
+    instance, = template.find_resources('AWS::EC2::Instance').values()
+    user_data = str(instance['Properties']['UserData'])
+    assert 'SetEnv CACHE_HOST ' in user_data
+    assert 'PrimaryEndPoint.Address' in user_data
+
+
+def test_cdn_cache_behaviors(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {
+        'cdn': 'true',
+        'cdn_static_ttl_days': '30',
+        'cdn_origin_shield_region': 'ap-northeast-2'
+    }}))
+
+    distribution, = template.find_resources('AWS::CloudFront::Distribution').values()
+    config = distribution['Properties']['DistributionConfig']
+    origin, = config['Origins']
+    assert origin['OriginShield'] == {'Enabled': True, 'OriginShieldRegion': 'ap-northeast-2'}
+    assert origin['CustomOriginConfig']['OriginProtocolPolicy'] == 'http-only'
+    assert config['PriceClass'] == 'PriceClass_100'
+
+    # 동적 경로: cache 없이 cookie / query string 전달 (CachingDisabled / AllViewer managed policy)
+    assert config['DefaultCacheBehavior']['CachePolicyId'] == '4135ea2d-6df8-44a3-9df3-4b5a84be39ad'
+    assert config['DefaultCacheBehavior']['OriginRequestPolicyId'] == '216adef6-5c7f-47e4-b989-5492eafa07d3'
+
+    static_cache_policy, = template.find_resources('AWS::CloudFront::CachePolicy')
+    static_behaviors = {behavior['PathPattern']: behavior for behavior in config['CacheBehaviors']}
+    assert set(static_behaviors) == {'/wp-content/*', '/wp-includes/*'}
+    for behavior in static_behaviors.values():
+        assert behavior['Compress'] is True
+        assert behavior['AllowedMethods'] == ['GET', 'HEAD']
+        assert behavior['CachePolicyId'] == {'Ref': static_cache_policy}
+    template.has_resource_properties('AWS::CloudFront::CachePolicy', {
+        'CachePolicyConfig': assertions.Match.object_like({
+            'DefaultTTL': 30 * 24 * 3600,
+            'ParametersInCacheKeyAndForwardedToOrigin': assertions.Match.object_like({
+                'EnableAcceptEncodingGzip': True,
+                'EnableAcceptEncodingBrotli': True,
+                'CookiesConfig': {'CookieBehavior': 'none'},
+                'QueryStringsConfig': {'QueryStringBehavior': 'all'}
+            })
+        })
+    })
+    template.has_output('WordPressCdnDomain', {})
+
+
+def test_asg_web_tier(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {
+        'web_tier': 'asg',
+        'asg_min_size': '2',
+        'asg_max_size': '6',
+        'asg_requests_per_target_per_minute': '600',
+        'asg_warm_pool_size': '1',
+        'asg_refresh_batch_size': '2'
+    }}))
+
+    template.resource_count_is('AWS::EC2::Instance', 0)
+    template.has_resource_properties('AWS::EC2::LaunchTemplate', {
+        'LaunchTemplateName': 'WordPressLaunchTemplate',
+        'LaunchTemplateData': assertions.Match.object_like({
+            'InstanceType': 't2.micro',
+            'KeyName': 'word-press-key',
+            'SecurityGroupIds': ['sg-0jwapp0000000001'],
+            'UserData': assertions.Match.any_value()
+        })
+    })
+    template.has_resource('AWS::AutoScaling::AutoScalingGroup', {
+        'Properties': assertions.Match.object_like({
+            'MinSize': '2',
+            'MaxSize': '6',
+            'HealthCheckType': 'ELB',
+            'VPCZoneIdentifier': ['subnet-0jwapppub00001', 'subnet-0jwapppub00002'],
+            'TargetGroupARNs': [{'Ref': assertions.Match.string_like_regexp('WordPressTargetGroup')}]
+        }),
+        'UpdatePolicy': {
+            'AutoScalingRollingUpdate': assertions.Match.object_like({
+                'MaxBatchSize': 2,
+                'MinInstancesInService': 2
+            }),
+            'AutoScalingScheduledAction': assertions.Match.any_value()
+        }
+    })
+    template.has_resource_properties('AWS::AutoScaling::ScalingPolicy', {
+        'PolicyType': 'TargetTrackingScaling',
+        'TargetTrackingConfiguration': {
+            'PredefinedMetricSpecification': {
+                'PredefinedMetricType': 'ALBRequestCountPerTarget',
+                'ResourceLabel': assertions.Match.any_value()
+            },
+            'TargetValue': 600
+        }
+    })
+    template.has_resource_properties('AWS::AutoScaling::WarmPool', {'MinSize': 1, 'PoolState': 'Stopped'})
+    target_group, = template.find_resources('AWS::ElasticLoadBalancingV2::TargetGroup').values()
+    assert 'Targets' not in target_group['Properties']
+
+
+def test_fixed_size_asg_keeps_rolling_update_valid(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {
+        'web_tier': 'asg', 'asg_min_size': '2', 'asg_max_size': '2'
+    }}))
+
+    # MinInstancesInService가 MaxSize와 같으면 rolling update를 시작할 수 없다.
+    template.has_resource('AWS::AutoScaling::AutoScalingGroup', {
+        'UpdatePolicy': assertions.Match.object_like({
+            'AutoScalingRollingUpdate': assertions.Match.object_like({'MinInstancesInService': 1})
+        })
+    })
+
+
+def test_asg_sizes_are_validated(make_config):
+    from iac_aws_cdk.settings import SettingsError, get_settings
+
+    with pytest.raises(SettingsError, match='invalid asg_min_size/asg_max_size: 3/2'):
+        get_settings(path=make_config({'pub_ec2_test': {'asg_min_size': '3', 'asg_max_size': '2'}}))
+
+
+def test_cdn_static_ttl_is_validated(make_config):
+    from iac_aws_cdk.settings import SettingsError, get_settings
+
+    with pytest.raises(SettingsError, match=r'\[pub_ec2_test\] cdn_static_ttl_days must be at least 1: 0'):
+        get_settings(path=make_config({'pub_ec2_test': {'cdn': 'true', 'cdn_static_ttl_days': '0'}}))
+
+
+def test_baked_ami_skips_install_script(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {'ami_id': 'ami-0123456789abcdef0'}}))
+
+    instance, = template.find_resources('AWS::EC2::Instance').values()
+    assert instance['Properties']['ImageId'] == 'ami-0123456789abcdef0'
+    assert 'yum install' not in str(instance['Properties']['UserData'])
+
+
+def test_ami_from_ssm(synth_template, make_config):
+    template = synth_template('PubEc2Test', make_config({'pub_ec2_test': {'ami_from_ssm': 'true'}}))
+
+    instance, = template.find_resources('AWS::EC2::Instance').values()
+    parameter = instance['Properties']['ImageId']['Ref']
+    template.has_parameter(parameter, {
+        'Type': 'AWS::SSM::Parameter::Value<AWS::EC2::Image::Id>',
+        'Default': '/imagebuilder/word-press/ami-id'
+    })
@@ -0,0 +1,82 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'ecs', 'secret_cache.py')
+
+spec = importlib.util.spec_from_file_location('secret_cache', SCRIPT)
+secret_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(secret_cache)
+
+SOURCES = {'DB_PASSWORD': {'secret_id': 'MyTestSecret', 'field': 'password'}, 'API_KEY': {'secret_id': 'api-key'}}
+
+
+class FakeSecretsManager:
+    def __init__(self, values):
+        self.values = values
+        self.fail = False
+
+    def get_secret_value(self, SecretId):
+        if self.fail:
+            raise RuntimeError('throttled')
+        return {'SecretString': self.values[SecretId]}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client():
+    return FakeSecretsManager({'MyTestSecret': json.dumps({'password': 'rotated'}), 'api-key': 'key-2'})
+
+
+def test_injected_values_are_used_until_ttl(client):
+    clock = Clock()
+    cache = secret_cache.SecretCache(SOURCES, 60, client=client, environ={'DB_PASSWORD': 'injected'}, clock=clock)
+
+    assert cache.get('DB_PASSWORD') == 'injected'
+    assert cache.calls == 0
+    clock.now = 61
+    assert cache.get('DB_PASSWORD') == 'rotated'
+    assert cache.get('DB_PASSWORD') == 'rotated'
+    assert cache.calls == 1
+
+
+def test_missing_values_are_fetched_once_per_ttl(client):
+    clock = Clock()
+    cache = secret_cache.SecretCache(SOURCES, 60, client=client, environ={}, clock=clock)
+
+    assert cache.get('API_KEY') == 'key-2'
+    clock.now = 30
+    assert cache.get('API_KEY') == 'key-2'
+    assert cache.calls == 1
+    with pytest.raises(KeyError):
+        cache.get('UNKNOWN')
+
+
+def test_stale_value_on_fetch_error(client):
+    clock = Clock()
+    cache = secret_cache.SecretCache(SOURCES, 60, client=client, environ={'DB_PASSWORD': 'injected'}, clock=clock)
+    client.fail = True
+    clock.now = 120
+
+    assert cache.get('DB_PASSWORD') == 'injected'
+    with pytest.raises(RuntimeError):
+        cache.get('API_KEY')
+
+
+def test_from_environment(monkeypatch, client):
+    monkeypatch.setenv(secret_cache.SOURCES_ENV_VAR, json.dumps(SOURCES))
+    monkeypatch.setenv(secret_cache.TTL_ENV_VAR, '600')
+    monkeypatch.setenv('DB_PASSWORD', 'injected')
+    cache = secret_cache.SecretCache.from_environment(client=client)
+
+    assert cache.ttl_seconds == 600
+    assert cache.get('DB_PASSWORD') == 'injected'
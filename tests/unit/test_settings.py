@@ -0,0 +1,120 @@
+import dataclasses
+from configparser import ConfigParser
+
+import pytest
+
+from iac_aws_cdk import settings as settings_module
+from iac_aws_cdk.settings import AthenaWorkGroupSettings, Settings, SettingsError, get_settings, parse_settings
+from tests.fixture_paths import FIXTURE_CONFIG
+
+
+def test_settings_are_typed_frozen_and_slotted():
+    settings = get_settings(path=FIXTURE_CONFIG)
+    assert settings.ecs_task.vpc_id == 'vpc-0ecs0000000000000'
+    assert not hasattr(settings.ecs_task, '__dict__')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.ecs_task.vpc_id = 'vpc-other'
+
+
+def test_settings_are_loaded_once_per_file():
+    assert get_settings(path=FIXTURE_CONFIG) is get_settings(path=FIXTURE_CONFIG)
+
+
+def test_env_selects_config_file(monkeypatch):
+    monkeypatch.delenv('CDK_CONFIG', raising=False)
+    monkeypatch.setenv('CDK_ENV', 'stage')
+    assert settings_module.config_path() == 'config/stage.ini'
+    assert settings_module.config_path(env='dev') == 'config/dev.ini'
+
+
+def test_all_problems_are_reported_at_once():
+    parser = ConfigParser()
+    parser.read(FIXTURE_CONFIG)
+    parser.remove_section('eb_stack')
+    parser.set('ecs_task', 'vpc_id', '')
+    parser.remove_option('jw_app', 'vpc_cidr')
+
+    with pytest.raises(SettingsError) as excinfo:
+        parse_settings(parser, 'broken.ini')
+    message = str(excinfo.value)
+    assert '[eb_stack] section is missing' in message
+    assert '[ecs_task] vpc_id is missing or empty' in message
+    assert '[jw_app] vpc_cidr is missing or empty' in message
+
+
+def test_missing_file():
+    with pytest.raises(SettingsError, match='not found'):
+        get_settings(path='config/no-such-env.ini')
+
+
+def test_default_config_declares_every_section_and_key():
+    parser = ConfigParser()
+    parser.read('config/prod.ini.default')
+    for name, section_cls in Settings.sections().items():
+        assert parser.has_section(name)
+        assert set(parser.options(name)) == {field.name for field in dataclasses.fields(section_cls)}
+    assert set(parser.options('athena_workgroup.AthenaTestWorkGroup')) == {
+        field.name for field in dataclasses.fields(AthenaWorkGroupSettings)
+    }
+
+
+def test_athena_workgroup_sections(make_config):
+    settings = get_settings(path=make_config({
+        'box_office_mojo': {'athena_workgroups': 'interactive,batch'},
+        'athena_workgroup.batch': {'bytes_scanned_cutoff_mb': '10240', 'engine_version': '2'}
+    }))
+
+    assert list(settings.athena_workgroups) == ['interactive', 'batch']
+    assert settings.athena_workgroups['interactive'].bytes_scanned_cutoff_mb == 0
+    assert settings.athena_workgroups['interactive'].engine_version == 'none'
+    assert settings.athena_workgroups['batch'].bytes_scanned_cutoff_mb == 10240
+    assert settings.athena_workgroups['batch'].engine_version == '2'
+
+
+@pytest.mark.parametrize('values, message', [
+    ({'bytes_scanned_cutoff_mb': '5'}, 'bytes_scanned_cutoff_mb must be 0 or at least 10: 5'),
+    ({'result_expiration_days': '7'}, 'result_expiration_days requires result_prefix'),
+])
+def test_invalid_athena_workgroup(make_config, values, message):
+    with pytest.raises(SettingsError, match=rf'\[athena_workgroup.AthenaTestWorkGroup\] {message}'):
+        get_settings(path=make_config({'athena_workgroup.AthenaTestWorkGroup': values}))
+
+
+def test_invalid_choice_is_reported(make_config):
+    with pytest.raises(SettingsError, match=r"\[athena_workgroup.AthenaTestWorkGroup\] engine_version: '4'"):
+        get_settings(path=make_config({'athena_workgroup.AthenaTestWorkGroup': {'engine_version': '4'}}))
+
+
+def test_tuple_choices_are_checked_per_item(make_config):
+    assert get_settings(path=make_config({'jw_app': {'vpc_endpoints': 's3, logs'}})).jw_app.vpc_endpoints == ('s3', 'logs')
+    with pytest.raises(SettingsError, match=r"\[jw_app\] vpc_endpoints: 'sqs' is not one of"):
+        get_settings(path=make_config({'jw_app': {'vpc_endpoints': 's3,sqs'}}, name='invalid.ini'))
+
+
+def test_capacity_provider_strategy_is_parsed(make_config):
+    settings = get_settings(path=make_config({'ecs_task': {'capacity_provider_strategy': 'FARGATE:1:2,FARGATE_SPOT:4'}}))
+    assert settings.ecs_task.capacity_provider_strategy == (('FARGATE', 1, 2), ('FARGATE_SPOT', 4, 0))
+
+    with pytest.raises(SettingsError, match='capacity_provider_strategy'):
+        get_settings(path=make_config({'ecs_task': {'capacity_provider_strategy': 'EC2:1'}}, name='invalid.ini'))
+
+
+def test_fargate_cpu_memory_combination(make_config):
+    settings = get_settings(path=make_config({'ecs_task': {'task_cpu': '8192', 'task_memory_mib': '20480'}}))
+    assert (settings.ecs_task.task_cpu, settings.ecs_task.task_memory_mib) == (8192, 20480)
+
+    with pytest.raises(SettingsError, match=r'task_memory_mib 4096 is not valid with task_cpu 256 \(512, 1024, 2048\)'):
+        get_settings(path=make_config({'ecs_task': {'task_memory_mib': '4096'}}, name='memory.ini'))
+    with pytest.raises(SettingsError, match='task_memory_mib 18432 is not valid with task_cpu 8192'):
+        get_settings(path=make_config({'ecs_task': {'task_cpu': '8192', 'task_memory_mib': '18432'}}, name='step.ini'))
+    with pytest.raises(SettingsError, match='task_cpu 300 is not a fargate cpu'):
+        get_settings(path=make_config({'ecs_task': {'task_cpu': '300'}}, name='cpu.ini'))
+
+
+def test_section_validate_reports_key_combinations(make_config):
+    with pytest.raises(SettingsError) as e:
+        get_settings(path=make_config({'eb_stack': {'db_storage_type': 'gp2', 'db_storage_throughput': '250'}}))
+    assert '[eb_stack] db_storage_throughput requires db_storage_type=gp3' in str(e.value)
+
+    with pytest.raises(SettingsError, match=r'\[eb_stack\] db_iops is required with db_storage_type=io1'):
+        get_settings(path=make_config({'eb_stack': {'db_storage_type': 'io1'}}, name='io1.ini'))
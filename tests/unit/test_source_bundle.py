@@ -0,0 +1,98 @@
+import os
+import zipfile
+
+import pytest
+
+from iac_aws_cdk.source_bundle import FIXED_DATE_TIME, build_source_bundle, scan
+
+
+def _write(path, content, mode=0o644):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.chmod(path, mode)
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / 'app'
+    _write(source / 'application.py', 'print(1)\n')
+    _write(source / '.ebextensions' / 'wsgi.config', 'option_settings: {}\n')
+    _write(source / 'bin' / 'run.sh', '#!/bin/sh\n', mode=0o755)
+    _write(source / '.git' / 'HEAD', 'ref: refs/heads/main\n')
+    _write(source / 'pkg' / '__pycache__' / 'mod.cpython-39.pyc', 'x')
+    _write(source / 'pkg' / 'mod.pyc', 'x')
+    return source
+
+
+EXCLUDES = ('.git', '__pycache__', '*.pyc')
+
+
+def test_bundle_is_deterministic(source_dir, tmp_path):
+    first = build_source_bundle(str(source_dir), EXCLUDES, str(tmp_path / 'out-1'))
+    # 파일 시간이 달라도 같은 zip
+    os.utime(source_dir / 'application.py', (0, 0))
+    second = build_source_bundle(str(source_dir), EXCLUDES, str(tmp_path / 'out-2'))
+
+    assert first.digest == second.digest
+    with open(first.path, 'rb') as one, open(second.path, 'rb') as other:
+        assert one.read() == other.read()
+
+
+def test_bundle_entries(source_dir, tmp_path):
+    bundle = build_source_bundle(str(source_dir), EXCLUDES, str(tmp_path / 'out'))
+
+    with zipfile.ZipFile(bundle.path) as archive:
+        infos = archive.infolist()
+        assert [info.filename for info in infos] == [
+            '.ebextensions/wsgi.config', 'application.py', 'bin/run.sh'
+        ]
+        assert {info.date_time for info in infos} == {FIXED_DATE_TIME}
+        assert (archive.getinfo('bin/run.sh').external_attr >> 16) & 0o777 == 0o755
+        assert archive.read('application.py') == b'print(1)\n'
+
+
+def test_unchanged_tree_is_not_rebuilt(source_dir, tmp_path):
+    output_dir = str(tmp_path / 'out')
+    first = build_source_bundle(str(source_dir), EXCLUDES, output_dir)
+    second = build_source_bundle(str(source_dir), EXCLUDES, output_dir)
+
+    assert first.rebuilt and not second.rebuilt
+    assert second.path == first.path
+
+
+def test_changed_file_rebuilds(source_dir, tmp_path):
+    output_dir = tmp_path / 'out'
+    first = build_source_bundle(str(source_dir), EXCLUDES, str(output_dir))
+    _write(source_dir / 'application.py', 'print(2)\n')
+    second = build_source_bundle(str(source_dir), EXCLUDES, str(output_dir))
+
+    assert second.rebuilt and second.digest != first.digest
+    # 이전 bundle은 정리
+    assert sorted(path.name for path in output_dir.glob('*.zip')) == [f'{second.digest}.zip']
+
+
+def test_cleanup_keeps_temp_files_of_other_synths(source_dir, tmp_path):
+    output_dir = tmp_path / 'out'
+    build_source_bundle(str(source_dir), EXCLUDES, str(output_dir))
+    # 동시에 실행 중인 다른 synth가 쓰고 있는 임시 파일
+    _write(output_dir / '.bundle-abc123.zip', 'partial')
+    _write(source_dir / 'application.py', 'print(2)\n')
+    bundle = build_source_bundle(str(source_dir), EXCLUDES, str(output_dir))
+
+    assert sorted(path.name for path in output_dir.iterdir() if path.suffix == '.zip') == [
+        '.bundle-abc123.zip', f'{bundle.digest}.zip'
+    ]
+
+
+def test_scan_reuses_previous_digest(source_dir):
+    files = scan(str(source_dir), EXCLUDES)
+    # stat이 같으면 sha256은 이전 manifest 값을 그대로 사용
+    previous = {'files': {path: {**entry, 'sha256': 'cached'} for path, entry in files.items()}}
+    rescanned = scan(str(source_dir), EXCLUDES, previous)
+
+    assert {entry['sha256'] for entry in rescanned.values()} == {'cached'}
+
+
+def test_missing_source_dir(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        build_source_bundle(str(tmp_path / 'missing'))
@@ -0,0 +1,45 @@
+import aws_cdk as core
+import pytest
+
+from iac_aws_cdk import stack_registry
+from iac_aws_cdk.settings import get_settings
+
+
+def test_resolve_all_stacks_when_nothing_requested(make_config):
+    settings = get_settings(path=make_config())
+    assert stack_registry.resolve(None, settings) == stack_registry.stack_names()
+
+
+def test_resolve_adds_dependencies_in_registry_order(make_config):
+    settings = get_settings(path=make_config())
+    assert stack_registry.resolve(['EbStack'], settings) == ['EbNetworkStack', 'EbStack']
+    assert stack_registry.resolve(['BoxOfficeMojo'], settings) == ['BoxOfficeMojo']
+
+
+def test_pub_ec2_test_needs_image_stack_only_for_ssm_ami(make_config):
+    # 기본값(AmazonLinuxImage + user data)이면 image builder stack을 만들지 않는다.
+    assert stack_registry.resolve(['PubEc2Test'], get_settings(path=make_config())) == ['PubEc2Test']
+
+    settings = get_settings(path=make_config({'pub_ec2_test': {'ami_from_ssm': 'true'}}, name='ssm.ini'))
+    assert stack_registry.resolve(['PubEc2Test'], settings) == ['WordPressImage', 'PubEc2Test']
+
+
+def test_requested_stack_names_from_context():
+    app = core.App(context={'stacks': 'BoxOfficeMojo, EbStack'})
+    assert stack_registry.requested_stack_names(app) == ['BoxOfficeMojo', 'EbStack']
+
+
+def test_requested_stack_names_from_env(monkeypatch):
+    monkeypatch.setenv('CDK_STACKS', 'JwApp')
+    assert stack_registry.requested_stack_names(core.App()) == ['JwApp']
+
+
+def test_requested_stack_names_all(monkeypatch):
+    monkeypatch.delenv('CDK_STACKS', raising=False)
+    assert stack_registry.requested_stack_names(core.App()) is None
+    assert stack_registry.requested_stack_names(core.App(context={'stacks': 'all'})) is None
+
+
+def test_requested_stack_names_unknown():
+    with pytest.raises(ValueError, match='NoSuchStack'):
+        stack_registry.requested_stack_names(core.App(context={'stacks': 'NoSuchStack'}))
@@ -0,0 +1,59 @@
+"""stack별 synth 결과를 tests/snapshots/<이름>.template.json과 비교
+conftest의 make_config / synth_template(fixture config, cdk.context.json)으로 네트워크 없이 synth한다.
+
+    $ python -m pytest tests/unit/test_stack_snapshots.py -n auto          # pytest-xdist (requirements-dev.txt)
+    $ python -m pytest tests/unit/test_stack_snapshots.py --snapshot-update  # 의도한 변경이면 snapshot 갱신
+
+jsii runtime은 worker process마다 하나이고, worker는 자기가 맡은 stack만 synth한다.
+"""
+import difflib
+import json
+import os
+import re
+
+import pytest
+
+from iac_aws_cdk.stack_registry import stack_names
+from tests.fixture_paths import FIXTURE_CONFIG
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), '..', 'snapshots')
+
+# asset hash (s3 key, asset path 등)는 app 코드 / 파일 내용에 따라 바뀌므로 비교하지 않는다.
+_ASSET_HASH = re.compile(r'\b[0-9a-f]{64}\b')
+
+# 기본값으로 꺼져 있는 option을 켠 snapshot: 이름 -> (stack명, {section: {key: value}})
+VARIANTS = {
+    'EcsTask.queue': ('EcsTask', {'ecs_task': {
+        'mode': 'queue', 'secrets': 'DB_PASSWORD=MyTestSecret:password', 'secret_cache_ttl_seconds': '300'
+    }}),
+    'PubEc2Test.asg': ('PubEc2Test', {'pub_ec2_test': {'web_tier': 'asg', 'cdn': 'true', 'cache': 'true'}}),
+    'EbStack.db_proxy': ('EbStack', {'eb_stack': {'db_proxy': 'true', 'db_read_replicas': '1'}}),
+}
+SNAPSHOTS = {**{name: (name, {}) for name in stack_names()}, **VARIANTS}
+
+
+def normalize(template: dict) -> str:
+    return _ASSET_HASH.sub('<asset-hash>', json.dumps(template, indent=1, sort_keys=True)) + '\n'
+
+
+@pytest.mark.parametrize('name', sorted(SNAPSHOTS))
+def test_stack_snapshot(name, synth_template, make_config, request):
+    stack_name, overrides = SNAPSHOTS[name]
+    template = synth_template(stack_name, make_config(overrides) if overrides else FIXTURE_CONFIG)
+    actual = normalize(template.to_json())
+    path = os.path.join(SNAPSHOT_DIR, f'{name}.template.json')
+
+    if request.config.getoption('--snapshot-update'):
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(path, 'w') as stream:
+            stream.write(actual)
+        return
+    if not os.path.exists(path):
+        pytest.fail(f'snapshot {path} is missing (run pytest --snapshot-update)')
+    with open(path) as stream:
+        expected = stream.read()
+    if actual != expected:
+        diff = difflib.unified_diff(expected.splitlines(), actual.splitlines(),
+                                    f'snapshots/{name}.template.json', 'synth', lineterm='', n=2)
+        pytest.fail('template changed (run pytest --snapshot-update if intended):\n' + '\n'.join(diff),
+                    pytrace=False)
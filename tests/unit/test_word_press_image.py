@@ -0,0 +1,73 @@
+import json
+
+import aws_cdk.assertions as assertions
+import pytest
+
+from iac_aws_cdk.word_press_image import component_document, content_version, script_commands
+
+
+def test_script_commands_drop_sudo_and_blank_lines():
+    script = '#!/bin/bash\nsudo su\n\n# comment\nsudo yum install -y httpd\necho "<?php phpinfo(); ?>" > /var/www/html/phpinfo.php\n'
+    assert script_commands(script) == ['yum install -y httpd', 'echo "<?php phpinfo(); ?>" > /var/www/html/phpinfo.php']
+
+
+def test_component_document_from_user_data_script():
+    with open('scripts/word_press_pub_ec2_user_data.sh') as stream:
+        document = json.loads(component_document(script_commands(stream.read())))
+
+    build, validate = document['phases']
+    assert build['name'] == 'build'
+    commands = build['steps'][0]['inputs']['commands']
+    assert 'yum install -y httpd mariadb-server' in commands
+    assert 'su' not in commands
+    assert validate['name'] == 'validate'
+
+
+def test_content_version_changes_with_content():
+    assert content_version('a') == content_version('a')
+    assert content_version('a') != content_version('b')
+    assert content_version('a').startswith('1.0.')
+
+
+def test_image_pipeline_stack(synth_template, make_config):
+    template = synth_template('WordPressImage', make_config({'pub_ec2_test': {
+        'image_schedule': 'cron(0 0 ? * sun *)',
+        'image_subnet': 'subnet-0jwapppub00001'
+    }}))
+
+    template.has_resource_properties('AWS::ImageBuilder::Component', {
+        'Platform': 'Linux',
+        'Data': assertions.Match.string_like_regexp('amazon-linux-extras install')
+    })
+    template.has_resource_properties('AWS::ImageBuilder::ImageRecipe', {
+        'ParentImage': {'Fn::Join': ['', [
+            'arn:', {'Ref': 'AWS::Partition'}, ':imagebuilder:ap-northeast-2:aws:image/amazon-linux-2-x86/x.x.x'
+        ]]}
+    })
+    template.has_resource_properties('AWS::ImageBuilder::InfrastructureConfiguration', {
+        'InstanceTypes': ['t3.small'],
+        'SubnetId': 'subnet-0jwapppub00001'
+    })
+    template.has_resource_properties('AWS::ImageBuilder::ImagePipeline', {
+        'Schedule': {'ScheduleExpression': 'cron(0 0 ? * sun *)', 'PipelineExecutionStartCondition': assertions.Match.any_value()}
+    })
+    # 배포 시점 build와 pipeline build 모두 같은 distribution에서 SSM parameter를 갱신
+    template.resource_count_is('AWS::SSM::Parameter', 0)
+    distribution, = template.find_resources('AWS::ImageBuilder::DistributionConfiguration', {
+        'Properties': {'Distributions': [assertions.Match.object_like({
+            'SsmParameterConfigurations': [{
+                'ParameterName': '/imagebuilder/word-press/ami-id', 'DataType': 'aws:ec2:image'
+            }]
+        })]}
+    })
+    for resource_type in ('AWS::ImageBuilder::Image', 'AWS::ImageBuilder::ImagePipeline'):
+        template.has_resource_properties(resource_type, {
+            'DistributionConfigurationArn': {'Fn::GetAtt': [distribution, 'Arn']}
+        })
+
+
+def test_ssm_parameter_must_be_writable_by_image_builder(make_config):
+    from iac_aws_cdk.settings import SettingsError, get_settings
+
+    with pytest.raises(SettingsError, match='must start with /imagebuilder/'):
+        get_settings(path=make_config({'pub_ec2_test': {'image_ssm_parameter': '/word-press/ami-id'}}))